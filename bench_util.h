@@ -0,0 +1,213 @@
+#ifndef BENCH_UTIL_H
+#define BENCH_UTIL_H
+
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <sys/resource.h>
+
+#define SCHEMA_VERSION 1  // Versi format baris JSON hasil benchmark
+
+// Peak RSS proses ini dalam KB. VmHWM direset saat exec, berbeda dengan
+// ru_maxrss yang ikut menghitung memori proses induk sebelum exec.
+static inline long peak_rss_kb(void){
+    long kb = -1;
+    char line[256];
+    FILE *f = fopen("/proc/self/status", "r");
+    if (f) {
+        while (fgets(line, sizeof(line), f)) {
+            if (sscanf(line, "VmHWM: %ld kB", &kb) == 1) break;
+        }
+        fclose(f);
+    }
+    if (kb < 0) {
+        struct rusage usage;
+        getrusage(RUSAGE_SELF, &usage);
+        kb = usage.ru_maxrss;
+    }
+    return kb;
+}
+
+// Hash splitmix64: bit acak dari sebuah counter 64-bit
+static inline unsigned long long splitmix64(unsigned long long x){
+    x += 0x9E3779B97F4A7C15ULL;
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+    return x ^ (x >> 31);
+}
+
+// Elemen (i, j) matrix A (which = 0) atau B (which = 1) dalam [-1, 1). RNG
+// berbasis counter: nilainya hanya bergantung pada seed, i dan j, sehingga
+// setiap rank bisa membangkitkan bloknya sendiri dan hasilnya tidak
+// bergantung pada P maupun urutan pembangkitan.
+static inline float matrix_value(unsigned seed, int which, int i, int j){
+    unsigned long long key = splitmix64(((unsigned long long)seed << 1) | (unsigned)which);
+    unsigned long long h = splitmix64(key ^ (((unsigned long long)i << 32) | (unsigned)j));
+    return (float)((h >> 40) * (2.0 / 16777216.0) - 1.0);
+}
+
+// Isi A dan B (n x n) dengan matrix_value dari seed tetap, sehingga hasil bisa
+// diverifikasi dan dibandingkan antar run dan antar algoritma
+static inline void random_matrices(float *a, float *b, int n, unsigned seed){
+    for (int i = 0; i < n; i++) {
+        for (int j = 0; j < n; j++) {
+            a[i*n + j] = matrix_value(seed, 0, i, j);
+            b[i*n + j] = matrix_value(seed, 1, i, j);
+        }
+    }
+}
+
+// Bangkitkan blok rows x cols dari matrix A/B yang di-padding, mulai dari
+// elemen global (row0, col0); elemen di luar n x n diisi 0
+static inline void generate_block(float *dst, unsigned seed, int which, int n,
+                                  int row0, int col0, int rows, int cols){
+    for (int r = 0; r < rows; r++) {
+        for (int c = 0; c < cols; c++) {
+            int i = row0 + r, j = col0 + c;
+            dst[r*cols + c] = i < n && j < n ? matrix_value(seed, which, i, j) : 0.0f;
+        }
+    }
+}
+
+// Sisi grid persegi terbesar yang muat di p proses (floor(sqrt(p)))
+static inline int square_grid(int p){
+    int q = (int)sqrt(p);
+    while ((q + 1) * (q + 1) <= p) q++;
+    while (q * q > p) q--;
+    return q;
+}
+
+// Ukuran N setelah dibulatkan ke atas menjadi kelipatan m
+static inline int padded_size(int n, int m){
+    return (n + m - 1) / m * m;
+}
+
+// Salin matrix n x n ke matrix n_pad x n_pad baru; baris/kolom tambahan diisi 0
+// sehingga hasil kali bagian n x n tidak berubah
+static inline float *pad_matrix(const float *src, int n, int n_pad){
+    float *dst = (float *)calloc((size_t)n_pad * n_pad, sizeof(float));
+    for (int i = 0; i < n; i++) {
+        for (int j = 0; j < n; j++) dst[i*n_pad + j] = src[i*n + j];
+    }
+    return dst;
+}
+
+// Ambil bagian kiri atas n x n dari matrix n_pad x n_pad
+static inline void crop_matrix(const float *src, float *dst, int n_pad, int n){
+    for (int i = 0; i < n; i++) {
+        for (int j = 0; j < n; j++) dst[i*n + j] = src[i*n_pad + j];
+    }
+}
+
+// Susun ulang matrix row-major n x n menjadi blok (n/rows) x (n/cols) yang
+// berurutan per rank, dengan rank = baris_grid * cols + kolom_grid
+static inline void to_blocks(const float *src, float *dst, int n, int rows, int cols){
+    int br = n / rows, bc = n / cols;
+    int idx = 0;
+    for (int row_blk = 0; row_blk < rows; row_blk++) {
+        for (int col_blk = 0; col_blk < cols; col_blk++) {
+            for (int r = 0; r < br; r++) {
+                for (int c = 0; c < bc; c++) {
+                    dst[idx++] = src[(row_blk*br + r)*n + col_blk*bc + c];
+                }
+            }
+        }
+    }
+}
+
+// Kebalikan dari to_blocks
+static inline void from_blocks(const float *src, float *dst, int n, int rows, int cols){
+    int br = n / rows, bc = n / cols;
+    int idx = 0;
+    for (int row_blk = 0; row_blk < rows; row_blk++) {
+        for (int col_blk = 0; col_blk < cols; col_blk++) {
+            for (int r = 0; r < br; r++) {
+                for (int c = 0; c < bc; c++) {
+                    dst[(row_blk*br + r)*n + col_blk*bc + c] = src[idx++];
+                }
+            }
+        }
+    }
+}
+
+// Bandingkan C dengan perkalian referensi presisi double. Toleransi relatif
+// terhadap elemen referensi terbesar: 1e-4 * max(|ref|, 1).
+static inline void check_product(const float *a, const float *b, const float *c, int n,
+                                 double *max_error, double *tolerance){
+    double *ref_row = (double *)malloc(n * sizeof(double));
+    double max_ref = 0.0;
+    *max_error = 0.0;
+    for (int i = 0; i < n; i++) {
+        for (int j = 0; j < n; j++) ref_row[j] = 0.0;
+        for (int k = 0; k < n; k++) {
+            double aik = a[i*n+k];
+            for (int j = 0; j < n; j++) ref_row[j] += aik * b[k*n+j];
+        }
+        for (int j = 0; j < n; j++) {
+            double err = fabs(c[i*n+j] - ref_row[j]);
+            if (err > *max_error) *max_error = err;
+            if (fabs(ref_row[j]) > max_ref) max_ref = fabs(ref_row[j]);
+        }
+    }
+    *tolerance = 1e-4 * (max_ref > 1.0 ? max_ref : 1.0);
+    free(ref_row);
+}
+
+// Bobot posisi checksum dalam [-1, 1): u_i untuk baris C (axis 0) dan v_j
+// untuk kolom C (axis 1). Counter kolom -1 tidak pernah dipakai elemen A/B.
+static inline double checksum_weight(unsigned seed, int axis, int i){
+    return matrix_value(seed, axis, i, -1);
+}
+
+// Panjang buffer sums untuk verifikasi checksum (lihat checksum_sums)
+static inline int checksum_len(int n_pad){
+    return 4 * n_pad + 1;
+}
+
+// Suku-suku checksum berbobot posisi:
+// sum_ij u_i C(i,j) v_j = sum_k (u^T A)(k) * (B v)(k). sums berukuran
+// checksum_len(n_pad): [u^T A | |u|^T |A| | B v | |B| |v| | checksum C].
+// Blok A dan B berukuran rows x cols dengan elemen kiri atas di (row0, col0).
+static inline void checksum_sums(const float *a, const float *b, int rows, int cols,
+                                 int row0, int col0, int n_pad, unsigned seed, double *sums){
+    for (int r = 0; r < rows; r++) {
+        double u = checksum_weight(seed, 0, row0 + r);
+        for (int c = 0; c < cols; c++) {
+            double v = checksum_weight(seed, 1, col0 + c);
+            sums[col0 + c] += u * a[r*cols + c];
+            sums[n_pad + col0 + c] += fabs(u * a[r*cols + c]);
+            sums[2*n_pad + row0 + r] += b[r*cols + c] * v;
+            sums[3*n_pad + row0 + r] += fabs(b[r*cols + c] * v);
+        }
+    }
+}
+
+// Tambahkan sum_ij u_i C(i,j) v_j dari blok C rows x cols di (row0, col0) ke
+// slot terakhir sums
+static inline void checksum_result(const float *c, int rows, int cols, int row0, int col0,
+                                   int n_pad, unsigned seed, double *sums){
+    double total = 0.0;
+    for (int r = 0; r < rows; r++) {
+        double u = checksum_weight(seed, 0, row0 + r), row = 0.0;
+        for (int j = 0; j < cols; j++) row += c[r*cols + j] * checksum_weight(seed, 1, col0 + j);
+        total += u * row;
+    }
+    sums[4*n_pad] += total;
+}
+
+// Bandingkan checksum berbobot C dengan sum_k (u^T A)(k) * (B v)(k). Karena
+// bobot bergantung pada posisi, blok yang hilang maupun yang tertukar tempat
+// mengubah checksum. Toleransi 1e-6 * sum_k (|u|^T |A|)(k) * (|B| |v|)(k) / n;
+// galat pembulatan float yang teramati sekitar 3e-8 dari skala yang sama.
+static inline void check_checksum(const double *sums, int n_pad, int n,
+                                  double *max_error, double *tolerance){
+    double expected = 0.0, scale = 0.0;
+    for (int k = 0; k < n_pad; k++) {
+        expected += sums[k] * sums[2*n_pad + k];
+        scale += sums[n_pad + k] * sums[3*n_pad + k];
+    }
+    *max_error = fabs(sums[4*n_pad] - expected);
+    *tolerance = 1e-6 * scale / n;
+}
+
+#endif
@@ -1,4 +1,6 @@
 #!/bin/bash
+# Legacy script: sweeps are now planned and run from the host with
+#   python -m utils --sizes 100 500 1000 --procs 4 9
 
 # --- KONFIGURASI ---
 OUTPUT_FILE="hasil_benchmark.csv"
@@ -0,0 +1,298 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <mpi.h>
+#include <math.h>
+#include "bench_util.h"
+#include "kernels.h"
+#include "freivalds.h"
+#include "rank_times.h"
+
+// Algoritma Cannon pada grid periodik sqrt(P) x sqrt(P) (MPI_Cart_create):
+// blok A digeser ke kiri sejauh indeks barisnya dan blok B ke atas sejauh
+// indeks kolomnya (skew awal), lalu setiap stage menghitung satu perkalian
+// blok dan menggeser A ke kiri serta B ke atas satu langkah.
+// Argumen sama dengan fox.c: N [--verify] [--distributed] [--kernel NAMA] [--tile T].
+// Seperti fox.c, grid memakai q = floor(sqrt(P)) dan N di-padding nol sampai
+// kelipatan q; rank di luar grid (MPI_COMM_NULL) menganggur.
+// --distributed membangkitkan blok di setiap rank dan memverifikasi dengan
+// checksum, seperti di fox.c.
+// --freivalds K menjalankan K probe Freivalds terdistribusi (freivalds.h),
+// O(n^2 / P) per probe, sebagai pengganti --verify.
+
+#define MATRIXSIZE 1000
+#define SEED 42
+
+// Indeks fase untuk pengukuran waktu per fase (skew awal dihitung sebagai shift)
+enum { PHASE_SCATTER, PHASE_COMPUTE, PHASE_BROADCAST, PHASE_SHIFT, NUM_PHASES };
+
+// Skew awal lalu q stage hitung-dan-geser. Mengembalikan byte yang diterima
+// rank ini.
+static long long cannon_stages(int kernel, int tile, float *my_a, float *my_b, float *result,
+                               int nr, int q, int my_row, int my_col,
+                               MPI_Comm grid_comm, double *phase_time, double *stage_time){
+    long long block_bytes = (long long)nr * nr * sizeof(float);
+    long long recv_bytes = 0;
+    int src, dst;
+    double t0;
+
+    // Skew awal: A(i, j) ke kiri sejauh i, B(i, j) ke atas sejauh j
+    t0 = MPI_Wtime();
+    if (my_row > 0) {
+        MPI_Cart_shift(grid_comm, 1, -my_row, &src, &dst);
+        MPI_Sendrecv_replace(my_a, nr*nr, MPI_FLOAT, dst, 0, src, 0, grid_comm, MPI_STATUS_IGNORE);
+        recv_bytes += block_bytes;
+    }
+    if (my_col > 0) {
+        MPI_Cart_shift(grid_comm, 0, -my_col, &src, &dst);
+        MPI_Sendrecv_replace(my_b, nr*nr, MPI_FLOAT, dst, 0, src, 0, grid_comm, MPI_STATUS_IGNORE);
+        recv_bytes += block_bytes;
+    }
+    add_time(phase_time, PHASE_SHIFT, stage_time, 0, STAGE_COMM, t0);
+
+    // Tetangga untuk geseran satu langkah: A ke kiri, B ke atas
+    int left, right, up, down;
+    MPI_Cart_shift(grid_comm, 1, -1, &right, &left);
+    MPI_Cart_shift(grid_comm, 0, -1, &down, &up);
+
+    for (int stage = 0; stage < q; stage++) {
+        t0 = MPI_Wtime();
+        multiply_block(kernel, tile, my_a, my_b, result, nr);
+        add_time(phase_time, PHASE_COMPUTE, stage_time, stage, STAGE_COMPUTE, t0);
+
+        // Tidak perlu menggeser setelah stage terakhir
+        if (stage < q - 1) {
+            t0 = MPI_Wtime();
+            MPI_Sendrecv_replace(my_a, nr*nr, MPI_FLOAT, left, 0, right, 0, grid_comm, MPI_STATUS_IGNORE);
+            MPI_Sendrecv_replace(my_b, nr*nr, MPI_FLOAT, up, 1, down, 1, grid_comm, MPI_STATUS_IGNORE);
+            add_time(phase_time, PHASE_SHIFT, stage_time, stage, STAGE_COMM, t0);
+            recv_bytes += 2 * block_bytes;
+        }
+    }
+    return recv_bytes;
+}
+
+int main(int argc, char **argv) {
+
+    int comm_sz;
+    int my_rank;
+    int n = MATRIXSIZE;
+    int master = 0;
+    int verify = 0;
+    int distributed = 0;
+    int probes = 0;  // Jumlah probe Freivalds (0 = tidak dipakai)
+    int kernel, tile;
+    double start_time, final_time;
+    double phase_time[NUM_PHASES] = {0.0};
+    double t0;
+
+    // Ambil input ukuran matrix, opsi verifikasi dan kernel dari argumen CLI
+    if (argc > 1) n = strtol(argv[1], NULL, 10);
+    for (int i = 2; i < argc; i++) {
+        if (strcmp(argv[i], "--verify") == 0) verify = 1;
+        if (strcmp(argv[i], "--distributed") == 0) distributed = 1;
+        if (strcmp(argv[i], "--freivalds") == 0 && i + 1 < argc) probes = atoi(argv[i + 1]);
+    }
+    int kernel_ok = parse_kernel_args(argc, argv, &kernel, &tile);
+
+    // Hanya thread utama yang memanggil MPI; thread OpenMP dipakai di kernel
+    int provided;
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &provided);
+    MPI_Comm_size(MPI_COMM_WORLD, &comm_sz);
+    MPI_Comm_rank(MPI_COMM_WORLD, &my_rank);
+
+    if (!kernel_ok) {
+        if (my_rank == master) fprintf(stderr, "Error: Kernel atau ukuran tile tidak dikenal\n");
+        MPI_Finalize();
+        return 0;
+    }
+
+    int q = square_grid(comm_sz);
+    int grid_sz = q * q;
+    int n_pad = padded_size(n, q);
+    int nr = n_pad / q;
+
+    // Grid 2D periodik dari q x q rank pertama; reorder = 0 agar rank grid sama
+    // dengan rank MPI_COMM_WORLD. Rank sisanya mendapat MPI_COMM_NULL.
+    int dims[2] = {q, q};
+    int periods[2] = {1, 1};
+    int coords[2] = {0, 0};
+    MPI_Comm grid_comm;
+    MPI_Cart_create(MPI_COMM_WORLD, 2, dims, periods, 0, &grid_comm);
+    int active = grid_comm != MPI_COMM_NULL;
+    if (active) MPI_Cart_coords(grid_comm, my_rank, 2, coords);
+    int my_row = coords[0];
+    int my_col = coords[1];
+
+    // Sub-communicator baris dan kolom grid, hanya dipakai oleh --freivalds
+    MPI_Comm row_comm = MPI_COMM_NULL, col_comm = MPI_COMM_NULL;
+    if (active) {
+        int keep_col[2] = {0, 1}, keep_row[2] = {1, 0};
+        MPI_Cart_sub(grid_comm, keep_col, &row_comm);
+        MPI_Cart_sub(grid_comm, keep_row, &col_comm);
+    }
+
+    float *a = NULL;
+    float *b = NULL;
+    float *flat_a = NULL;
+    float *flat_b = NULL;
+
+    if (my_rank == master) {
+        fprintf(stdout, "Size: %d x %d, Processes: %d, Grid: %d x %d, Padded: %d\n",
+                n, n, comm_sz, q, q, n_pad);
+    }
+
+    if (my_rank == master && !distributed) {
+        a = (float *)malloc(n * n * sizeof(float));
+        b = (float *)malloc(n * n * sizeof(float));
+        flat_a = (float *)malloc(n_pad * n_pad * sizeof(float));
+        flat_b = (float *)malloc(n_pad * n_pad * sizeof(float));
+
+        random_matrices(a, b, n, SEED);
+
+        float *pad_a = pad_matrix(a, n, n_pad);
+        float *pad_b = pad_matrix(b, n, n_pad);
+        to_blocks(pad_a, flat_a, n_pad, q, q);
+        to_blocks(pad_b, flat_b, n_pad, q, q);
+        free(pad_a); free(pad_b);
+    }
+
+    float *my_a = NULL, *my_b = NULL, *result = NULL;
+    double *sums = NULL;  // Suku checksum berbobot posisi untuk verifikasi (checksum_sums)
+    double *probe_z = NULL;  // A * (B * x) untuk setiap probe Freivalds
+    if (active) {
+        my_a = (float *)malloc(nr * nr * sizeof(float));
+        my_b = (float *)malloc(nr * nr * sizeof(float));
+        result = (float *)calloc(nr * nr, sizeof(float));
+
+        // Distribusi blok: dibangkitkan di tempat atau di-scatter dari master
+        t0 = MPI_Wtime();
+        if (distributed) {
+            generate_block(my_a, SEED, 0, n, my_row*nr, my_col*nr, nr, nr);
+            generate_block(my_b, SEED, 1, n, my_row*nr, my_col*nr, nr, nr);
+        } else {
+            MPI_Scatter(flat_a, nr*nr, MPI_FLOAT, my_a, nr*nr, MPI_FLOAT, master, grid_comm);
+            MPI_Scatter(flat_b, nr*nr, MPI_FLOAT, my_b, nr*nr, MPI_FLOAT, master, grid_comm);
+        }
+        phase_time[PHASE_SCATTER] = MPI_Wtime() - t0;
+
+        if (verify && distributed) {
+            sums = (double *)calloc(checksum_len(n_pad), sizeof(double));
+            checksum_sums(my_a, my_b, nr, nr, my_row*nr, my_col*nr, n_pad, SEED, sums);
+        }
+
+        // Probe Freivalds dihitung dari blok A dan B awal, di luar waktu terukur
+        if (probes > 0) {
+            probe_z = freivalds_prepare(my_a, my_b, nr, nr, my_col*nr, n, n_pad,
+                                        probes, SEED, row_comm, col_comm);
+        }
+    }
+
+    MPI_Barrier(MPI_COMM_WORLD);
+    start_time = MPI_Wtime();
+
+    long long recv_bytes = 0;  // Byte yang diterima rank ini selama perkalian
+    double *stage_time = (double *)calloc(q * STAGE_KINDS, sizeof(double));
+    if (active) recv_bytes = cannon_stages(kernel, tile, my_a, my_b, result, nr, q,
+                                           my_row, my_col, grid_comm, phase_time, stage_time);
+
+    // Master baru berhenti mengukur setelah rank paling lambat selesai
+    closing_barrier(stage_time, q, MPI_COMM_WORLD);
+    final_time = MPI_Wtime() - start_time;
+
+    // Fase terlama di antara semua rank, total byte komunikasi, checksum hasil
+    // dan peak RSS tiap rank (rank yang menganggur menyumbang nol)
+    double max_phase_time[NUM_PHASES];
+    MPI_Reduce(phase_time, max_phase_time, NUM_PHASES, MPI_DOUBLE, MPI_MAX, master, MPI_COMM_WORLD);
+
+    long long comm_bytes = 0;
+    MPI_Reduce(&recv_bytes, &comm_bytes, 1, MPI_LONG_LONG, MPI_SUM, master, MPI_COMM_WORLD);
+
+    double local_sum = 0.0, checksum = 0.0;
+    if (active) {
+        for (int k = 0; k < nr*nr; k++) local_sum += result[k];
+    }
+    MPI_Reduce(&local_sum, &checksum, 1, MPI_DOUBLE, MPI_SUM, master, MPI_COMM_WORLD);
+
+    long rss_kb = peak_rss_kb();
+    long *all_rss_kb = NULL;
+    if (my_rank == master) all_rss_kb = (long *)malloc(comm_sz * sizeof(long));
+    MPI_Gather(&rss_kb, 1, MPI_LONG, all_rss_kb, 1, MPI_LONG, master, MPI_COMM_WORLD);
+
+    // Waktu compute/comm/barrier per stage setiap rank untuk laporan imbalance
+    double *all_stage_time = gather_stage_times(stage_time, q, master, MPI_COMM_WORLD);
+
+    // Verifikasi: kumpulkan C di master, buang padding, lalu bandingkan
+    // dengan perkalian serial; mode --distributed membandingkan checksum dan
+    // --freivalds memakai probe acak tanpa mengumpulkan C
+    double max_error = 0.0, tolerance = 0.0;
+    if (probes > 0 && active) {
+        freivalds_check(result, nr, nr, my_col*nr, n, n_pad, probes, SEED, probe_z,
+                        row_comm, col_comm, &max_error, &tolerance);
+    } else if (verify && active && distributed) {
+        double *all_sums = NULL;
+        checksum_result(result, nr, nr, my_row*nr, my_col*nr, n_pad, SEED, sums);
+        if (my_rank == master) all_sums = (double *)malloc(checksum_len(n_pad) * sizeof(double));
+        MPI_Reduce(sums, all_sums, checksum_len(n_pad), MPI_DOUBLE, MPI_SUM, master, grid_comm);
+        if (my_rank == master) {
+            check_checksum(all_sums, n_pad, n, &max_error, &tolerance);
+            free(all_sums);
+        }
+    } else if (verify && active) {
+        float *flat_c = NULL;
+        if (my_rank == master) flat_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+        MPI_Gather(result, nr*nr, MPI_FLOAT, flat_c, nr*nr, MPI_FLOAT, master, grid_comm);
+
+        if (my_rank == master) {
+            float *pad_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+            float *c = (float *)malloc(n * n * sizeof(float));
+            from_blocks(flat_c, pad_c, n_pad, q, q);
+            crop_matrix(pad_c, c, n_pad, n);
+            check_product(a, b, c, n, &max_error, &tolerance);
+            free(pad_c); free(c); free(flat_c);
+        }
+    }
+
+    if (my_rank == master) {
+        printf("Total Time Elapsed is %.6f seconds\n", final_time);
+
+        // Satu baris JSON untuk dibaca BenchmarkRunner
+        double gflops = final_time > 0 ? 2.0 * n * n * (double)n / final_time / 1e9 : 0.0;
+        printf("{\"schema_version\": %d, \"program\": \"cannon\", \"n\": %d, \"processes\": %d, "
+               "\"padded_n\": %d, \"active_processes\": %d, \"time\": %.6f, \"phases\": {\"scatter\": %.6f, \"compute\": %.6f, "
+               "\"broadcast\": %.6f, \"shift\": %.6f}, \"gflops\": %.6f, \"checksum\": %.6e, "
+               "\"comm_bytes\": %lld, \"kernel\": \"%s\", \"tile\": %d, \"threads\": %d, "
+               "\"generation\": \"%s\", ",
+               SCHEMA_VERSION, n, comm_sz, n_pad, grid_sz, final_time,
+               max_phase_time[PHASE_SCATTER], max_phase_time[PHASE_COMPUTE],
+               max_phase_time[PHASE_BROADCAST], max_phase_time[PHASE_SHIFT],
+               gflops, checksum, comm_bytes, KERNEL_NAMES[kernel], tile,
+               kernel_threads(), distributed ? "distributed" : "root");
+        if (verify || probes > 0) {
+            const char *method = probes > 0 ? "freivalds" : distributed ? "checksum" : "full";
+            printf("\"verification\": {\"verified\": %s, \"method\": \"%s\", \"probes\": %d, "
+                   "\"max_error\": %.6e, \"tolerance\": %.6e}, ", max_error <= tolerance ? "true" : "false",
+                   method, probes, max_error, tolerance);
+        }
+        print_rank_times(all_stage_time, q, comm_sz);
+        printf("\"peak_rss_kb\": [");
+        for (int r = 0; r < comm_sz; r++) printf(r ? ", %ld" : "%ld", all_rss_kb[r]);
+        printf("]}\n");
+        free(all_rss_kb);
+        free(all_stage_time);
+    }
+
+    // Cleanup Memory
+    free(my_a); free(my_b); free(result); free(sums); free(probe_z); free(stage_time);
+    if (my_rank == master) {
+        free(a); free(b); free(flat_a); free(flat_b);
+    }
+    if (active) {
+        MPI_Comm_free(&row_comm);
+        MPI_Comm_free(&col_comm);
+        MPI_Comm_free(&grid_comm);
+    }
+
+    MPI_Finalize();
+    return 0;
+}
@@ -18,16 +18,14 @@ chmod 600 /home/faiz/.ssh/authorized_keys
 chmod 600 /home/faiz/.ssh/config
 chown -R faiz:faiz /home/faiz/.ssh
 
-# Copy source files if they exist in template and don't exist in /home/faiz
-if [ -f /root/source_template/matrix.c ] && [ ! -f /home/faiz/matrix.c ]; then
-    cp /root/source_template/matrix.c /home/faiz/matrix.c
-    chown faiz:faiz /home/faiz/matrix.c
-fi
-
-if [ -f /root/source_template/serial.c ] && [ ! -f /home/faiz/serial.c ]; then
-    cp /root/source_template/serial.c /home/faiz/serial.c
-    chown faiz:faiz /home/faiz/serial.c
-fi
+# Copy source files from template when missing or older than the template
+# (-nt is also true when the copy is missing), so existing volumes pick up new sources
+for src in matrix.c serial.c fox.c cannon.c summa.c bench_util.h kernels.h freivalds.h rank_times.h pmpi_profile.c; do
+    if [ -f /root/source_template/$src ] && [ /root/source_template/$src -nt /home/faiz/$src ]; then
+        cp -p /root/source_template/$src /home/faiz/$src
+        chown faiz:faiz /home/faiz/$src
+    fi
+done
 
 # Start SSH daemon
 exec /usr/sbin/sshd -D
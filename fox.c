@@ -0,0 +1,371 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <mpi.h>
+#include <math.h>
+#include "bench_util.h"
+#include "kernels.h"
+#include "freivalds.h"
+#include "rank_times.h"
+
+// Algoritma Fox dengan communicator baris/kolom:
+// A dibroadcast di communicator baris (MPI_Bcast), B digeser ke atas di
+// communicator kolom. Setiap rank hanya melakukan sqrt(P) perkalian blok.
+// Jalankan dengan argumen --verify untuk membandingkan hasil dengan
+// perkalian serial di master; --kernel dan --tile memilih kernel lokal
+// (lihat kernels.h).
+// Dikompilasi dengan -DFOX_OVERLAP, broadcast A dan shift B untuk stage
+// berikutnya diposting (MPI_Ibcast/MPI_Isend/MPI_Irecv) sebelum blok stage
+// ini dihitung, memakai double buffer yang ditukar pointernya.
+// P dan N bebas: grid memakai q x q rank pertama dengan q = floor(sqrt(P))
+// (sisa rank menganggur) dan N di-padding nol sampai kelipatan q.
+// Dengan --distributed setiap rank membangkitkan blok A dan B miliknya sendiri
+// (matrix_value di bench_util.h) sehingga master tidak perlu buffer n x n dan
+// tidak ada MPI_Scatter; --verify lalu memakai checksum, bukan perkalian serial.
+// --freivalds K menjalankan K probe Freivalds terdistribusi (freivalds.h),
+// O(n^2 / P) per probe, sebagai pengganti --verify.
+
+#define MATRIXSIZE 1000
+#define SEED 42
+
+#ifdef FOX_OVERLAP
+#define PROGRAM_NAME "fox_overlap"
+#else
+#define PROGRAM_NAME "fox"
+#endif
+
+// Indeks fase untuk pengukuran waktu per fase
+enum { PHASE_SCATTER, PHASE_COMPUTE, PHASE_BROADCAST, PHASE_SHIFT, NUM_PHASES };
+
+#ifdef FOX_OVERLAP
+// Stage Fox dengan komunikasi stage berikutnya tumpang tindih dengan komputasi.
+// Mengembalikan byte yang diterima rank ini.
+static long long fox_stages(int kernel, int tile, const float *my_a, float *my_b, float *stage_a,
+                            float *result, int nr, int q, int my_row, int my_col,
+                            MPI_Comm row_comm, MPI_Comm col_comm, double *phase_time,
+                            double *stage_time){
+    int up = (my_row + q - 1) % q;
+    int down = (my_row + 1) % q;
+    long long block_bytes = (long long)nr * nr * sizeof(float);
+    long long recv_bytes = 0;
+    double t0;
+
+    // Buffer kedua untuk A dan B: stage berikutnya diterima ke buffer "next"
+    // selagi buffer "cur" dipakai menghitung, lalu pointernya ditukar
+    float *spare_a = (float *)malloc(nr * nr * sizeof(float));
+    float *spare_b = (float *)malloc(nr * nr * sizeof(float));
+    float *cur_a = stage_a, *next_a = spare_a;
+    float *cur_b = my_b, *next_b = spare_b;
+    float *tmp;
+    MPI_Request bcast_req, shift_req[2];
+
+    t0 = MPI_Wtime();
+    if (my_col == my_row) memcpy(cur_a, my_a, nr * nr * sizeof(float));
+    else recv_bytes += block_bytes;
+    MPI_Bcast(cur_a, nr*nr, MPI_FLOAT, my_row, row_comm);
+    add_time(phase_time, PHASE_BROADCAST, stage_time, 0, STAGE_COMM, t0);
+
+    for (int stage = 0; stage < q; stage++) {
+        int has_next = stage < q - 1;
+
+        // Posting komunikasi stage berikutnya sebelum menghitung stage ini
+        if (has_next) {
+            int bcast_root = (my_row + stage + 1) % q;
+
+            t0 = MPI_Wtime();
+            MPI_Irecv(next_b, nr*nr, MPI_FLOAT, down, 0, col_comm, &shift_req[0]);
+            MPI_Isend(cur_b, nr*nr, MPI_FLOAT, up, 0, col_comm, &shift_req[1]);
+            add_time(phase_time, PHASE_SHIFT, stage_time, stage, STAGE_COMM, t0);
+            recv_bytes += block_bytes;
+
+            t0 = MPI_Wtime();
+            if (my_col == bcast_root) memcpy(next_a, my_a, nr * nr * sizeof(float));
+            else recv_bytes += block_bytes;
+            MPI_Ibcast(next_a, nr*nr, MPI_FLOAT, bcast_root, row_comm, &bcast_req);
+            add_time(phase_time, PHASE_BROADCAST, stage_time, stage, STAGE_COMM, t0);
+        }
+
+        // cur_b hanya dibaca selama MPI_Isend masih berjalan
+        t0 = MPI_Wtime();
+        multiply_block(kernel, tile, cur_a, cur_b, result, nr);
+        add_time(phase_time, PHASE_COMPUTE, stage_time, stage, STAGE_COMPUTE, t0);
+
+        if (has_next) {
+            // Sisa waktu tunggu yang tidak tertutup oleh komputasi
+            t0 = MPI_Wtime();
+            MPI_Waitall(2, shift_req, MPI_STATUSES_IGNORE);
+            add_time(phase_time, PHASE_SHIFT, stage_time, stage, STAGE_COMM, t0);
+
+            t0 = MPI_Wtime();
+            MPI_Wait(&bcast_req, MPI_STATUS_IGNORE);
+            add_time(phase_time, PHASE_BROADCAST, stage_time, stage, STAGE_COMM, t0);
+
+            tmp = cur_a; cur_a = next_a; next_a = tmp;
+            tmp = cur_b; cur_b = next_b; next_b = tmp;
+        }
+    }
+
+    free(spare_a); free(spare_b);
+    return recv_bytes;
+}
+#else
+// Stage Fox blocking: broadcast A, hitung, lalu geser B.
+// Mengembalikan byte yang diterima rank ini.
+static long long fox_stages(int kernel, int tile, const float *my_a, float *my_b, float *stage_a,
+                            float *result, int nr, int q, int my_row, int my_col,
+                            MPI_Comm row_comm, MPI_Comm col_comm, double *phase_time,
+                            double *stage_time){
+    int up = (my_row + q - 1) % q;
+    int down = (my_row + 1) % q;
+    long long block_bytes = (long long)nr * nr * sizeof(float);
+    long long recv_bytes = 0;
+    double t0;
+
+    for (int stage = 0; stage < q; stage++) {
+        // Blok A di kolom (baris + stage) mod q dibroadcast ke seluruh baris
+        int bcast_root = (my_row + stage) % q;
+
+        t0 = MPI_Wtime();
+        if (my_col == bcast_root) memcpy(stage_a, my_a, nr * nr * sizeof(float));
+        else recv_bytes += block_bytes;
+        MPI_Bcast(stage_a, nr*nr, MPI_FLOAT, bcast_root, row_comm);
+        add_time(phase_time, PHASE_BROADCAST, stage_time, stage, STAGE_COMM, t0);
+
+        t0 = MPI_Wtime();
+        multiply_block(kernel, tile, stage_a, my_b, result, nr);
+        add_time(phase_time, PHASE_COMPUTE, stage_time, stage, STAGE_COMPUTE, t0);
+
+        // Geser B ke atas satu baris (tidak perlu setelah stage terakhir)
+        if (stage < q - 1) {
+            t0 = MPI_Wtime();
+            MPI_Sendrecv_replace(my_b, nr*nr, MPI_FLOAT, up, 0, down, 0, col_comm, MPI_STATUS_IGNORE);
+            add_time(phase_time, PHASE_SHIFT, stage_time, stage, STAGE_COMM, t0);
+            recv_bytes += block_bytes;
+        }
+    }
+    return recv_bytes;
+}
+#endif
+
+int main(int argc, char **argv) {
+
+    int comm_sz;
+    int my_rank;
+    int n = MATRIXSIZE;
+    int master = 0;
+    int verify = 0;
+    int distributed = 0;
+    int probes = 0;  // Jumlah probe Freivalds (0 = tidak dipakai)
+    int kernel, tile;
+    double start_time, final_time;
+    double phase_time[NUM_PHASES] = {0.0};
+    double t0;
+
+    // Ambil input ukuran matrix, opsi verifikasi dan kernel dari argumen CLI
+    if (argc > 1) n = strtol(argv[1], NULL, 10);
+    for (int i = 2; i < argc; i++) {
+        if (strcmp(argv[i], "--verify") == 0) verify = 1;
+        if (strcmp(argv[i], "--distributed") == 0) distributed = 1;
+        if (strcmp(argv[i], "--freivalds") == 0 && i + 1 < argc) probes = atoi(argv[i + 1]);
+    }
+    int kernel_ok = parse_kernel_args(argc, argv, &kernel, &tile);
+
+    // Hanya thread utama yang memanggil MPI; thread OpenMP dipakai di kernel
+    int provided;
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &provided);
+    MPI_Comm_size(MPI_COMM_WORLD, &comm_sz);
+    MPI_Comm_rank(MPI_COMM_WORLD, &my_rank);
+
+    if (!kernel_ok) {
+        if (my_rank == master) fprintf(stderr, "Error: Kernel atau ukuran tile tidak dikenal\n");
+        MPI_Finalize();
+        return 0;
+    }
+
+    // Grid persegi terbesar yang muat; rank di luar grid menganggur
+    int q = square_grid(comm_sz);
+    int grid_sz = q * q;
+    int active = my_rank < grid_sz;
+    int n_pad = padded_size(n, q);
+    int nr = n_pad / q;
+    int my_row = my_rank / q;
+    int my_col = my_rank % q;
+
+    // Communicator rank aktif, lalu per baris (broadcast A) dan per kolom (shift B)
+    MPI_Comm grid_comm, row_comm, col_comm;
+    MPI_Comm_split(MPI_COMM_WORLD, active ? 0 : MPI_UNDEFINED, my_rank, &grid_comm);
+    if (active) {
+        MPI_Comm_split(grid_comm, my_row, my_col, &row_comm);
+        MPI_Comm_split(grid_comm, my_col, my_row, &col_comm);
+    }
+
+    float *a = NULL;
+    float *b = NULL;
+    float *flat_a = NULL;
+    float *flat_b = NULL;
+
+    if (my_rank == master) {
+        fprintf(stdout, "Size: %d x %d, Processes: %d, Grid: %d x %d, Padded: %d\n",
+                n, n, comm_sz, q, q, n_pad);
+    }
+
+    if (my_rank == master && !distributed) {
+        a = (float *)malloc(n * n * sizeof(float));
+        b = (float *)malloc(n * n * sizeof(float));
+        flat_a = (float *)malloc(n_pad * n_pad * sizeof(float));
+        flat_b = (float *)malloc(n_pad * n_pad * sizeof(float));
+
+        random_matrices(a, b, n, SEED);
+
+        float *pad_a = pad_matrix(a, n, n_pad);
+        float *pad_b = pad_matrix(b, n, n_pad);
+        to_blocks(pad_a, flat_a, n_pad, q, q);
+        to_blocks(pad_b, flat_b, n_pad, q, q);
+        free(pad_a); free(pad_b);
+    }
+
+    float *my_a = NULL, *my_b = NULL, *stage_a = NULL, *result = NULL;
+    double *sums = NULL;  // Suku checksum berbobot posisi untuk verifikasi (checksum_sums)
+    double *probe_z = NULL;  // A * (B * x) untuk setiap probe Freivalds
+    long long recv_bytes = 0;  // Byte yang diterima rank ini selama perkalian
+
+    if (active) {
+        my_a = (float *)malloc(nr * nr * sizeof(float));
+        my_b = (float *)malloc(nr * nr * sizeof(float));
+        stage_a = (float *)malloc(nr * nr * sizeof(float));
+        result = (float *)calloc(nr * nr, sizeof(float));
+
+        // Distribusi blok: dibangkitkan di tempat atau di-scatter dari master
+        t0 = MPI_Wtime();
+        if (distributed) {
+            generate_block(my_a, SEED, 0, n, my_row*nr, my_col*nr, nr, nr);
+            generate_block(my_b, SEED, 1, n, my_row*nr, my_col*nr, nr, nr);
+        } else {
+            MPI_Scatter(flat_a, nr*nr, MPI_FLOAT, my_a, nr*nr, MPI_FLOAT, master, grid_comm);
+            MPI_Scatter(flat_b, nr*nr, MPI_FLOAT, my_b, nr*nr, MPI_FLOAT, master, grid_comm);
+        }
+        phase_time[PHASE_SCATTER] = MPI_Wtime() - t0;
+
+        // my_b ikut digeser selama perkalian, jadi jumlahnya diambil sekarang
+        if (verify && distributed) {
+            sums = (double *)calloc(checksum_len(n_pad), sizeof(double));
+            checksum_sums(my_a, my_b, nr, nr, my_row*nr, my_col*nr, n_pad, SEED, sums);
+        }
+
+        // Probe Freivalds dihitung dari blok A dan B awal, di luar waktu terukur
+        if (probes > 0) {
+            probe_z = freivalds_prepare(my_a, my_b, nr, nr, my_col*nr, n, n_pad,
+                                        probes, SEED, row_comm, col_comm);
+        }
+    }
+
+    double *stage_time = (double *)calloc(q * STAGE_KINDS, sizeof(double));
+    MPI_Barrier(MPI_COMM_WORLD);
+    start_time = MPI_Wtime();
+
+    if (active) {
+        recv_bytes = fox_stages(kernel, tile, my_a, my_b, stage_a, result, nr, q,
+                                my_row, my_col, row_comm, col_comm, phase_time, stage_time);
+    }
+
+    // Master baru berhenti mengukur setelah rank paling lambat selesai
+    closing_barrier(stage_time, q, MPI_COMM_WORLD);
+    final_time = MPI_Wtime() - start_time;
+
+    // Fase terlama di antara semua rank, total byte komunikasi, checksum hasil
+    // dan peak RSS tiap rank (rank yang menganggur menyumbang nol)
+    double max_phase_time[NUM_PHASES];
+    MPI_Reduce(phase_time, max_phase_time, NUM_PHASES, MPI_DOUBLE, MPI_MAX, master, MPI_COMM_WORLD);
+
+    long long comm_bytes = 0;
+    MPI_Reduce(&recv_bytes, &comm_bytes, 1, MPI_LONG_LONG, MPI_SUM, master, MPI_COMM_WORLD);
+
+    double local_sum = 0.0, checksum = 0.0;
+    if (active) {
+        for (int k = 0; k < nr*nr; k++) local_sum += result[k];
+    }
+    MPI_Reduce(&local_sum, &checksum, 1, MPI_DOUBLE, MPI_SUM, master, MPI_COMM_WORLD);
+
+    long rss_kb = peak_rss_kb();
+    long *all_rss_kb = NULL;
+    if (my_rank == master) all_rss_kb = (long *)malloc(comm_sz * sizeof(long));
+    MPI_Gather(&rss_kb, 1, MPI_LONG, all_rss_kb, 1, MPI_LONG, master, MPI_COMM_WORLD);
+
+    // Waktu compute/comm/barrier per stage setiap rank untuk laporan imbalance
+    double *all_stage_time = gather_stage_times(stage_time, q, master, MPI_COMM_WORLD);
+
+    // Verifikasi: kumpulkan C di master, buang padding, lalu bandingkan
+    // dengan perkalian serial; mode --distributed membandingkan checksum dan
+    // --freivalds memakai probe acak tanpa mengumpulkan C
+    double max_error = 0.0, tolerance = 0.0;
+    if (probes > 0 && active) {
+        freivalds_check(result, nr, nr, my_col*nr, n, n_pad, probes, SEED, probe_z,
+                        row_comm, col_comm, &max_error, &tolerance);
+    } else if (verify && active && distributed) {
+        double *all_sums = NULL;
+        checksum_result(result, nr, nr, my_row*nr, my_col*nr, n_pad, SEED, sums);
+        if (my_rank == master) all_sums = (double *)malloc(checksum_len(n_pad) * sizeof(double));
+        MPI_Reduce(sums, all_sums, checksum_len(n_pad), MPI_DOUBLE, MPI_SUM, master, grid_comm);
+        if (my_rank == master) {
+            check_checksum(all_sums, n_pad, n, &max_error, &tolerance);
+            free(all_sums);
+        }
+    } else if (verify && active) {
+        float *flat_c = NULL;
+        if (my_rank == master) flat_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+        MPI_Gather(result, nr*nr, MPI_FLOAT, flat_c, nr*nr, MPI_FLOAT, master, grid_comm);
+
+        if (my_rank == master) {
+            float *pad_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+            float *c = (float *)malloc(n * n * sizeof(float));
+            from_blocks(flat_c, pad_c, n_pad, q, q);
+            crop_matrix(pad_c, c, n_pad, n);
+            check_product(a, b, c, n, &max_error, &tolerance);
+            free(pad_c); free(c); free(flat_c);
+        }
+    }
+
+    if (my_rank == master) {
+        printf("Total Time Elapsed is %.6f seconds\n", final_time);
+
+        // Satu baris JSON untuk dibaca BenchmarkRunner
+        double gflops = final_time > 0 ? 2.0 * n * n * (double)n / final_time / 1e9 : 0.0;
+        printf("{\"schema_version\": %d, \"program\": \"" PROGRAM_NAME "\", \"n\": %d, \"processes\": %d, "
+               "\"padded_n\": %d, \"active_processes\": %d, "
+               "\"time\": %.6f, \"phases\": {\"scatter\": %.6f, \"compute\": %.6f, "
+               "\"broadcast\": %.6f, \"shift\": %.6f}, \"gflops\": %.6f, \"checksum\": %.6e, "
+               "\"comm_bytes\": %lld, \"kernel\": \"%s\", \"tile\": %d, \"threads\": %d, "
+               "\"generation\": \"%s\", ",
+               SCHEMA_VERSION, n, comm_sz, n_pad, grid_sz, final_time,
+               max_phase_time[PHASE_SCATTER], max_phase_time[PHASE_COMPUTE],
+               max_phase_time[PHASE_BROADCAST], max_phase_time[PHASE_SHIFT],
+               gflops, checksum, comm_bytes, KERNEL_NAMES[kernel], tile,
+               kernel_threads(), distributed ? "distributed" : "root");
+        if (verify || probes > 0) {
+            const char *method = probes > 0 ? "freivalds" : distributed ? "checksum" : "full";
+            printf("\"verification\": {\"verified\": %s, \"method\": \"%s\", \"probes\": %d, "
+                   "\"max_error\": %.6e, \"tolerance\": %.6e}, ", max_error <= tolerance ? "true" : "false",
+                   method, probes, max_error, tolerance);
+        }
+        print_rank_times(all_stage_time, q, comm_sz);
+        printf("\"peak_rss_kb\": [");
+        for (int r = 0; r < comm_sz; r++) printf(r ? ", %ld" : "%ld", all_rss_kb[r]);
+        printf("]}\n");
+        free(all_rss_kb);
+        free(all_stage_time);
+    }
+
+    // Cleanup Memory
+    free(my_a); free(my_b); free(stage_a); free(result); free(sums); free(probe_z); free(stage_time);
+    if (my_rank == master) {
+        free(a); free(b); free(flat_a); free(flat_b);
+    }
+    if (active) {
+        MPI_Comm_free(&row_comm);
+        MPI_Comm_free(&col_comm);
+        MPI_Comm_free(&grid_comm);
+    }
+
+    MPI_Finalize();
+    return 0;
+}
@@ -0,0 +1,82 @@
+#ifndef FREIVALDS_H
+#define FREIVALDS_H
+
+#include <math.h>
+#include <stdlib.h>
+#include <mpi.h>
+#include "bench_util.h"
+
+// Verifikasi Freivalds terdistribusi: untuk vektor acak x, A * (B * x) harus
+// sama dengan C * x. Setiap perkalian matrix-vektor memakai blok lokal
+// (O(n^2 / P) per probe), MPI_Allreduce di communicator baris dan
+// MPI_Allgather di communicator kolom, tanpa mengumpulkan C di master.
+// Syarat: blok rank (i, j) berukuran rows x cols di baris-blok i dan
+// kolom-blok j, row_comm berurutan menurut j dan col_comm menurut i.
+
+// Vektor probe ke-probe: elemen [-1, 1) dari RNG counter, nol di padding
+static inline void probe_vector(double *x, int n, int n_pad, unsigned seed, int probe){
+    for (int j = 0; j < n_pad; j++) x[j] = j < n ? matrix_value(seed, 2 + probe, 0, j) : 0.0;
+}
+
+// out (n_pad, lengkap di setiap rank) = M * v untuk M terdistribusi per blok
+static inline void dist_matvec(const float *m, int rows, int cols, int col0, const double *v,
+                               double *out, MPI_Comm row_comm, MPI_Comm col_comm){
+    double *part = (double *)malloc(rows * sizeof(double));
+    for (int r = 0; r < rows; r++) {
+        double sum = 0.0;
+        for (int c = 0; c < cols; c++) sum += m[r*cols + c] * v[col0 + c];
+        part[r] = sum;
+    }
+    MPI_Allreduce(MPI_IN_PLACE, part, rows, MPI_DOUBLE, MPI_SUM, row_comm);
+    MPI_Allgather(part, rows, MPI_DOUBLE, out, rows, MPI_DOUBLE, col_comm);
+    free(part);
+}
+
+// Hitung z = A * (B * x) untuk setiap probe sebelum perkalian, selagi blok A
+// dan B masih di posisi awalnya. Mengembalikan probes * n_pad nilai.
+static inline double *freivalds_prepare(const float *a, const float *b, int rows, int cols, int col0,
+                                        int n, int n_pad, int probes, unsigned seed,
+                                        MPI_Comm row_comm, MPI_Comm col_comm){
+    double *x = (double *)malloc(n_pad * sizeof(double));
+    double *y = (double *)malloc(n_pad * sizeof(double));
+    double *z = (double *)malloc((size_t)probes * n_pad * sizeof(double));
+    for (int k = 0; k < probes; k++) {
+        probe_vector(x, n, n_pad, seed, k);
+        dist_matvec(b, rows, cols, col0, x, y, row_comm, col_comm);
+        dist_matvec(a, rows, cols, col0, y, &z[(size_t)k * n_pad], row_comm, col_comm);
+    }
+    free(x); free(y);
+    return z;
+}
+
+// Bandingkan C * x dengan z tiap probe. Toleransi per probe seperti
+// check_checksum: 1e-5 * max(|z|, 1); dilaporkan galat dan toleransi dari probe
+// dengan rasio galat/toleransi terbesar.
+static inline void freivalds_check(const float *c, int rows, int cols, int col0, int n, int n_pad,
+                                   int probes, unsigned seed, const double *z,
+                                   MPI_Comm row_comm, MPI_Comm col_comm,
+                                   double *max_error, double *tolerance){
+    double *x = (double *)malloc(n_pad * sizeof(double));
+    double *w = (double *)malloc(n_pad * sizeof(double));
+    double worst = -1.0;
+    *max_error = 0.0;
+    *tolerance = 0.0;
+    for (int k = 0; k < probes; k++) {
+        const double *zk = &z[(size_t)k * n_pad];
+        double err = 0.0, scale = 1.0;
+        probe_vector(x, n, n_pad, seed, k);
+        dist_matvec(c, rows, cols, col0, x, w, row_comm, col_comm);
+        for (int i = 0; i < n; i++) {
+            if (fabs(w[i] - zk[i]) > err) err = fabs(w[i] - zk[i]);
+            if (fabs(zk[i]) > scale) scale = fabs(zk[i]);
+        }
+        if (err / (1e-5 * scale) > worst) {
+            worst = err / (1e-5 * scale);
+            *max_error = err;
+            *tolerance = 1e-5 * scale;
+        }
+    }
+    free(x); free(w);
+}
+
+#endif
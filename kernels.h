@@ -0,0 +1,168 @@
+#ifndef KERNELS_H
+#define KERNELS_H
+
+#include <stdlib.h>
+#include <string.h>
+#ifdef USE_CBLAS
+#include <cblas.h>
+#endif
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+// Kernel perkalian matrix lokal C += A * B (blok n x n, row-major) yang dipakai
+// bersama oleh serial.c, matrix.c dan fox.c. Dipilih saat runtime dengan
+// argumen --kernel NAMA dan --tile T. Kernel "blas" (cblas_sgemm) hanya
+// tersedia jika dikompilasi dengan -DUSE_CBLAS dan di-link ke BLAS (-lopenblas).
+// Dikompilasi dengan -fopenmp (mode hybrid MPI+OpenMP), loop baris terluar
+// setiap kernel dibagi ke OMP_NUM_THREADS thread; komunikasi MPI tetap hanya
+// dilakukan thread utama (MPI_THREAD_FUNNELED).
+
+enum { KERNEL_NAIVE, KERNEL_IKJ, KERNEL_TILED, KERNEL_TRANSPOSED, KERNEL_BLAS, NUM_KERNELS };
+
+static const char *KERNEL_NAMES[NUM_KERNELS] = {"naive", "ikj", "tiled", "transposed", "blas"};
+
+#define DEFAULT_TILE 64
+
+// Pragma tanpa -fopenmp memicu -Wunknown-pragmas, jadi hanya dipasang jika aktif
+#ifdef _OPENMP
+#define OMP_PARALLEL_FOR _Pragma("omp parallel for schedule(static)")
+#else
+#define OMP_PARALLEL_FOR
+#endif
+
+// Jumlah thread OpenMP yang dipakai kernel (1 tanpa -fopenmp)
+static inline int kernel_threads(void){
+#ifdef _OPENMP
+    return omp_get_max_threads();
+#else
+    return 1;
+#endif
+}
+
+// Indeks kernel dari namanya, -1 jika tidak dikenal
+static inline int kernel_from_name(const char *name){
+    for (int k = 0; k < NUM_KERNELS; k++) {
+        if (strcmp(name, KERNEL_NAMES[k]) == 0) {
+#ifndef USE_CBLAS
+            if (k == KERNEL_BLAS) return -1;
+#endif
+            return k;
+        }
+    }
+    return -1;
+}
+
+// Ambil --kernel dan --tile dari argumen CLI; mengembalikan 0 jika tidak valid
+static inline int parse_kernel_args(int argc, char **argv, int *kernel, int *tile){
+    *kernel = KERNEL_NAIVE;
+    *tile = DEFAULT_TILE;
+    for (int i = 1; i < argc - 1; i++) {
+        if (strcmp(argv[i], "--kernel") == 0) *kernel = kernel_from_name(argv[i + 1]);
+        if (strcmp(argv[i], "--tile") == 0) *tile = atoi(argv[i + 1]);
+    }
+    return *kernel >= 0 && *tile > 0;
+}
+
+// Semua kernel menghitung C (m x n) += A (m x p) * B (p x n), row-major dan
+// berurutan di memori. Blok persegi Fox/Cannon memakai m = p = n.
+
+// i-j-k: B dibaca per kolom (stride n), tidak ramah cache
+static inline void kernel_naive(const float *a, const float *b, float *c, int m, int p, int n){
+    OMP_PARALLEL_FOR
+    for (int i = 0; i < m; i++) {
+        for (int j = 0; j < n; j++) {
+            float sum = 0.0;
+            for (int k = 0; k < p; k++) {
+                sum += a[i*p+k] * b[k*n+j];
+            }
+            c[i*n+j] += sum;
+        }
+    }
+}
+
+// i-k-j: loop terdalam berjalan berurutan di baris B dan C, bisa divektorisasi
+static inline void kernel_ikj(const float *a, const float *b, float *c, int m, int p, int n){
+    OMP_PARALLEL_FOR
+    for (int i = 0; i < m; i++) {
+        for (int k = 0; k < p; k++) {
+            float aik = a[i*p+k];
+            for (int j = 0; j < n; j++) {
+                c[i*n+j] += aik * b[k*n+j];
+            }
+        }
+    }
+}
+
+// i-k-j per tile tile x tile agar potongan A, B dan C tetap di cache; thread
+// membagi baris tile sehingga tidak ada dua thread yang menulis baris C yang sama
+static inline void kernel_tiled(const float *a, const float *b, float *c, int m, int p, int n, int tile){
+    OMP_PARALLEL_FOR
+    for (int ii = 0; ii < m; ii += tile) {
+        int i_end = ii + tile < m ? ii + tile : m;
+        for (int kk = 0; kk < p; kk += tile) {
+            int k_end = kk + tile < p ? kk + tile : p;
+            for (int jj = 0; jj < n; jj += tile) {
+                int j_end = jj + tile < n ? jj + tile : n;
+                for (int i = ii; i < i_end; i++) {
+                    for (int k = kk; k < k_end; k++) {
+                        float aik = a[i*p+k];
+                        for (int j = jj; j < j_end; j++) {
+                            c[i*n+j] += aik * b[k*n+j];
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+// B ditranspos dulu sehingga hasil kali titik membaca dua baris berurutan
+static inline void kernel_transposed(const float *a, const float *b, float *c, int m, int p, int n){
+    float *bt = (float *)malloc((size_t)p * n * sizeof(float));
+    OMP_PARALLEL_FOR
+    for (int k = 0; k < p; k++) {
+        for (int j = 0; j < n; j++) bt[j*p+k] = b[k*n+j];
+    }
+    OMP_PARALLEL_FOR
+    for (int i = 0; i < m; i++) {
+        for (int j = 0; j < n; j++) {
+            float sum = 0.0;
+            for (int k = 0; k < p; k++) {
+                sum += a[i*p+k] * bt[j*p+k];
+            }
+            c[i*n+j] += sum;
+        }
+    }
+    free(bt);
+}
+
+#ifdef USE_CBLAS
+// sgemm dari library BLAS: C = 1.0 * A * B + 1.0 * C. Thread BLAS diatur
+// lewat OPENBLAS_NUM_THREADS, bukan OpenMP.
+static inline void kernel_blas(const float *a, const float *b, float *c, int m, int p, int n){
+    cblas_sgemm(CblasRowMajor, CblasNoTrans, CblasNoTrans, m, n, p,
+                1.0f, a, p, b, n, 1.0f, c, n);
+}
+#endif
+
+// C (m x n) += A (m x p) * B (p x n) dengan kernel terpilih
+static inline void multiply_rect(int kernel, int tile, const float *a, const float *b, float *c,
+                                 int m, int p, int n){
+    switch (kernel) {
+#ifdef USE_CBLAS
+        case KERNEL_BLAS: kernel_blas(a, b, c, m, p, n); break;
+#endif
+        case KERNEL_IKJ: kernel_ikj(a, b, c, m, p, n); break;
+        case KERNEL_TILED: kernel_tiled(a, b, c, m, p, n, tile); break;
+        case KERNEL_TRANSPOSED: kernel_transposed(a, b, c, m, p, n); break;
+        default: kernel_naive(a, b, c, m, p, n); break;
+    }
+}
+
+// C += A * B untuk blok persegi n x n
+static inline void multiply_block(int kernel, int tile, const float *a, const float *b, float *c, int n){
+    multiply_rect(kernel, tile, a, b, c, n, n, n);
+}
+
+#endif
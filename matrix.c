@@ -3,10 +3,16 @@
 #include <mpi.h>
 #include <time.h>
 #include <math.h>
+#include "bench_util.h"
+#include "kernels.h"
+#include "rank_times.h"
 
 #define MATRIXSIZE 1000
 #define DEBUG 0  // Ubah ke 1 jika ingin cek hasil (HANYA UNTUK MATRIX KECIL)
 
+// Indeks fase untuk pengukuran waktu per fase
+enum { PHASE_SCATTER, PHASE_COMPUTE, PHASE_BROADCAST, PHASE_SHIFT, NUM_PHASES };
+
 void printarr(float* arr, int n){
     fprintf(stdout, "\n");
     for(int row = 0; row < n*n; row++){
@@ -24,14 +30,26 @@ int main(int argc, char **argv) {
     int master = 0;
     int tag = 0;
     double start_time, finish_time, final_time;
+    double phase_time[NUM_PHASES] = {0.0};
+    double t0;
+    int kernel, tile;
 
-    // Ambil input ukuran matrix dari argumen CLI
+    // Ambil input ukuran matrix dan kernel (--kernel, --tile) dari argumen CLI
     if (argc > 1) n = strtol(argv[1], NULL, 10);
+    int kernel_ok = parse_kernel_args(argc, argv, &kernel, &tile);
 
-    MPI_Init(&argc, &argv);
+    // Hanya thread utama yang memanggil MPI; thread OpenMP dipakai di kernel
+    int provided;
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &provided);
     MPI_Comm_size(MPI_COMM_WORLD, &comm_sz);
     MPI_Comm_rank(MPI_COMM_WORLD, &my_rank);
 
+    if (!kernel_ok) {
+        if (my_rank == master) fprintf(stderr, "Error: Kernel atau ukuran tile tidak dikenal\n");
+        MPI_Finalize();
+        return 0;
+    }
+
     int np = (int)pow(comm_sz, 0.5);
     
     // Validasi kuadrat sempurna
@@ -109,9 +127,12 @@ int main(int argc, char **argv) {
     // Inisialisasi result dengan 0
     for(int i=0; i<nr*nr; i++) result[i] = 0.0;
 
+    t0 = MPI_Wtime();
     MPI_Scatter(flat_a, nr*nr, MPI_FLOAT, rank_a, nr*nr, MPI_FLOAT, 0, MPI_COMM_WORLD);
     MPI_Scatter(flat_b, nr*nr, MPI_FLOAT, rank_b, nr*nr, MPI_FLOAT, 0, MPI_COMM_WORLD);
+    phase_time[PHASE_SCATTER] = MPI_Wtime() - t0;
 
+    double *stage_time = (double *)calloc(np * STAGE_KINDS, sizeof(double));
     start_time = MPI_Wtime();
 
     // Setup Grid Source
@@ -138,6 +159,7 @@ int main(int argc, char **argv) {
             int high = low + np;
 
             // Broadcast A secara manual di baris (Simplifikasi Fox)
+            t0 = MPI_Wtime();
             if(my_rank == source[i*np+j]){
                 for(int k = low; k < high; k++){
                     if(my_rank != k){
@@ -151,17 +173,12 @@ int main(int argc, char **argv) {
                     MPI_Recv(local_a, nr*nr, MPI_FLOAT, source[i*np+j], tag, MPI_COMM_WORLD, &status);
                 }
             }
+            add_time(phase_time, PHASE_BROADCAST, stage_time, i, STAGE_COMM, t0);
 
             // Matrix Multiplication Kernel
-            for (int x = 0; x < nr; x++) {
-                for (int y = 0; y < nr; y++) {
-                    float sum = 0.0;
-                    for (int z = 0; z < nr ; z++) {
-                        sum += local_a[x*nr+z] * local_b[z*nr+y];
-                    }
-                    result[x*nr+y] += sum;
-                }
-            }
+            t0 = MPI_Wtime();
+            multiply_block(kernel, tile, local_a, local_b, result, nr);
+            add_time(phase_time, PHASE_COMPUTE, stage_time, i, STAGE_COMPUTE, t0);
         }
 
         // Shift B ke atas
@@ -170,7 +187,10 @@ int main(int argc, char **argv) {
         if (destination < 0) destination += np*np;
         if (src >= np*np) src -= np*np;
 
+        t0 = MPI_Wtime();
         MPI_Barrier(MPI_COMM_WORLD);
+        double t_barrier = MPI_Wtime();
+        stage_time[i * STAGE_KINDS + STAGE_BARRIER] += t_barrier - t0;
         
         // --- FIX 2: Non-blocking Send dan Recv yang aman ---
         // Kirim 'rank_b' milik kita ke atas (destination)
@@ -186,13 +206,50 @@ int main(int argc, char **argv) {
         
         // Pindahkan local_b (yang baru diterima) kembali ke rank_b untuk iterasi selanjutnya
         for(int k=0; k<nr*nr; k++) rank_b[k] = local_b[k];
+        phase_time[PHASE_SHIFT] += MPI_Wtime() - t0;
+        stage_time[i * STAGE_KINDS + STAGE_COMM] += MPI_Wtime() - t_barrier;
     }
 
+    // Master baru berhenti mengukur setelah rank paling lambat selesai
+    closing_barrier(stage_time, np, MPI_COMM_WORLD);
     finish_time = MPI_Wtime();
     final_time = finish_time - start_time;
 
+    // Fase terlama di antara semua rank, checksum hasil dan peak RSS tiap rank
+    double max_phase_time[NUM_PHASES];
+    MPI_Reduce(phase_time, max_phase_time, NUM_PHASES, MPI_DOUBLE, MPI_MAX, master, MPI_COMM_WORLD);
+
+    double local_sum = 0.0, checksum = 0.0;
+    for(int k = 0; k < nr*nr; k++) local_sum += result[k];
+    MPI_Reduce(&local_sum, &checksum, 1, MPI_DOUBLE, MPI_SUM, master, MPI_COMM_WORLD);
+
+    long rss_kb = peak_rss_kb();
+    long *all_rss_kb = NULL;
+    if(my_rank == master) all_rss_kb = (long *)malloc(comm_sz * sizeof(long));
+    MPI_Gather(&rss_kb, 1, MPI_LONG, all_rss_kb, 1, MPI_LONG, master, MPI_COMM_WORLD);
+
+    // Waktu compute/comm/barrier per stage setiap rank untuk laporan imbalance
+    double *all_stage_time = gather_stage_times(stage_time, np, master, MPI_COMM_WORLD);
+
     if(my_rank == master) {
         printf("Total Time Elapsed is %.6f seconds\n", final_time);
+
+        // Satu baris JSON untuk dibaca BenchmarkRunner
+        double gflops = final_time > 0 ? 2.0 * n * n * (double)n / final_time / 1e9 : 0.0;
+        printf("{\"schema_version\": %d, \"program\": \"matrix\", \"n\": %d, \"processes\": %d, "
+               "\"time\": %.6f, \"phases\": {\"scatter\": %.6f, \"compute\": %.6f, "
+               "\"broadcast\": %.6f, \"shift\": %.6f}, \"gflops\": %.6f, \"checksum\": %.6e, "
+               "\"kernel\": \"%s\", \"tile\": %d, \"threads\": %d, ",
+               SCHEMA_VERSION, n, comm_sz, final_time,
+               max_phase_time[PHASE_SCATTER], max_phase_time[PHASE_COMPUTE],
+               max_phase_time[PHASE_BROADCAST], max_phase_time[PHASE_SHIFT],
+               gflops, checksum, KERNEL_NAMES[kernel], tile, kernel_threads());
+        print_rank_times(all_stage_time, np, comm_sz);
+        printf("\"peak_rss_kb\": [");
+        for(int r = 0; r < comm_sz; r++) printf(r ? ", %ld" : "%ld", all_rss_kb[r]);
+        printf("]}\n");
+        free(all_rss_kb);
+        free(all_stage_time);
     }
 
     // --- FIX 1: Masalah Segfault disini ---
@@ -214,7 +271,7 @@ int main(int argc, char **argv) {
     }
 
     // Cleanup Memory
-    free(rank_a); free(rank_b); free(local_a); free(local_b); free(result);
+    free(rank_a); free(rank_b); free(local_a); free(local_b); free(result); free(stage_time);
     if(my_rank == master) {
         free(a); free(b); free(flat_a); free(flat_b);
     }
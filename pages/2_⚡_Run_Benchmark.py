@@ -6,11 +6,18 @@ import streamlit as st
 import sys
 from pathlib import Path
 import time
+import uuid
 
 # Add utils to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils import DockerManager, BenchmarkRunner
+from utils import DockerManager, BenchmarkRunner, get_job_manager, pivot_times
+from utils.job_manager import ACTIVE_STATES
+from utils.placement import POLICIES, BINDINGS, padding_plan, process_grid
+from utils.benchmark_runner import (
+    COMPILER_PROFILES, DEFAULT_KERNEL, DEFAULT_PROFILE, DEFAULT_TILE, KERNELS, PARALLEL_ALGORITHMS
+)
+import pandas as pd
 
 st.set_page_config(page_title="Run Benchmark", page_icon="⚡", layout="wide")
 
@@ -50,28 +57,45 @@ if 'docker_manager' not in st.session_state:
 if 'benchmark_runner' not in st.session_state:
     st.session_state.benchmark_runner = BenchmarkRunner(st.session_state.docker_manager)
 
+# Browser session owning the jobs submitted from this page
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
 docker_mgr = st.session_state.docker_manager
 bench_runner = st.session_state.benchmark_runner
+job_manager = get_job_manager(docker_mgr)
+session_id = st.session_state.session_id
 
-# Check Docker status
-if not docker_mgr.is_docker_available():
-    st.error("Docker is not available. Please start Docker and refresh this page.")
-    st.stop()
-
-# Check cluster status
-cluster_status = docker_mgr.get_cluster_status()
-running_nodes = sum(1 for status in cluster_status.values() if status == "running")
+# Executor backend
+executor_name = st.sidebar.radio(
+    "Executor:",
+    ["docker", "local"],
+    format_func=lambda name: {"docker": "Docker cluster", "local": "Local host"}[name],
+    help="Local host runs gcc, mpicc and mpirun directly, without containers"
+)
 
-if running_nodes == 0:
-    st.warning("No cluster nodes are running. Please start the cluster first.")
-    if st.button("Start Cluster Now"):
-        with st.spinner("Starting cluster..."):
-            docker_mgr.start_cluster()
-            st.success("Cluster started")
-            st.rerun()
-    st.stop()
-
-st.success(f"Cluster active: {running_nodes}/4 nodes online")
+if executor_name == "docker":
+    # Check Docker status
+    if not docker_mgr.is_docker_available():
+        st.error("Docker is not available. Please start Docker and refresh this page, or select the Local host executor.")
+        st.stop()
+    
+    # Check cluster status
+    cluster_status = docker_mgr.get_cluster_status()
+    running_nodes = sum(1 for status in cluster_status.values() if status == "running")
+    
+    if running_nodes == 0:
+        st.warning("No cluster nodes are running. Please start the cluster first.")
+        if st.button("Start Cluster Now"):
+            with st.spinner("Starting cluster..."):
+                docker_mgr.start_cluster()
+                st.success("Cluster started")
+                st.rerun()
+        st.stop()
+    
+    st.success(f"Cluster active: {running_nodes}/4 nodes online")
+else:
+    st.info("Benchmarks run directly on this host (bare metal, no docker exec overhead)")
 
 st.markdown("---")
 
@@ -82,7 +106,13 @@ col1, col2 = st.columns([2, 1])
 
 with col1:
     # Algorithm (Fox's Algorithm for Matrix Multiplication)
-    algorithm = "Matrix Multiplication"
+    algorithm = st.selectbox(
+        "Parallel Algorithm:",
+        list(PARALLEL_ALGORITHMS),
+        format_func=PARALLEL_ALGORITHMS.get,
+        help="Fox, Cannon and SUMMA report the same metrics, including communication volume. "
+             "The legacy matrix.c repeats every block multiply sqrt(P) times per stage; kept for comparison"
+    )
     
     # Matrix size
     matrix_size = st.slider(
@@ -102,29 +132,76 @@ with col2:
     
     exec_mode = st.radio(
         "Select mode:",
-        ["Serial", "Single Node", "Multi Node", "Compare All"],
-        help="Serial: 1 process | Single: Multiple processes on 1 node | Multi: Distributed across nodes"
+        ["Serial", "Single Node", "Multi Node", "Hybrid", "Compare All"],
+        help="Serial: 1 process | Single: Multiple processes on 1 node | Multi: Distributed across nodes | Hybrid: few ranks per node with OpenMP threads"
     )
     
     # Additional parameters
-    if exec_mode in ["Single Node", "Multi Node", "Compare All"]:
+    if exec_mode in ["Single Node", "Multi Node", "Hybrid", "Compare All"]:
         num_processes = st.select_slider(
             "Number of Processes:",
-            options=[1, 2, 4, 8, 16],
+            options=[1, 2, 3, 4, 6, 8, 9, 12, 16],
             value=4,
-            help="Total MPI processes (must be perfect square for matrix multiplication)"
+            help="Total MPI processes (legacy matrix_multiplication needs a perfect square)"
         )
         
         # Validation warnings
-        import math
-        sqrt_val = math.sqrt(num_processes)
-        if sqrt_val != int(sqrt_val):
-            st.warning(f"⚠️ {num_processes} bukan kuadrat sempurna. Gunakan 1, 4, 9, atau 16 untuk matrix multiplication.")
+        grid_rows, grid_cols = process_grid(num_processes, algorithm)
+        if algorithm == "matrix_multiplication":
+            if grid_rows * grid_cols != num_processes:
+                st.warning(f"⚠️ {num_processes} bukan kuadrat sempurna. Gunakan 1, 4, 9, atau 16, atau pilih algoritma lain.")
+        else:
+            if grid_rows * grid_cols != num_processes:
+                st.warning(
+                    f"⚠️ {algorithm} hanya memakai grid {grid_rows} × {grid_cols}: "
+                    f"{num_processes - grid_rows * grid_cols} dari {num_processes} rank menganggur. "
+                    f"Pilih SUMMA agar semua rank bekerja."
+                )
+            padding = padding_plan(matrix_size, num_processes, algorithm)
+            st.caption(
+                f"Process grid: {grid_rows} × {grid_cols} · padded N {padding['padded_n']} "
+                f"(+{padding['flop_overhead']:.1%} FLOPs) · {padding['idle_processes']} idle rank(s)"
+            )
         
         if num_processes > 8:
             st.info("ℹ️ Processes > 8 membutuhkan shared memory lebih besar. Jika error, kurangi jumlah processes atau ukuran matrix.")
+        
+        threads_per_rank = st.number_input(
+            "Threads per Rank (OpenMP):",
+            min_value=1,
+            max_value=16,
+            value=2 if exec_mode == "Hybrid" else 1,
+            help="OMP_NUM_THREADS for each rank; more than 1 builds with -fopenmp"
+        )
+        ranks_per_node = 1
+        if exec_mode == "Hybrid":
+            ranks_per_node = st.number_input(
+                "Ranks per Node:",
+                min_value=1,
+                max_value=16,
+                value=1,
+                help="MPI ranks placed on each node; fewer ranks means fewer messages and less /dev/shm use"
+            )
+            nodes_used = -(-num_processes // ranks_per_node)
+            st.caption(
+                f"{nodes_used} node(s) × {ranks_per_node} rank(s) × {threads_per_rank} thread(s) "
+                f"= {num_processes * threads_per_rank} cores"
+            )
+        
+        placement_policy = st.selectbox(
+            "Rank Placement (multi node):",
+            POLICIES,
+            help="block: contiguous chunks per node | cyclic: round-robin over nodes | fill_head: fill each node's cores, head first"
+        )
+        binding = st.selectbox(
+            "Process Binding:",
+            BINDINGS,
+            help="Passed to mpirun as --bind-to"
+        )
     else:
         num_processes = 1
+        threads_per_rank, ranks_per_node = 1, 1
+        placement_policy, binding = "block", "none"
 
 # Advanced options
 with st.expander("Advanced Options"):
@@ -133,7 +210,88 @@ with st.expander("Advanced Options"):
         min_value=1,
         max_value=10,
         value=1,
-        help="Execute benchmark multiple times and average results"
+        help="Execute benchmark multiple times; the median is reported with a bootstrap 95% CI"
+    )
+    
+    warmup_runs = st.number_input(
+        "Warm-up Runs:",
+        min_value=0,
+        max_value=5,
+        value=0,
+        help="Unmeasured runs executed before the measured repetitions"
+    )
+    
+    run_timeout = st.number_input(
+        "Timeout per run (seconds, 0 = auto):",
+        min_value=0,
+        max_value=86400,
+        value=0,
+        help="Runs exceeding this are killed on every node. Auto scales with the expected O(N³) cost."
+    )
+    
+    kernel = st.selectbox(
+        "Local Kernel:",
+        list(KERNELS),
+        index=list(KERNELS).index(DEFAULT_KERNEL),
+        format_func=KERNELS.get,
+        help="Block multiply used by serial.c and every rank; serial and parallel always share it"
+    )
+    
+    tile = st.number_input(
+        "Tile Size:",
+        min_value=8,
+        max_value=512,
+        value=DEFAULT_TILE,
+        step=8,
+        disabled=kernel != "tiled",
+        help="Edge of the square tiles of the tiled kernel"
+    )
+    
+    profile = st.selectbox(
+        "Compiler Profile:",
+        list(COMPILER_PROFILES),
+        index=list(COMPILER_PROFILES).index(DEFAULT_PROFILE),
+        format_func=lambda name: f"{name} ({COMPILER_PROFILES[name]})",
+        help="Optimisation flags passed to gcc/mpicc; recorded with each result"
+    )
+    
+    verify_result = st.checkbox(
+        "Verify result",
+        value=False,
+        help="Gather C on the master rank and compare it with a serial product (adds an O(N³) check after timing)"
+    )
+    
+    freivalds_probes = st.number_input(
+        "Freivalds probes (0 = off):",
+        min_value=0,
+        max_value=20,
+        value=0,
+        help="Check A·(B·x) against C·x for random vectors x, distributed over the ranks: O(N²) per probe and C is never gathered. Replaces 'Verify result' when set"
+    )
+    
+    distributed = st.checkbox(
+        "Generate blocks on each rank",
+        value=False,
+        help="Every rank builds its own A/B blocks from a seeded counter-based RNG: no N² buffers or scatter on the root, so larger N fits; verification switches to a checksum"
+    )
+    
+    profile_mpi = st.checkbox(
+        "Profile MPI calls (PMPI)",
+        value=False,
+        help="Link the PMPI shim (pmpi_profile.c): counts calls, bytes and time per rank and peer for Send/Recv/Isend/Irecv/Wait/Waitall/Sendrecv_replace/Barrier/Scatter/Bcast/Ibcast, shown as a rank×rank communication matrix. Reduce, Allreduce, Gather and Allgather are not counted"
+    )
+    
+    reuse_baseline = st.checkbox(
+        "Reuse serial baseline",
+        value=True,
+        help="Comparisons and sweeps reuse a stored serial timing for the same N, binary and node; stale entries are refreshed in the background"
+    )
+    
+    refresh_baseline = st.checkbox(
+        "Force baseline refresh",
+        value=False,
+        disabled=not reuse_baseline,
+        help="Re-run serial now and store the new timing as the baseline"
     )
     
     show_output = st.checkbox(
@@ -145,7 +303,7 @@ with st.expander("Advanced Options"):
     save_results = st.checkbox(
         "Save results to file",
         value=True,
-        help="Store results in data/results/ directory"
+        help="Store results in the results store (data/results/results.db)"
     )
 
 st.markdown("---")
@@ -162,115 +320,305 @@ with col2:
 with col3:
     st.metric("Processes", num_processes)
 
-# Run button
+# Run button: the benchmark runs as a background job so the page stays responsive
 if st.button("RUN BENCHMARK", type="primary", use_container_width=True):
+    job_kinds = {
+        "Serial": "serial",
+        "Single Node": "single_node",
+        "Multi Node": "multi_node",
+        "Hybrid": "hybrid",
+        "Compare All": "comparison"
+    }
+    job_params = {
+        "matrix_size": matrix_size,
+        "repeats": repeat_runs,
+        "warmups": warmup_runs,
+        "timeout": run_timeout or None,
+        "kernel": kernel,
+        "tile": tile,
+        "profile": profile,
+        "executor": executor_name
+    }
+    if exec_mode != "Serial":
+        job_params["num_processes"] = num_processes
+        job_params["binding"] = binding
+        job_params["algorithm"] = algorithm
+        job_params["verify"] = verify_result
+        job_params["freivalds"] = freivalds_probes
+        job_params["distributed"] = distributed
+        job_params["pmpi"] = profile_mpi
+        job_params["threads_per_rank"] = threads_per_rank
+        if exec_mode == "Hybrid":
+            job_params["ranks_per_node"] = ranks_per_node
+        if exec_mode in ("Multi Node", "Compare All"):
+            job_params["placement_policy"] = placement_policy
+        if exec_mode == "Compare All":
+            job_params["reuse_baseline"] = reuse_baseline
+            job_params["refresh_baseline"] = refresh_baseline
+    
+    st.session_state.active_job_id = job_manager.submit(job_kinds[exec_mode], job_params, session_id)
+
+# Job Monitor
+active_job_id = st.session_state.get("active_job_id")
+if active_job_id is None:
+    # Re-attach to a job this browser session started before navigating away
+    running_jobs = [
+        j for j in job_manager.list_jobs()
+        if j["status"] in ACTIVE_STATES and j.get("session_id") == session_id
+    ]
+    if running_jobs:
+        active_job_id = st.session_state.active_job_id = running_jobs[0]["job_id"]
+
+job = job_manager.get(active_job_id) if active_job_id else None
+poll_job = job is not None and job["status"] in ACTIVE_STATES
+if job is None:
+    st.session_state.pop("active_job_id", None)
+elif poll_job:
+    st.markdown("### Benchmark Execution")
+    st.caption(f"Job `{job['job_id']}` · {job['kind'].replace('_', ' ')} · {job['status'].replace('_', ' ')}")
+    st.progress(min(1.0, job["progress"]))
+    st.text(job["message"])
     
-    # Create results container
-    results_container = st.container()
+    if show_output and job.get("output_tail"):
+        st.code(job["output_tail"])
     
-    with results_container:
-        st.markdown("### Benchmark Execution")
-        
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        try:
-            if exec_mode == "Serial":
-                # Serial execution
-                status_text.text("Compiling serial code...")
-                progress_bar.progress(20)
-                time.sleep(0.5)
-                
-                status_text.text("Running serial benchmark...")
-                progress_bar.progress(40)
-                
-                result = bench_runner.run_serial_benchmark(matrix_size)
-                progress_bar.progress(100)
-                
-                if result["success"]:
-                    status_text.text("Benchmark completed successfully")
-                    st.session_state.last_result = result
-                else:
-                    # Show user-friendly error if available
-                    if 'user_error' in result:
-                        st.error(f"❌ {result['user_error']}")
-                    else:
-                        st.error(f"❌ Benchmark failed: {result.get('error', 'Unknown error')}")
-                    
-                    # Show raw error in expander
-                    if 'error' in result:
-                        with st.expander("Technical Details"):
-                            st.code(result['error'])
-            
-            elif exec_mode == "Single Node":
-                # Single node parallel
-                status_text.text("Compiling parallel code...")
-                progress_bar.progress(20)
-                time.sleep(0.5)
-                
-                status_text.text(f"Running on single node with {num_processes} processes...")
-                progress_bar.progress(40)
-                
-                result = bench_runner.run_parallel_benchmark(
-                    matrix_size, num_processes, "single_node"
-                )
-                progress_bar.progress(100)
-                
-                if result["success"]:
-                    status_text.text("Benchmark completed successfully")
-                    st.session_state.last_result = result
-                else:
-                    if 'user_error' in result:
-                        st.error(f"❌ {result['user_error']}")
-                    else:
-                        st.error(f"❌ Benchmark failed: {result.get('error', 'Unknown error')}")
-                    
-                    if 'error' in result:
-                        with st.expander("Technical Details"):
-                            st.code(result['error'])
-            
-            elif exec_mode == "Multi Node":
-                # Multi node parallel
-                status_text.text("Compiling parallel code...")
-                progress_bar.progress(20)
-                time.sleep(0.5)
-                
-                status_text.text(f"Running across multiple nodes with {num_processes} processes...")
-                progress_bar.progress(40)
-                
-                result = bench_runner.run_parallel_benchmark(
-                    matrix_size, num_processes, "multi_node"
-                )
-                progress_bar.progress(100)
-                
-                if result["success"]:
-                    status_text.text("Benchmark completed successfully")
-                    st.session_state.last_result = result
-                else:
-                    if 'user_error' in result:
-                        st.error(f"❌ {result['user_error']}")
-                    else:
-                        st.error(f"❌ Benchmark failed: {result.get('error', 'Unknown error')}")
-                    
-                    if 'error' in result:
-                        with st.expander("Technical Details"):
-                            st.code(result['error'])
-            
-            else:  # Compare All
-                status_text.text("🔧 Running comprehensive comparison...")
-                progress_bar.progress(10)
-                
-                result = bench_runner.run_comparison(matrix_size, num_processes)
-                progress_bar.progress(100)
-                status_text.text("✅ All benchmarks completed!")
-                st.session_state.last_result = result
+    if st.button("Cancel Job", use_container_width=True):
+        job_manager.cancel(active_job_id)
+else:
+    # Job finished: hand the result to the results section
+    del st.session_state.active_job_id
+    result = job.get("result")
+    
+    if job["status"] == "failed" and result is None:
+        st.error(f"Error during benchmark execution: {job['error']}")
+    elif job["status"] in ("cancelled", "interrupted"):
+        st.warning(f"Benchmark {job['status']}")
+    elif job["status"] == "failed":
+        # Show user-friendly error if available
+        if 'user_error' in result:
+            st.error(f"❌ {result['user_error']}")
+        else:
+            st.error(f"❌ Benchmark failed: {result.get('error', 'Unknown error')}")
         
-        except Exception as e:
-            st.error(f"Error during benchmark execution: {e}")
-            status_text.text("Benchmark failed")
-            import traceback
-            st.code(traceback.format_exc())
+        # Show raw error in expander
+        if 'error' in result:
+            with st.expander("Technical Details"):
+                st.code(result['error'])
+    elif job["kind"] == "crossover":
+        st.session_state.last_crossover = result
+        st.success("✅ Crossover search completed")
+    elif job["kind"] == "scaling":
+        st.session_state.last_scaling = result
+        st.success(f"✅ {result['study'].title()}-scaling study completed")
+    elif job["kind"] == "sweep":
+        st.session_state.last_sweep = pd.DataFrame(result["scaling_table"])
+        st.success(f"✅ Sweep {result['sweep_id']} completed")
+    else:
+        st.session_state.last_result = result
+        st.success("✅ Benchmark completed successfully")
+
+st.markdown("---")
+
+# Parameter Sweep
+st.header("📊 Parameter Sweep")
+
+with st.expander("Sweep Configuration"):
+    sweep_sizes = st.multiselect(
+        "Matrix Sizes:",
+        options=list(range(100, 5100, 100)),
+        default=[100, 500, 1000, 1500, 2000],
+        help="Every size is run for every mode and process count"
+    )
+    sweep_procs = st.multiselect(
+        "Process Counts:",
+        options=[1, 2, 4, 6, 8, 9, 12, 16],
+        default=[4],
+        help="Invalid (N, P) combinations are skipped; Fox and Cannon leave ranks beyond the largest square grid idle, so non-square counts need SUMMA"
+    )
+    sweep_modes = st.multiselect(
+        "Modes:",
+        options=["serial", "single_node", "multi_node"],
+        default=["serial", "single_node", "multi_node"]
+    )
+    sweep_algorithms = st.multiselect(
+        "Algorithms:",
+        options=list(PARALLEL_ALGORITHMS),
+        default=[algorithm],
+        help="Each algorithm is swept over every size, mode and process count"
+    )
+    
+    if st.button("RUN SWEEP", use_container_width=True):
+        st.session_state.active_job_id = job_manager.submit("sweep", {
+            "sizes": sweep_sizes,
+            "process_counts": sweep_procs,
+            "modes": sweep_modes,
+            "kernel_options": {
+                "algorithm": sweep_algorithms or [algorithm],
+                "placement_policy": [placement_policy], "binding": [binding],
+                "kernel": [kernel], "tile": [tile], "profile": [profile]
+            },
+            "repeats": repeat_runs,
+            "warmups": warmup_runs,
+            "reuse_baseline": reuse_baseline,
+            "refresh_baseline": refresh_baseline,
+            "executor": executor_name
+        }, session_id)
+        st.rerun()
+
+if 'last_sweep' in st.session_state and not st.session_state.last_sweep.empty:
+    sweep_table = st.session_state.last_sweep
+    st.subheader("Execution Time (s) by Mode@Processes")
+    st.dataframe(pivot_times(sweep_table, ["algorithm"]), use_container_width=True)
+    st.subheader("Scaling Table")
+    st.dataframe(sweep_table, use_container_width=True, hide_index=True)
+    st.download_button(
+        label="Download Scaling Table (CSV)",
+        data=sweep_table.to_csv(index=False),
+        file_name="scaling_table.csv",
+        mime="text/csv"
+    )
+
+st.markdown("---")
+
+# Crossover Search
+st.header("🎯 Crossover Search")
+
+with st.expander("Search Configuration"):
+    st.caption(
+        "Brackets and bisects on N to find where multi-node starts beating single-node, "
+        "sampling each point only until the confidence intervals separate."
+    )
+    cross_col1, cross_col2 = st.columns(2)
+    with cross_col1:
+        cross_procs = st.select_slider("Processes:", options=[4, 9, 16], value=4)
+        cross_tolerance = st.number_input("Tolerance on N:", min_value=10, max_value=1000, value=100)
+    with cross_col2:
+        cross_range = st.slider("N range:", min_value=100, max_value=5000, value=(100, 3000), step=100)
+        cross_threshold = st.slider(
+            "Efficiency threshold (0 = skip):", min_value=0.0, max_value=1.0, value=0.5, step=0.05
+        )
+    
+    if st.button("RUN CROSSOVER SEARCH", use_container_width=True):
+        st.session_state.active_job_id = job_manager.submit("crossover", {
+            "num_processes": cross_procs,
+            "n_min": cross_range[0],
+            "n_max": cross_range[1],
+            "tolerance": cross_tolerance,
+            "efficiency_threshold": cross_threshold or None,
+            "algorithm": algorithm,
+            "placement_policy": placement_policy,
+            "binding": binding,
+            "kernel": kernel,
+            "tile": tile,
+            "profile": profile,
+            "executor": executor_name
+        }, session_id)
+        st.rerun()
+
+if 'last_crossover' in st.session_state:
+    crossover = st.session_state.last_crossover["crossover"]
+    if crossover["found"]:
+        st.success(f"{crossover['message']} (bracket {crossover['bracket'][0]}–{crossover['bracket'][1]})")
+    else:
+        st.warning(crossover["message"])
+    st.caption(f"Total benchmark runs: {st.session_state.last_crossover['total_runs']}")
+    
+    st.dataframe(pd.DataFrame([
+        {
+            "N": e["matrix_size"],
+            "Single Node (s)": f"{e['single_node']['median']:.4f}",
+            "Multi Node (s)": f"{e['multi_node']['median']:.4f}",
+            "Faster": "Multi Node" if e["direction"] > 0 else "Single Node",
+            "Significant": "yes" if e["decided"] else "no",
+            "Runs": e["single_node"]["n"] + e["multi_node"]["n"]
+        }
+        for e in crossover["evaluations"]
+    ]), use_container_width=True, hide_index=True)
+    
+    efficiency = st.session_state.last_crossover.get("efficiency")
+    if efficiency and efficiency.get("evaluations"):
+        if efficiency.get("max_processes_above_threshold"):
+            st.info(
+                f"At N={efficiency['matrix_size']}, up to {efficiency['max_processes_above_threshold']} "
+                f"processes keep efficiency ≥ {efficiency['threshold']:.0%}"
+            )
+        else:
+            st.warning(f"No process count keeps efficiency ≥ {efficiency['threshold']:.0%}")
+
+st.markdown("---")
+
+# Scaling Study
+st.header("📐 Scaling Study")
+
+with st.expander("Study Configuration"):
+    st.caption(
+        "Strong scaling keeps N fixed while P grows (Amdahl fit). Weak scaling grows N "
+        "with √P so every rank holds the same N²/P elements (Gustafson fit)."
+    )
+    scale_col1, scale_col2 = st.columns(2)
+    with scale_col1:
+        scaling_kind = st.radio("Study:", ["strong", "weak"], horizontal=True)
+        scaling_size = st.number_input(
+            "Matrix size (base N for weak scaling):",
+            min_value=12, max_value=5000, value=600, step=12
+        )
+    with scale_col2:
+        scaling_procs = st.multiselect("Process Counts:", options=[1, 4, 9, 16, 25], default=[1, 4, 9, 16])
+        scaling_mode = st.selectbox("Parallel mode:", ["multi_node", "single_node", "hybrid"])
+    
+    if st.button("RUN SCALING STUDY", use_container_width=True):
+        st.session_state.active_job_id = job_manager.submit("scaling", {
+            "study": scaling_kind,
+            "matrix_size": scaling_size,
+            "process_counts": scaling_procs,
+            "mode": scaling_mode,
+            "threads_per_rank": threads_per_rank,
+            "ranks_per_node": ranks_per_node,
+            "algorithm": algorithm,
+            "kernel": kernel,
+            "tile": tile,
+            "profile": profile,
+            "distributed": distributed,
+            "repeats": repeat_runs,
+            "warmups": warmup_runs,
+            "executor": executor_name
+        }, session_id)
+        st.rerun()
+
+if 'last_scaling' in st.session_state:
+    scaling = st.session_state.last_scaling
+    serial_fraction = scaling.get("serial_fraction")
+    
+    scale_col1, scale_col2 = st.columns(2)
+    with scale_col1:
+        st.metric(
+            f"Serial fraction ({scaling['model'].title()} fit)",
+            f"{serial_fraction:.4f}" if serial_fraction is not None else "-"
+        )
+    with scale_col2:
+        if scaling.get("max_speedup"):
+            st.metric("Speedup limit (1/f)", f"{scaling['max_speedup']:.1f}x")
+    
+    scaling_df = pd.DataFrame(scaling["points"])
+    if not scaling_df.empty:
+        st.dataframe(
+            scaling_df.rename(columns={
+                "matrix_size": "N",
+                "num_processes": "P",
+                "serial_time": "Serial (s)",
+                "parallel_time": "Parallel (s)",
+                "speedup": "Speedup",
+                "efficiency": "Efficiency",
+                "karp_flatt": "Karp-Flatt e",
+                "predicted_speedup": "Fitted Speedup",
+                "error": "Error"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.line_chart(
+            scaling_df.set_index("num_processes")[["speedup", "predicted_speedup"]]
+        )
 
 st.markdown("---")
 
@@ -298,20 +646,40 @@ if 'last_result' in st.session_state:
         # Detailed table
         st.subheader("Detailed Metrics")
         
-        import pandas as pd
         rows = []
         for mode, data in result["tests"].items():
             if data.get("success"):
+                stats = data.get("stats", {})
                 rows.append({
                     "Mode": mode.replace('_', ' ').title(),
                     "Time (s)": f"{data['execution_time']:.3f}",
+                    "95% CI (s)": f"{stats.get('ci_low', 0):.3f} – {stats.get('ci_high', 0):.3f}",
+                    "Std Dev": f"{stats.get('stddev', 0):.4f}",
+                    "Outliers": len(stats.get('outliers', [])),
                     "Speedup": f"{data.get('speedup', 1.0):.2f}x",
                     "Efficiency": f"{data.get('efficiency', 1.0):.2%}",
-                    "Processes": data.get('num_processes', 1)
+                    "Processes": data.get('num_processes', 1),
+                    "Verified": (
+                        ("✅" if data["verification"]["verified"] else "❌")
+                        if data.get("verification") else "-"
+                    )
                 })
         
         df = pd.DataFrame(rows)
         st.dataframe(df, use_container_width=True, hide_index=True)
+        
+        # Both parallel runs share N, P and algorithm, so one idle-rank warning covers them
+        warning = next((data["warning"] for data in result["tests"].values() if data.get("warning")), None)
+        if warning:
+            st.warning(f"⚠️ {warning}")
+        
+        baseline = result["tests"].get("serial", {}).get("baseline", {})
+        if baseline.get("cached"):
+            note = f"Serial time reused from a baseline recorded {baseline['age'] / 3600:.1f}h ago"
+            if baseline.get("stale"):
+                action = "a refresh has been queued" if baseline.get("refresh_queued") else "use Force baseline refresh to re-run it"
+                note += f" ({baseline['stale']}; {action})"
+            st.caption(note)
     
     else:
         # Single result
@@ -324,6 +692,57 @@ if 'last_result' in st.session_state:
                 st.metric("Mode", result['mode'].replace('_', ' ').title())
             with col3:
                 st.metric("Matrix Size", f"{result['matrix_size']}×{result['matrix_size']}")
+            
+            placement = result.get("placement")
+            if placement:
+                slots = ", ".join(f"{node}×{count}" for node, count in placement["slots"].items())
+                st.caption(f"Placement: {placement['policy']} · bind {placement['binding']} · {slots}")
+            
+            if result.get("kernel"):
+                build_flags = (result.get("build") or {}).get("flags", "")
+                threads = result.get("threads_per_rank", 1)
+                thread_note = f" · {threads} OpenMP thread(s)/rank" if threads > 1 or result["mode"] == "hybrid" else ""
+                st.caption(
+                    f"Kernel: {result['kernel']} · profile {result.get('profile')}{thread_note} · flags `{build_flags}`"
+                )
+            
+            if result.get("warning"):
+                st.warning(f"⚠️ {result['warning']}")
+            
+            padding = result.get("padding")
+            if padding and (padding["padded_n"] != result["matrix_size"] or padding["idle_processes"]):
+                st.caption(
+                    f"Padding: N {result['matrix_size']} → {padding['padded_n']} · "
+                    f"+{padding['flop_overhead']:.1%} FLOPs · +{padding['memory_overhead']:.1%} memory · "
+                    f"{padding['active_processes']} active / {padding['idle_processes']} idle rank(s)"
+                )
+            
+            verification = result.get("verification")
+            if verification:
+                method = verification.get("method", "full")
+                if verification["verified"]:
+                    label = {
+                        "checksum": "checksum",
+                        "freivalds": f"Freivalds, {verification.get('probes')} probe(s)"
+                    }.get(method, "full product")
+                    st.success(f"✅ Result verified ({label}, max error {verification['max_error']:.2e})")
+                else:
+                    reference = {
+                        "checksum": "checksum", "freivalds": "Freivalds probes"
+                    }.get(method, "serial product")
+                    st.error(
+                        f"❌ Result does not match the {reference} (max error "
+                        f"{verification['max_error']:.2e} > {verification['tolerance']:.2e})"
+                    )
+            
+            stats = result.get("stats", {})
+            if stats.get("n", 1) > 1:
+                st.caption(
+                    f"Median of {stats['n']} runs · mean {stats['mean']:.3f}s · "
+                    f"σ {stats['stddev']:.4f}s · min {stats['min']:.3f}s · "
+                    f"95% CI [{stats['ci_low']:.3f}, {stats['ci_high']:.3f}]s · "
+                    f"{len(stats['outliers'])} outlier(s)"
+                )
     
     # Show raw output
     if show_output and 'raw_output' in result:
@@ -333,9 +752,14 @@ if 'last_result' in st.session_state:
     # Save button
     if save_results:
         if st.button("Save Results", use_container_width=True):
-            filepath = bench_runner.save_results(result)
-            st.success(f"Results saved to: {filepath}")
+            name = bench_runner.save_results(result)
+            st.success(f"Results saved as: {name}")
     
     # Navigate to results page
     if st.button("View Detailed Analysis", use_container_width=True):
         st.switch_page("pages/3_📈_Results.py")
+
+# Poll the running job until it finishes
+if poll_job:
+    time.sleep(1)
+    st.rerun()
@@ -6,6 +6,8 @@ import streamlit as st
 import sys
 from pathlib import Path
 import pandas as pd
+import plotly.express as px
+import time
 
 # Add utils to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,10 +15,17 @@ sys.path.append(str(Path(__file__).parent.parent))
 from utils import (
     BenchmarkRunner, 
     DockerManager,
+    get_job_manager,
     parse_benchmark_results,
     create_speedup_chart,
     create_execution_time_chart,
     create_efficiency_chart,
+    create_phase_chart,
+    create_rank_chart,
+    create_resource_chart,
+    summarize_resources,
+    create_comm_matrix_chart,
+    summarize_pmpi,
     calculate_metrics_summary
 )
 
@@ -59,21 +68,96 @@ if 'benchmark_runner' not in st.session_state:
     st.session_state.benchmark_runner = BenchmarkRunner(st.session_state.docker_manager)
 
 bench_runner = st.session_state.benchmark_runner
+job_manager = get_job_manager(st.session_state.docker_manager)
 
 st.markdown("---")
 
+# Background jobs
+recent_jobs = job_manager.list_jobs()
+active_jobs = [j for j in recent_jobs if j["status"] in ("queued", "waiting_for_cluster", "running")]
+
+for job in active_jobs:
+    st.progress(
+        min(1.0, job["progress"]),
+        text=f"Job {job['job_id']} ({job['kind'].replace('_', ' ')}): {job['message']}"
+    )
+
+finished_jobs = [
+    j for j in recent_jobs
+    if j["status"] == "completed" and j["kind"] != "sweep" and j.get("result")
+]
+if finished_jobs:
+    with st.expander(f"Finished Jobs ({len(finished_jobs)})"):
+        job_labels = {
+            f"{j['job_id']} · {j['kind'].replace('_', ' ')} · "
+            f"N={j['params'].get('matrix_size')} · "
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(j['finished_at']))}": j
+            for j in finished_jobs
+        }
+        selected_job = st.selectbox("Select a finished job:", list(job_labels))
+        if st.button("Load Job Result"):
+            st.session_state.last_result = job_labels[selected_job]["result"]
+            st.rerun()
+
 # Check for recent results
 if 'last_result' in st.session_state:
     st.success("Displaying results from latest benchmark run")
     current_result = st.session_state.last_result
     has_data = True
 else:
-    # Try to load saved results
-    saved_results = bench_runner.list_results()
+    # Query the results store
+    store = bench_runner.results_store
+    
+    if store.distinct("name"):
+        with st.expander("Filter Saved Results", expanded=True):
+            filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+            with filter_col1:
+                filter_modes = st.multiselect("Mode:", store.distinct("mode"))
+            with filter_col2:
+                filter_sizes = st.multiselect("Matrix Size:", store.distinct("matrix_size"))
+            with filter_col3:
+                filter_procs = st.multiselect("Processes:", store.distinct("num_processes"))
+            with filter_col4:
+                filter_days = st.number_input("Last N days (0 = all):", min_value=0, value=0)
+            only_success = st.checkbox("Successful runs only", value=True)
+            only_verified = st.checkbox("Verified runs only", value=False)
+        
+        matches = pd.DataFrame(store.query(
+            modes=filter_modes,
+            matrix_sizes=filter_sizes,
+            num_processes=filter_procs,
+            since=time.time() - filter_days * 86400 if filter_days else None,
+            success=True if only_success else None,
+            verified=True if only_verified else None,
+            limit=1000
+        ))
+    else:
+        matches = pd.DataFrame()
     
-    if saved_results:
-        st.info(f"Found {len(saved_results)} saved result file(s)")
-        selected_file = st.selectbox("Select a result file to load:", saved_results)
+    if not matches.empty:
+        st.info(f"Found {len(matches)} matching saved result(s)")
+        matches["time"] = pd.to_datetime(matches["timestamp"], unit="s")
+        matches["verified"] = matches["verified"].map({1: "✅", 0: "❌"}).fillna("-")
+        st.dataframe(
+            matches[["name", "time", "mode", "matrix_size", "num_processes", "execution_time",
+                     "verified", "executor"]],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        timed = matches.dropna(subset=["execution_time"])
+        if not timed.empty:
+            st.plotly_chart(
+                px.scatter(
+                    timed, x="matrix_size", y="execution_time", color="mode",
+                    hover_data=["name", "num_processes"],
+                    labels={"matrix_size": "Matrix Size (N)", "execution_time": "Execution Time (s)"},
+                    template="plotly_white"
+                ),
+                use_container_width=True
+            )
+        
+        selected_file = st.selectbox("Select a result to load:", matches["name"].tolist())
         
         if st.button("Load Selected Results"):
             current_result = bench_runner.load_results(selected_file)
@@ -89,6 +173,9 @@ else:
         has_data = False
 
 if not has_data or 'last_result' not in st.session_state:
+    if active_jobs:
+        time.sleep(2)
+        st.rerun()
     st.stop()
 
 # Parse results
@@ -155,11 +242,27 @@ if "tests" in result:
     rows = []
     for mode, data in result["tests"].items():
         if data.get("success"):
+            stats = data.get("stats", {})
+            speedup_ci = data.get("speedup_ci")
             rows.append({
                 "Execution Mode": mode.replace('_', ' ').title(),
                 "Time (seconds)": f"{data['execution_time']:.4f}",
+                "Time 95% CI": f"{stats['ci_low']:.4f} – {stats['ci_high']:.4f}" if stats else "-",
+                "Runs": stats.get("n", 1),
+                "Outliers": len(stats.get("outliers", [])),
                 "Speedup": f"{data.get('speedup', 1.0):.2f}x",
-                "Processes": data.get('num_processes', 1)
+                "Speedup 95% CI": f"{speedup_ci[0]:.2f} – {speedup_ci[1]:.2f}" if speedup_ci else "-",
+                "GFLOPS": f"{data.get('gflops', 0.0):.2f}",
+                "Peak RSS/rank (MB)": f"{data.get('memory_mb', 0.0):.1f}",
+                "Checksum": f"{data['checksum']:.6g}" if data.get("checksum") is not None else "-",
+                "Comm (MB)": f"{data['comm_bytes'] / 1e6:.1f}" if data.get("comm_bytes") is not None else "-",
+                "Processes": data.get('num_processes', 1),
+                "Threads/Rank": data.get("threads_per_rank", 1),
+                "Padded N": data["padding"]["padded_n"] if data.get("padding") else "-",
+                "Idle Ranks": data["padding"]["idle_processes"] if data.get("padding") else "-",
+                "Placement": data["placement"]["policy"] if data.get("placement") else "-",
+                "Kernel": data.get("kernel", "naive"),
+                "Compiler Profile": data.get("profile", "O0")
             })
     
     df = pd.DataFrame(rows)
@@ -202,6 +305,69 @@ if "tests" in result:
         fig_eff = create_efficiency_chart(viz_data)
         st.plotly_chart(fig_eff, use_container_width=True)
     
+    # Phase breakdown (only for binaries printing the JSON metrics line)
+    if any(c.startswith('phase_') for c in viz_data.columns):
+        st.subheader("Phase Breakdown")
+        st.plotly_chart(create_phase_chart(viz_data), use_container_width=True)
+    
+    # Per-rank compute/comm/barrier split and load imbalance
+    ranked = [mode for mode, data in result["tests"].items() if data.get("imbalance")]
+    if ranked:
+        st.subheader("Per-Rank Breakdown")
+        rank_mode = st.selectbox(
+            "Run:", ranked, key="rank_mode", format_func=lambda mode: mode.replace('_', ' ').title()
+        )
+        imbalance = result["tests"][rank_mode]["imbalance"]
+        imb_col1, imb_col2, imb_col3, imb_col4 = st.columns(4)
+        with imb_col1:
+            st.metric("Compute Imbalance", f"{imbalance['compute_imbalance']:.2f}",
+                      help="max / mean compute time over the active ranks (1.00 = perfectly balanced)")
+        with imb_col2:
+            st.metric("Busy Imbalance", f"{imbalance['busy_imbalance']:.2f}",
+                      help="max / mean of compute + communication time")
+        with imb_col3:
+            st.metric("Critical-Path Rank", imbalance["critical_path_rank"],
+                      help="Rank with the most busy time; every other rank waits for it")
+        with imb_col4:
+            st.metric("Mean Barrier Wait", f"{imbalance['mean_barrier_time']:.4f}s")
+        st.plotly_chart(create_rank_chart(imbalance), use_container_width=True)
+        st.caption(f"Slowest rank per stage: {imbalance['stage_stragglers']}")
+    
+    # Node CPU/memory/network samples recorded during the last measured run
+    sampled = [mode for mode, data in result["tests"].items() if data.get("resources")]
+    if sampled:
+        st.subheader("Resource Usage")
+        resource_mode = st.selectbox(
+            "Run:", sampled, key="resource_mode", format_func=lambda mode: mode.replace('_', ' ').title()
+        )
+        resources = result["tests"][resource_mode]["resources"]
+        st.dataframe(summarize_resources(resources), use_container_width=True, hide_index=True)
+        st.plotly_chart(create_resource_chart(resources), use_container_width=True)
+        st.caption(
+            "A node with low CPU while others are busy sat idle; CPU well below 100% per rank "
+            "alongside high RX/TX on every node points to a network-bound run."
+        )
+    
+    # Rank×rank communication counted by the PMPI shim
+    profiled = [mode for mode, data in result["tests"].items() if data.get("pmpi")]
+    if profiled:
+        st.subheader("Communication Matrix")
+        pmpi_col1, pmpi_col2 = st.columns(2)
+        with pmpi_col1:
+            pmpi_mode = st.selectbox(
+                "Run:", profiled, key="pmpi_mode", format_func=lambda mode: mode.replace('_', ' ').title()
+            )
+        with pmpi_col2:
+            pmpi_metric = st.selectbox("Metric:", ["bytes", "messages", "time"], key="pmpi_metric",
+                                       format_func=str.title)
+        pmpi = result["tests"][pmpi_mode]["pmpi"]
+        st.plotly_chart(create_comm_matrix_chart(pmpi, pmpi_metric), use_container_width=True)
+        st.dataframe(summarize_pmpi(pmpi), use_container_width=True, hide_index=True)
+        st.caption(
+            "Row = sending rank, column = peer. Bcast/Ibcast/Scatter count one logical message from the root "
+            "to every member; time includes waiting for the peer."
+        )
+    
     st.markdown("---")
     
     # Analysis insights
@@ -287,6 +453,29 @@ else:
         with col4:
             st.metric("Processes", result.get('num_processes', 1))
         
+        if result.get("imbalance"):
+            imbalance = result["imbalance"]
+            st.subheader("Per-Rank Breakdown")
+            st.caption(
+                f"Compute imbalance {imbalance['compute_imbalance']:.2f} · "
+                f"busy imbalance {imbalance['busy_imbalance']:.2f} (max / mean) · "
+                f"critical-path rank {imbalance['critical_path_rank']} · "
+                f"mean barrier wait {imbalance['mean_barrier_time']:.4f}s"
+            )
+            st.plotly_chart(create_rank_chart(imbalance), use_container_width=True)
+        
+        if result.get("resources"):
+            st.subheader("Resource Usage")
+            st.dataframe(summarize_resources(result["resources"]), use_container_width=True, hide_index=True)
+            st.plotly_chart(create_resource_chart(result["resources"]), use_container_width=True)
+        
+        if result.get("pmpi"):
+            st.subheader("Communication Matrix")
+            pmpi_metric = st.selectbox("Metric:", ["bytes", "messages", "time"], key="pmpi_metric",
+                                       format_func=str.title)
+            st.plotly_chart(create_comm_matrix_chart(result["pmpi"], pmpi_metric), use_container_width=True)
+            st.dataframe(summarize_pmpi(result["pmpi"]), use_container_width=True, hide_index=True)
+        
         st.info("Run a comparison benchmark to analyze performance differences between execution modes.")
         
         if st.button("Run Comparison Benchmark", type="primary"):
@@ -308,3 +497,8 @@ with col2:
 with col3:
     if st.button("View Documentation", use_container_width=True):
         st.switch_page("pages/6_📚_Documentation.py")
+
+# Keep polling while background jobs are running
+if active_jobs:
+    time.sleep(2)
+    st.rerun()
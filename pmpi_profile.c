@@ -0,0 +1,310 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <mpi.h>
+
+// Shim profiling PMPI: dikompilasi bersama program MPI apa pun
+// (mpicc -o prog prog.c pmpi_profile.c) tanpa mengubah sumbernya.
+// Setiap fungsi MPI di bawah ini membungkus versi PMPI_-nya dan mencatat
+// jumlah panggilan, byte dan waktu per fungsi, serta pesan, byte yang
+// dikirim dan waktu per pasangan (rank, peer) dalam rank MPI_COMM_WORLD.
+// Byte kolektif dihitung secara logis: root Bcast/Ibcast/Scatter dianggap
+// mengirim blok ke setiap anggota communicator. Saat MPI_Finalize semua tabel
+// dikumpulkan di rank 0 dan dicetak sebagai satu baris JSON {"pmpi": ...}.
+// MPI_Sendrecv_replace, MPI_Waitall dan MPI_Ibcast ikut dibungkus karena Fox
+// dan Cannon memakainya untuk geseran dan broadcast blok.
+// Belum dihitung: MPI_Reduce, MPI_Allreduce, MPI_Gather, MPI_Allgather dan
+// kolektif lain (reduksi waktu/checksum, gather hasil dan probe Freivalds).
+
+enum { F_SEND, F_RECV, F_ISEND, F_IRECV, F_WAIT, F_WAITALL, F_SENDRECV_REPLACE,
+       F_BARRIER, F_SCATTER, F_BCAST, F_IBCAST, NUM_FUNCS };
+
+static const char *FUNC_NAMES[NUM_FUNCS] = {
+    "MPI_Send", "MPI_Recv", "MPI_Isend", "MPI_Irecv", "MPI_Wait", "MPI_Waitall",
+    "MPI_Sendrecv_replace", "MPI_Barrier", "MPI_Scatter", "MPI_Bcast", "MPI_Ibcast"
+};
+
+enum { STAT_CALLS, STAT_BYTES, STAT_TIME, NUM_STATS };
+
+#define MAX_PENDING 256  // Request non-blocking yang peer-nya dilacak
+
+static int world_size = 0;
+static double func_stats[NUM_FUNCS][NUM_STATS];
+static double *peer_stats = NULL;  // [peer * NUM_STATS + stat]: pesan, byte terkirim, waktu
+
+// Request Isend/Irecv/Ibcast yang belum selesai, untuk mengaitkan waktu tunggu
+// ke peer; root Ibcast menyimpan communicator-nya (peer -1) agar waktunya
+// dibagi rata ke semua anggota lain
+static MPI_Request pending_req[MAX_PENDING];
+static int pending_peer[MAX_PENDING];
+static MPI_Comm pending_comm[MAX_PENDING];
+static int num_pending = 0;
+
+// Alokasi tabel saat panggilan pertama (setelah MPI_Init)
+static void ensure_tables(void){
+    if (peer_stats) return;
+    PMPI_Comm_size(MPI_COMM_WORLD, &world_size);
+    peer_stats = (double *)calloc((size_t)world_size * NUM_STATS, sizeof(double));
+}
+
+// Rank di MPI_COMM_WORLD untuk rank di comm; -1 untuk MPI_PROC_NULL dan sejenisnya
+static int world_rank(MPI_Comm comm, int rank){
+    if (rank < 0) return -1;
+    if (comm == MPI_COMM_WORLD) return rank;
+    MPI_Group group, world;
+    int out;
+    PMPI_Comm_group(comm, &group);
+    PMPI_Comm_group(MPI_COMM_WORLD, &world);
+    PMPI_Group_translate_ranks(group, 1, &rank, world, &out);
+    PMPI_Group_free(&group);
+    PMPI_Group_free(&world);
+    return out == MPI_UNDEFINED ? -1 : out;
+}
+
+static long long type_bytes(int count, MPI_Datatype type){
+    int size;
+    PMPI_Type_size(type, &size);
+    return (long long)count * size;
+}
+
+static void record_func(int func, long long bytes, double dt){
+    ensure_tables();
+    func_stats[func][STAT_CALLS] += 1;
+    func_stats[func][STAT_BYTES] += bytes;
+    func_stats[func][STAT_TIME] += dt;
+}
+
+// Pesan dan byte yang dikirim ke peer (sent = 0 hanya menambah waktu)
+static void record_peer(int peer, int sent, long long bytes, double dt){
+    ensure_tables();
+    if (peer < 0 || peer >= world_size) return;
+    peer_stats[peer * NUM_STATS + STAT_CALLS] += sent;
+    peer_stats[peer * NUM_STATS + STAT_BYTES] += bytes;
+    peer_stats[peer * NUM_STATS + STAT_TIME] += dt;
+}
+
+static void track_request(MPI_Request req, int peer, MPI_Comm fanout){
+    if (num_pending < MAX_PENDING) {
+        pending_req[num_pending] = req;
+        pending_peer[num_pending] = peer;
+        pending_comm[num_pending++] = fanout;
+    }
+}
+
+// Catat waktu tunggu dt ke peer request yang selesai dan hapus dari daftar
+static void finish_request(MPI_Request req, double dt){
+    for (int i = 0; i < num_pending; i++) {
+        if (pending_req[i] != req) continue;
+        int peer = pending_peer[i];
+        MPI_Comm fanout = pending_comm[i];
+        pending_req[i] = pending_req[--num_pending];
+        pending_peer[i] = pending_peer[num_pending];
+        pending_comm[i] = pending_comm[num_pending];
+        if (fanout == MPI_COMM_NULL) {
+            record_peer(peer, 0, 0, dt);
+            return;
+        }
+        int rank, size;
+        PMPI_Comm_rank(fanout, &rank);
+        PMPI_Comm_size(fanout, &size);
+        for (int r = 0; r < size; r++) {
+            if (r != rank) record_peer(world_rank(fanout, r), 0, 0, dt / (size - 1));
+        }
+        return;
+    }
+}
+
+// Byte logis dari root ke setiap anggota comm lain pada kolektif satu-ke-semua
+static void record_root_fanout(MPI_Comm comm, int root, long long bytes){
+    int rank, size;
+    PMPI_Comm_rank(comm, &rank);
+    PMPI_Comm_size(comm, &size);
+    if (rank != root) return;
+    for (int r = 0; r < size; r++) {
+        if (r != root) record_peer(world_rank(comm, r), 1, bytes, 0.0);
+    }
+}
+
+int MPI_Send(const void *buf, int count, MPI_Datatype datatype, int dest, int tag, MPI_Comm comm){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Send(buf, count, datatype, dest, tag, comm);
+    double dt = PMPI_Wtime() - t0;
+    long long bytes = type_bytes(count, datatype);
+    record_func(F_SEND, bytes, dt);
+    record_peer(world_rank(comm, dest), 1, bytes, dt);
+    return err;
+}
+
+int MPI_Recv(void *buf, int count, MPI_Datatype datatype, int source, int tag,
+             MPI_Comm comm, MPI_Status *status){
+    MPI_Status local;
+    if (status == MPI_STATUS_IGNORE) status = &local;
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Recv(buf, count, datatype, source, tag, comm, status);
+    double dt = PMPI_Wtime() - t0;
+    int received = 0;
+    PMPI_Get_count(status, datatype, &received);
+    record_func(F_RECV, type_bytes(received, datatype), dt);
+    record_peer(world_rank(comm, status->MPI_SOURCE), 0, 0, dt);
+    return err;
+}
+
+int MPI_Isend(const void *buf, int count, MPI_Datatype datatype, int dest, int tag,
+              MPI_Comm comm, MPI_Request *request){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Isend(buf, count, datatype, dest, tag, comm, request);
+    double dt = PMPI_Wtime() - t0;
+    long long bytes = type_bytes(count, datatype);
+    int peer = world_rank(comm, dest);
+    record_func(F_ISEND, bytes, dt);
+    record_peer(peer, 1, bytes, dt);
+    track_request(*request, peer, MPI_COMM_NULL);
+    return err;
+}
+
+int MPI_Irecv(void *buf, int count, MPI_Datatype datatype, int source, int tag,
+              MPI_Comm comm, MPI_Request *request){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Irecv(buf, count, datatype, source, tag, comm, request);
+    double dt = PMPI_Wtime() - t0;
+    int peer = world_rank(comm, source);
+    record_func(F_IRECV, type_bytes(count, datatype), dt);
+    record_peer(peer, 0, 0, dt);
+    track_request(*request, peer, MPI_COMM_NULL);
+    return err;
+}
+
+int MPI_Wait(MPI_Request *request, MPI_Status *status){
+    MPI_Request req = *request;
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Wait(request, status);
+    double dt = PMPI_Wtime() - t0;
+    record_func(F_WAIT, 0, dt);
+    finish_request(req, dt);
+    return err;
+}
+
+int MPI_Waitall(int count, MPI_Request requests[], MPI_Status statuses[]){
+    MPI_Request *reqs = (MPI_Request *)malloc(count * sizeof(MPI_Request));
+    for (int i = 0; i < count; i++) reqs[i] = requests[i];
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Waitall(count, requests, statuses);
+    double dt = PMPI_Wtime() - t0;
+    record_func(F_WAITALL, 0, dt);
+    // Waktu tunggu dibagi rata ke peer request yang dilacak
+    for (int i = 0; i < count; i++) finish_request(reqs[i], dt / count);
+    free(reqs);
+    return err;
+}
+
+int MPI_Sendrecv_replace(void *buf, int count, MPI_Datatype datatype, int dest, int sendtag,
+                         int source, int recvtag, MPI_Comm comm, MPI_Status *status){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Sendrecv_replace(buf, count, datatype, dest, sendtag, source, recvtag, comm, status);
+    double dt = PMPI_Wtime() - t0;
+    long long bytes = type_bytes(count, datatype);
+    record_func(F_SENDRECV_REPLACE, bytes, dt);
+    record_peer(world_rank(comm, dest), 1, bytes, dt);
+    return err;
+}
+
+int MPI_Barrier(MPI_Comm comm){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Barrier(comm);
+    record_func(F_BARRIER, 0, PMPI_Wtime() - t0);
+    return err;
+}
+
+int MPI_Scatter(const void *sendbuf, int sendcount, MPI_Datatype sendtype, void *recvbuf,
+                int recvcount, MPI_Datatype recvtype, int root, MPI_Comm comm){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Scatter(sendbuf, sendcount, sendtype, recvbuf, recvcount, recvtype, root, comm);
+    record_func(F_SCATTER, type_bytes(recvcount, recvtype), PMPI_Wtime() - t0);
+    record_root_fanout(comm, root, type_bytes(sendcount, sendtype));
+    return err;
+}
+
+int MPI_Bcast(void *buffer, int count, MPI_Datatype datatype, int root, MPI_Comm comm){
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Bcast(buffer, count, datatype, root, comm);
+    long long bytes = type_bytes(count, datatype);
+    record_func(F_BCAST, bytes, PMPI_Wtime() - t0);
+    record_root_fanout(comm, root, bytes);
+    return err;
+}
+
+int MPI_Ibcast(void *buffer, int count, MPI_Datatype datatype, int root, MPI_Comm comm,
+               MPI_Request *request){
+    int rank;
+    double t0 = PMPI_Wtime();
+    int err = PMPI_Ibcast(buffer, count, datatype, root, comm, request);
+    long long bytes = type_bytes(count, datatype);
+    record_func(F_IBCAST, bytes, PMPI_Wtime() - t0);
+    record_root_fanout(comm, root, bytes);
+    PMPI_Comm_rank(comm, &rank);
+    if (rank == root) track_request(*request, -1, comm);
+    else track_request(*request, world_rank(comm, root), MPI_COMM_NULL);
+    return err;
+}
+
+// Cetak list JSON per rank dari all[rank * stride + offset]
+static void print_per_rank(const double *all, int stride, int offset, int integer){
+    printf("[");
+    for (int r = 0; r < world_size; r++) {
+        if (integer) printf(r ? ", %.0f" : "%.0f", all[(size_t)r * stride + offset]);
+        else printf(r ? ", %.6f" : "%.6f", all[(size_t)r * stride + offset]);
+    }
+    printf("]");
+}
+
+int MPI_Finalize(void){
+    int my_rank;
+    ensure_tables();
+    PMPI_Comm_rank(MPI_COMM_WORLD, &my_rank);
+
+    // Satu buffer per rank: statistik fungsi lalu statistik peer
+    int stride = NUM_FUNCS * NUM_STATS + world_size * NUM_STATS;
+    double *mine = (double *)malloc(stride * sizeof(double));
+    double *all = NULL;
+    for (int f = 0; f < NUM_FUNCS; f++) {
+        for (int s = 0; s < NUM_STATS; s++) mine[f * NUM_STATS + s] = func_stats[f][s];
+    }
+    for (int i = 0; i < world_size * NUM_STATS; i++) mine[NUM_FUNCS * NUM_STATS + i] = peer_stats[i];
+    if (my_rank == 0) all = (double *)malloc((size_t)world_size * stride * sizeof(double));
+    PMPI_Gather(mine, stride, MPI_DOUBLE, all, stride, MPI_DOUBLE, 0, MPI_COMM_WORLD);
+
+    if (my_rank == 0) {
+        static const char *STAT_NAMES[NUM_STATS] = {"calls", "bytes", "time"};
+        static const char *PEER_NAMES[NUM_STATS] = {"messages", "bytes", "time"};
+        printf("{\"pmpi\": {\"ranks\": %d, \"functions\": {", world_size);
+        for (int f = 0; f < NUM_FUNCS; f++) {
+            printf(f ? ", \"%s\": {" : "\"%s\": {", FUNC_NAMES[f]);
+            for (int s = 0; s < NUM_STATS; s++) {
+                printf(s ? ", \"%s\": " : "\"%s\": ", STAT_NAMES[s]);
+                print_per_rank(all, stride, f * NUM_STATS + s, s != STAT_TIME);
+            }
+            printf("}");
+        }
+        printf("}");
+        // Matrix rank x peer untuk pesan, byte terkirim dan waktu
+        for (int s = 0; s < NUM_STATS; s++) {
+            printf(", \"%s\": [", PEER_NAMES[s]);
+            for (int r = 0; r < world_size; r++) {
+                printf(r ? ", [" : "[");
+                for (int p = 0; p < world_size; p++) {
+                    double v = all[(size_t)r * stride + NUM_FUNCS * NUM_STATS + p * NUM_STATS + s];
+                    if (s == STAT_TIME) printf(p ? ", %.6f" : "%.6f", v);
+                    else printf(p ? ", %.0f" : "%.0f", v);
+                }
+                printf("]");
+            }
+            printf("]");
+        }
+        printf("}}\n");
+        fflush(stdout);
+        free(all);
+    }
+    free(mine);
+    free(peer_stats);
+    peer_stats = NULL;
+    return PMPI_Finalize();
+}
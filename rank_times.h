@@ -0,0 +1,60 @@
+#ifndef RANK_TIMES_H
+#define RANK_TIMES_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <mpi.h>
+
+// Waktu per stage setiap rank: komputasi, tunggu komunikasi (send/recv/
+// broadcast/shift) dan barrier. Disimpan di stage_time[stage * STAGE_KINDS +
+// jenis], dikumpulkan di master dengan MPI_Gather dan dicetak sebagai field
+// "rank_times" di baris JSON, supaya rank yang lambat (straggler) terlihat.
+enum { STAGE_COMPUTE, STAGE_COMM, STAGE_BARRIER, STAGE_KINDS };
+
+static const char *STAGE_KIND_NAMES[STAGE_KINDS] = {"compute", "comm", "barrier"};
+
+// Catat durasi sejak t0 ke phase_time[phase] dan ke stage_time (stage, kind)
+static inline void add_time(double *phase_time, int phase, double *stage_time, int stage, int kind, double t0){
+    double dt = MPI_Wtime() - t0;
+    phase_time[phase] += dt;
+    stage_time[stage * STAGE_KINDS + kind] += dt;
+}
+
+// Barrier penutup setelah stage terakhir: waktu tunggu rank ini sampai rank
+// paling lambat selesai, dicatat sebagai barrier di stage terakhir
+static inline void closing_barrier(double *stage_time, int stages, MPI_Comm comm){
+    double t0 = MPI_Wtime();
+    MPI_Barrier(comm);
+    stage_time[(stages - 1) * STAGE_KINDS + STAGE_BARRIER] += MPI_Wtime() - t0;
+}
+
+// Kumpulkan stage_time semua rank di master (comm_sz * stages * STAGE_KINDS
+// nilai, NULL di rank lain). Dipanggil oleh semua rank.
+static inline double *gather_stage_times(const double *stage_time, int stages, int master, MPI_Comm comm){
+    int my_rank, comm_sz;
+    double *all = NULL;
+    MPI_Comm_rank(comm, &my_rank);
+    MPI_Comm_size(comm, &comm_sz);
+    if (my_rank == master) all = (double *)malloc((size_t)comm_sz * stages * STAGE_KINDS * sizeof(double));
+    MPI_Gather(stage_time, stages * STAGE_KINDS, MPI_DOUBLE, all, stages * STAGE_KINDS, MPI_DOUBLE, master, comm);
+    return all;
+}
+
+// Cetak "rank_times": {"stages": S, "compute": [[stage...] per rank], "comm": ..., "barrier": ...},
+static inline void print_rank_times(const double *all, int stages, int comm_sz){
+    printf("\"rank_times\": {\"stages\": %d", stages);
+    for (int kind = 0; kind < STAGE_KINDS; kind++) {
+        printf(", \"%s\": [", STAGE_KIND_NAMES[kind]);
+        for (int r = 0; r < comm_sz; r++) {
+            printf(r ? ", [" : "[");
+            for (int s = 0; s < stages; s++) {
+                printf(s ? ", %.6f" : "%.6f", all[((size_t)r * stages + s) * STAGE_KINDS + kind]);
+            }
+            printf("]");
+        }
+        printf("]");
+    }
+    printf("}, ");
+}
+
+#endif
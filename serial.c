@@ -1,40 +1,53 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include "bench_util.h"
+#include "kernels.h"
 
-// Compile: gcc serial.c -o serial_matrix
+// Compile: gcc -O2 serial.c -o serial_matrix
+// Kernel dipilih dengan --kernel naive|ikj|tiled|transposed|blas dan --tile T
+
+#define SEED 42
 
 int main(int argc, char **argv) {
     int n = 1000;
+    int kernel, tile;
     if (argc > 1) n = atoi(argv[1]);
+    if (!parse_kernel_args(argc, argv, &kernel, &tile)) {
+        fprintf(stderr, "Error: Kernel atau ukuran tile tidak dikenal\n");
+        return 1;
+    }
 
     float *a = (float *)malloc(n * n * sizeof(float));
     float *b = (float *)malloc(n * n * sizeof(float));
     float *res = (float *)malloc(n * n * sizeof(float));
 
-    // Init dummy data
-    for (int i = 0; i < n * n; i++) {
-        a[i] = 1.0; b[i] = 1.0; res[i] = 0.0;
-    }
+    // Data acak yang sama dengan program paralel (seed 42), sehingga checksum
+    // bisa dibandingkan; matrix berisi angka 1 tidak mendeteksi salah indeks
+    random_matrices(a, b, n, SEED);
+    for (int i = 0; i < n * n; i++) res[i] = 0.0;
 
     clock_t start = clock();
 
     // Matrix Multiplication O(N^3)
-    for (int i = 0; i < n; i++) {
-        for (int j = 0; j < n; j++) {
-            float sum = 0.0;
-            for (int k = 0; k < n; k++) {
-                sum += a[i * n + k] * b[k * n + j];
-            }
-            res[i * n + j] = sum;
-        }
-    }
+    multiply_block(kernel, tile, a, b, res, n);
 
     clock_t end = clock();
     double time_spent = (double)(end - start) / CLOCKS_PER_SEC;
 
     printf("Total Time Elapsed is %.6f seconds\n", time_spent);
 
+    // Satu baris JSON untuk dibaca BenchmarkRunner
+    double checksum = 0.0;
+    for (int i = 0; i < n * n; i++) checksum += res[i];
+
+    double gflops = time_spent > 0 ? 2.0 * n * n * (double)n / time_spent / 1e9 : 0.0;
+    printf("{\"schema_version\": %d, \"program\": \"serial\", \"n\": %d, \"processes\": 1, "
+           "\"time\": %.6f, \"phases\": {\"compute\": %.6f}, \"gflops\": %.6f, "
+           "\"checksum\": %.6e, \"kernel\": \"%s\", \"tile\": %d, \"peak_rss_kb\": [%ld]}\n",
+           SCHEMA_VERSION, n, time_spent, time_spent, gflops, checksum,
+           KERNEL_NAMES[kernel], tile, peak_rss_kb());
+
     free(a); free(b); free(res);
     return 0;
 }
\ No newline at end of file
@@ -0,0 +1,271 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <mpi.h>
+#include <math.h>
+#include "bench_util.h"
+#include "kernels.h"
+#include "freivalds.h"
+#include "rank_times.h"
+
+// SUMMA (Scalable Universal Matrix Multiplication Algorithm) pada grid
+// persegi panjang P_r x P_c dengan P_r * P_c = P, sehingga P tidak harus
+// kuadrat sempurna. Setiap rank memegang blok (N/P_r) x (N/P_c) dari A, B
+// dan C. Untuk setiap panel selebar w = gcd(N/P_r, N/P_c), pemilik panel
+// kolom A membroadcast di communicator baris dan pemilik panel baris B
+// membroadcast di communicator kolom, lalu C += panel_A * panel_B.
+// Argumen sama dengan fox.c: N [--verify] [--distributed] [--kernel NAMA] [--tile T].
+// Semua P rank dipakai; N di-padding nol sampai kelipatan lcm(P_r, P_c).
+// --distributed membangkitkan blok di setiap rank dan memverifikasi dengan
+// checksum, seperti di fox.c.
+// --freivalds K menjalankan K probe Freivalds terdistribusi (freivalds.h),
+// O(n^2 / P) per probe, sebagai pengganti --verify.
+
+#define MATRIXSIZE 1000
+#define SEED 42
+
+// Indeks fase untuk pengukuran waktu per fase
+enum { PHASE_SCATTER, PHASE_COMPUTE, PHASE_BROADCAST, PHASE_SHIFT, NUM_PHASES };
+
+static int gcd(int x, int y){
+    while (y) { int t = x % y; x = y; y = t; }
+    return x;
+}
+
+int main(int argc, char **argv) {
+
+    int comm_sz;
+    int my_rank;
+    int n = MATRIXSIZE;
+    int master = 0;
+    int verify = 0;
+    int distributed = 0;
+    int probes = 0;  // Jumlah probe Freivalds (0 = tidak dipakai)
+    int kernel, tile;
+    double start_time, final_time;
+    double phase_time[NUM_PHASES] = {0.0};
+    double t0;
+
+    // Ambil input ukuran matrix, opsi verifikasi dan kernel dari argumen CLI
+    if (argc > 1) n = strtol(argv[1], NULL, 10);
+    for (int i = 2; i < argc; i++) {
+        if (strcmp(argv[i], "--verify") == 0) verify = 1;
+        if (strcmp(argv[i], "--distributed") == 0) distributed = 1;
+        if (strcmp(argv[i], "--freivalds") == 0 && i + 1 < argc) probes = atoi(argv[i + 1]);
+    }
+    int kernel_ok = parse_kernel_args(argc, argv, &kernel, &tile);
+
+    // Hanya thread utama yang memanggil MPI; thread OpenMP dipakai di kernel
+    int provided;
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &provided);
+    MPI_Comm_size(MPI_COMM_WORLD, &comm_sz);
+    MPI_Comm_rank(MPI_COMM_WORLD, &my_rank);
+
+    if (!kernel_ok) {
+        if (my_rank == master) fprintf(stderr, "Error: Kernel atau ukuran tile tidak dikenal\n");
+        MPI_Finalize();
+        return 0;
+    }
+
+    // Grid paling mendekati persegi: P_r = pembagi terbesar P yang <= sqrt(P)
+    int grid_rows = (int)sqrt(comm_sz);
+    while (comm_sz % grid_rows != 0) grid_rows--;
+    int grid_cols = comm_sz / grid_rows;
+
+    int n_pad = padded_size(n, grid_rows / gcd(grid_rows, grid_cols) * grid_cols);
+    int mb = n_pad / grid_rows;   // baris per blok
+    int nb = n_pad / grid_cols;   // kolom per blok
+    int w = gcd(mb, nb);      // lebar panel
+    int my_row = my_rank / grid_cols;
+    int my_col = my_rank % grid_cols;
+
+    // Communicator per baris (panel A) dan per kolom (panel B)
+    MPI_Comm row_comm, col_comm;
+    MPI_Comm_split(MPI_COMM_WORLD, my_row, my_col, &row_comm);
+    MPI_Comm_split(MPI_COMM_WORLD, my_col, my_row, &col_comm);
+
+    float *a = NULL;
+    float *b = NULL;
+    float *flat_a = NULL;
+    float *flat_b = NULL;
+
+    if (my_rank == master) {
+        fprintf(stdout, "Size: %d x %d, Processes: %d, Grid: %d x %d, Padded: %d\n",
+                n, n, comm_sz, grid_rows, grid_cols, n_pad);
+    }
+
+    if (my_rank == master && !distributed) {
+        a = (float *)malloc(n * n * sizeof(float));
+        b = (float *)malloc(n * n * sizeof(float));
+        flat_a = (float *)malloc(n_pad * n_pad * sizeof(float));
+        flat_b = (float *)malloc(n_pad * n_pad * sizeof(float));
+
+        random_matrices(a, b, n, SEED);
+
+        float *pad_a = pad_matrix(a, n, n_pad);
+        float *pad_b = pad_matrix(b, n, n_pad);
+        to_blocks(pad_a, flat_a, n_pad, grid_rows, grid_cols);
+        to_blocks(pad_b, flat_b, n_pad, grid_rows, grid_cols);
+        free(pad_a); free(pad_b);
+    }
+
+    float *my_a = (float *)malloc(mb * nb * sizeof(float));
+    float *my_b = (float *)malloc(mb * nb * sizeof(float));
+    float *panel_a = (float *)malloc(mb * w * sizeof(float));
+    float *panel_b = (float *)malloc(w * nb * sizeof(float));
+    float *result = (float *)calloc(mb * nb, sizeof(float));
+    double *sums = NULL;  // Suku checksum berbobot posisi untuk verifikasi (checksum_sums)
+    double *probe_z = NULL;  // A * (B * x) untuk setiap probe Freivalds
+
+    // Distribusi blok: dibangkitkan di tempat atau di-scatter dari master
+    t0 = MPI_Wtime();
+    if (distributed) {
+        generate_block(my_a, SEED, 0, n, my_row*mb, my_col*nb, mb, nb);
+        generate_block(my_b, SEED, 1, n, my_row*mb, my_col*nb, mb, nb);
+    } else {
+        MPI_Scatter(flat_a, mb*nb, MPI_FLOAT, my_a, mb*nb, MPI_FLOAT, master, MPI_COMM_WORLD);
+        MPI_Scatter(flat_b, mb*nb, MPI_FLOAT, my_b, mb*nb, MPI_FLOAT, master, MPI_COMM_WORLD);
+    }
+    phase_time[PHASE_SCATTER] = MPI_Wtime() - t0;
+
+    if (verify && distributed) {
+        sums = (double *)calloc(checksum_len(n_pad), sizeof(double));
+        checksum_sums(my_a, my_b, mb, nb, my_row*mb, my_col*nb, n_pad, SEED, sums);
+    }
+
+    // Probe Freivalds dihitung dari blok A dan B awal, di luar waktu terukur
+    if (probes > 0) {
+        probe_z = freivalds_prepare(my_a, my_b, mb, nb, my_col*nb, n, n_pad,
+                                    probes, SEED, row_comm, col_comm);
+    }
+
+    MPI_Barrier(MPI_COMM_WORLD);
+    start_time = MPI_Wtime();
+
+    long long recv_bytes = 0;  // Byte yang diterima rank ini selama perkalian
+    int stages = n_pad / w;    // Satu stage per panel
+    double *stage_time = (double *)calloc(stages * STAGE_KINDS, sizeof(double));
+
+    for (int k0 = 0; k0 < n_pad; k0 += w) {
+        int stage = k0 / w;
+        // Panel kolom A[:, k0:k0+w] ada di kolom grid k0 / nb,
+        // panel baris B[k0:k0+w, :] ada di baris grid k0 / mb
+        int a_root = k0 / nb, a_off = k0 % nb;
+        int b_root = k0 / mb, b_off = k0 % mb;
+
+        t0 = MPI_Wtime();
+        if (my_col == a_root) {
+            for (int r = 0; r < mb; r++) memcpy(&panel_a[r*w], &my_a[r*nb + a_off], w * sizeof(float));
+        } else {
+            recv_bytes += (long long)mb * w * sizeof(float);
+        }
+        MPI_Bcast(panel_a, mb*w, MPI_FLOAT, a_root, row_comm);
+
+        if (my_row == b_root) {
+            memcpy(panel_b, &my_b[b_off*nb], w * nb * sizeof(float));
+        } else {
+            recv_bytes += (long long)w * nb * sizeof(float);
+        }
+        MPI_Bcast(panel_b, w*nb, MPI_FLOAT, b_root, col_comm);
+        add_time(phase_time, PHASE_BROADCAST, stage_time, stage, STAGE_COMM, t0);
+
+        t0 = MPI_Wtime();
+        multiply_rect(kernel, tile, panel_a, panel_b, result, mb, w, nb);
+        add_time(phase_time, PHASE_COMPUTE, stage_time, stage, STAGE_COMPUTE, t0);
+    }
+
+    // Master baru berhenti mengukur setelah rank paling lambat selesai
+    closing_barrier(stage_time, stages, MPI_COMM_WORLD);
+    final_time = MPI_Wtime() - start_time;
+
+    // Fase terlama di antara semua rank, total byte komunikasi, checksum hasil
+    // dan peak RSS tiap rank
+    double max_phase_time[NUM_PHASES];
+    MPI_Reduce(phase_time, max_phase_time, NUM_PHASES, MPI_DOUBLE, MPI_MAX, master, MPI_COMM_WORLD);
+
+    long long comm_bytes = 0;
+    MPI_Reduce(&recv_bytes, &comm_bytes, 1, MPI_LONG_LONG, MPI_SUM, master, MPI_COMM_WORLD);
+
+    double local_sum = 0.0, checksum = 0.0;
+    for (int k = 0; k < mb*nb; k++) local_sum += result[k];
+    MPI_Reduce(&local_sum, &checksum, 1, MPI_DOUBLE, MPI_SUM, master, MPI_COMM_WORLD);
+
+    long rss_kb = peak_rss_kb();
+    long *all_rss_kb = NULL;
+    if (my_rank == master) all_rss_kb = (long *)malloc(comm_sz * sizeof(long));
+    MPI_Gather(&rss_kb, 1, MPI_LONG, all_rss_kb, 1, MPI_LONG, master, MPI_COMM_WORLD);
+
+    // Waktu compute/comm/barrier per stage setiap rank untuk laporan imbalance
+    double *all_stage_time = gather_stage_times(stage_time, stages, master, MPI_COMM_WORLD);
+
+    // Verifikasi: kumpulkan C di master, buang padding, lalu bandingkan
+    // dengan perkalian serial; mode --distributed membandingkan checksum dan
+    // --freivalds memakai probe acak tanpa mengumpulkan C
+    double max_error = 0.0, tolerance = 0.0;
+    if (probes > 0) {
+        freivalds_check(result, mb, nb, my_col*nb, n, n_pad, probes, SEED, probe_z,
+                        row_comm, col_comm, &max_error, &tolerance);
+    } else if (verify && distributed) {
+        double *all_sums = NULL;
+        checksum_result(result, mb, nb, my_row*mb, my_col*nb, n_pad, SEED, sums);
+        if (my_rank == master) all_sums = (double *)malloc(checksum_len(n_pad) * sizeof(double));
+        MPI_Reduce(sums, all_sums, checksum_len(n_pad), MPI_DOUBLE, MPI_SUM, master, MPI_COMM_WORLD);
+        if (my_rank == master) {
+            check_checksum(all_sums, n_pad, n, &max_error, &tolerance);
+            free(all_sums);
+        }
+    } else if (verify) {
+        float *flat_c = NULL;
+        if (my_rank == master) flat_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+        MPI_Gather(result, mb*nb, MPI_FLOAT, flat_c, mb*nb, MPI_FLOAT, master, MPI_COMM_WORLD);
+
+        if (my_rank == master) {
+            float *pad_c = (float *)malloc(n_pad * n_pad * sizeof(float));
+            float *c = (float *)malloc(n * n * sizeof(float));
+            from_blocks(flat_c, pad_c, n_pad, grid_rows, grid_cols);
+            crop_matrix(pad_c, c, n_pad, n);
+            check_product(a, b, c, n, &max_error, &tolerance);
+            free(pad_c); free(c); free(flat_c);
+        }
+    }
+
+    if (my_rank == master) {
+        printf("Total Time Elapsed is %.6f seconds\n", final_time);
+
+        // Satu baris JSON untuk dibaca BenchmarkRunner
+        double gflops = final_time > 0 ? 2.0 * n * n * (double)n / final_time / 1e9 : 0.0;
+        printf("{\"schema_version\": %d, \"program\": \"summa\", \"n\": %d, \"processes\": %d, "
+               "\"padded_n\": %d, \"active_processes\": %d, \"grid\": [%d, %d], \"time\": %.6f, \"phases\": {\"scatter\": %.6f, \"compute\": %.6f, "
+               "\"broadcast\": %.6f, \"shift\": %.6f}, \"gflops\": %.6f, \"checksum\": %.6e, "
+               "\"comm_bytes\": %lld, \"kernel\": \"%s\", \"tile\": %d, \"threads\": %d, "
+               "\"generation\": \"%s\", ",
+               SCHEMA_VERSION, n, comm_sz, n_pad, comm_sz, grid_rows, grid_cols, final_time,
+               max_phase_time[PHASE_SCATTER], max_phase_time[PHASE_COMPUTE],
+               max_phase_time[PHASE_BROADCAST], max_phase_time[PHASE_SHIFT],
+               gflops, checksum, comm_bytes, KERNEL_NAMES[kernel], tile,
+               kernel_threads(), distributed ? "distributed" : "root");
+        if (verify || probes > 0) {
+            const char *method = probes > 0 ? "freivalds" : distributed ? "checksum" : "full";
+            printf("\"verification\": {\"verified\": %s, \"method\": \"%s\", \"probes\": %d, "
+                   "\"max_error\": %.6e, \"tolerance\": %.6e}, ", max_error <= tolerance ? "true" : "false",
+                   method, probes, max_error, tolerance);
+        }
+        print_rank_times(all_stage_time, stages, comm_sz);
+        printf("\"peak_rss_kb\": [");
+        for (int r = 0; r < comm_sz; r++) printf(r ? ", %ld" : "%ld", all_rss_kb[r]);
+        printf("]}\n");
+        free(all_rss_kb);
+        free(all_stage_time);
+    }
+
+    // Cleanup Memory
+    free(my_a); free(my_b); free(panel_a); free(panel_b); free(result); free(sums); free(probe_z); free(stage_time);
+    if (my_rank == master) {
+        free(a); free(b); free(flat_a); free(flat_b);
+    }
+    MPI_Comm_free(&row_comm);
+    MPI_Comm_free(&col_comm);
+
+    MPI_Finalize();
+    return 0;
+}
@@ -0,0 +1,50 @@
+"""
+Serial Baseline Tests
+A plain serial run must never replace a stored baseline
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.baselines import BaselineStore
+from utils.benchmark_runner import BenchmarkRunner
+from utils.executors import create_executor
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    """Local runner whose results, builds and baselines live under tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    runner = BenchmarkRunner(executor=create_executor("local"))
+    runner.sample_resources = False
+    return runner
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="needs gcc to build serial.c")
+def test_single_run_keeps_multi_sample_baseline(runner):
+    baseline = runner.get_serial_baseline(64, repeats=3)
+    assert baseline["success"]
+    key = baseline["baseline"]["key"]
+    stored = runner.baselines.get(key)
+    assert stored["result"]["stats"]["n"] == 3
+
+    assert runner.run_serial_benchmark(64, repeats=1)["success"]
+    assert runner.baselines.get(key) == stored
+
+
+def test_put_keeps_more_reliable_entry(tmp_path):
+    store = BaselineStore(str(tmp_path / "baselines.json"))
+    stats = {"n": 5, "median": 1.0, "ci_low": 0.99, "ci_high": 1.01}
+    assert store.put("k", {"stats": stats})
+
+    assert not store.put("k", {"stats": dict(stats, n=1, ci_low=1.0, ci_high=1.0)})
+    assert not store.put("k", {"stats": dict(stats, ci_low=0.8, ci_high=1.2)})
+    assert store.get("k")["result"]["stats"] == stats
+
+    assert store.put("k", {"stats": dict(stats, n=10)})
+    assert store.get("k")["result"]["stats"]["n"] == 10
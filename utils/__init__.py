@@ -4,22 +4,60 @@ Utilities package for HPC Benchmark application
 
 from .docker_manager import DockerManager
 from .benchmark_runner import BenchmarkRunner
+from .build_cache import BuildCache
+from .baselines import BaselineStore
+from .results_store import ResultsStore
+from .executors import Executor, DockerExecutor, LocalExecutor, create_executor
+from .sweep import ParameterSweep, scaling_table, pivot_times
+from .job_manager import JobManager, get_job_manager
+from .crossover import CrossoverSearch
+from .placement import PlacementEngine
+from .resource_sampler import ResourceSampler
+from .scaling import ScalingStudy
 from .visualizer import (
     parse_benchmark_results,
     create_speedup_chart,
     create_execution_time_chart,
     create_efficiency_chart,
     create_memory_chart,
+    create_phase_chart,
+    create_rank_chart,
+    create_resource_chart,
+    summarize_resources,
+    create_comm_matrix_chart,
+    summarize_pmpi,
     calculate_metrics_summary
 )
 
 __all__ = [
     'DockerManager',
     'BenchmarkRunner',
+    'BuildCache',
+    'BaselineStore',
+    'ResultsStore',
+    'Executor',
+    'DockerExecutor',
+    'LocalExecutor',
+    'create_executor',
+    'ParameterSweep',
+    'scaling_table',
+    'pivot_times',
+    'JobManager',
+    'get_job_manager',
+    'CrossoverSearch',
+    'PlacementEngine',
+    'ResourceSampler',
+    'ScalingStudy',
     'parse_benchmark_results',
     'create_speedup_chart',
     'create_execution_time_chart',
     'create_efficiency_chart',
     'create_memory_chart',
+    'create_phase_chart',
+    'create_rank_chart',
+    'create_resource_chart',
+    'summarize_resources',
+    'create_comm_matrix_chart',
+    'summarize_pmpi',
     'calculate_metrics_summary'
 ]
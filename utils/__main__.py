@@ -0,0 +1,9 @@
+"""
+Sweep Command Line
+Entry point for `python -m utils`, running a parameter sweep (see utils.sweep)
+"""
+
+from .sweep import main
+
+if __name__ == "__main__":
+    main()
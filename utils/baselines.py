@@ -0,0 +1,131 @@
+"""
+Serial Baseline Store
+Persist serial timings so comparisons and sweeps can reuse them instead of re-running serial.c
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A requested refresh that has not landed after this long may be requested again
+REFRESH_RETRY_SECONDS = 3600
+
+
+class BaselineStore:
+    """Serial results keyed by (N, serial binary hash, compiler flags, node, kernel)
+
+    An entry is reusable while it is younger than max_age seconds. It is also
+    confident while it has at least min_samples runs and its CI is narrower
+    than max_relative_ci of the median; otherwise it is worth refreshing.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/baselines.json",
+        max_age: float = 7 * 24 * 3600,
+        min_samples: int = 3,
+        max_relative_ci: float = 0.1
+    ):
+        """Initialize with the JSON file holding the baselines and the validity limits"""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.max_relative_ci = max_relative_ci
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(matrix_size: int, binary_hash: str, flags: str, node: str, kernel: str = "") -> str:
+        """Store key of one baseline"""
+        return f"{matrix_size}|{binary_hash}|{flags}|{node}|{kernel}"
+
+    def _load(self) -> Dict:
+        """Read every entry (empty when the file is missing or unreadable)"""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict):
+        """Atomically write every entry"""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f, indent=2)
+        tmp_path.replace(self.path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Entry for a key, or None"""
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, result: Dict) -> bool:
+        """Store a successful serial result as the baseline for its key
+
+        A valid entry is kept (and False returned) when the new result has
+        fewer samples or a wider relative CI than it.
+        """
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry and not self.expired(entry) and self._less_reliable(result, entry["result"]):
+                logger.info(f"Keeping serial baseline {key}: new result is less reliable")
+                return False
+            entries[key] = {"recorded_at": time.time(), "refresh_requested_at": None, "result": result}
+            self._save(entries)
+            return True
+
+    @staticmethod
+    def _relative_ci(stats: Dict) -> float:
+        """CI width relative to the median (0 when unknown)"""
+        median = stats.get("median") or 0
+        if median <= 0 or stats.get("ci_high") is None or stats.get("ci_low") is None:
+            return 0.0
+        return (stats["ci_high"] - stats["ci_low"]) / median
+
+    @classmethod
+    def _less_reliable(cls, result: Dict, stored: Dict) -> bool:
+        """True if result has fewer samples or a wider relative CI than stored"""
+        new_stats, old_stats = result.get("stats", {}), stored.get("stats", {})
+        if new_stats.get("n", 1) < old_stats.get("n", 1):
+            return True
+        return cls._relative_ci(new_stats) > cls._relative_ci(old_stats)
+
+    def mark_refresh_requested(self, key: str) -> bool:
+        """Flag an entry as being refreshed; False if a refresh is already pending"""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return False
+            requested_at = entry.get("refresh_requested_at")
+            if requested_at and time.time() - requested_at < REFRESH_RETRY_SECONDS:
+                return False
+            entry["refresh_requested_at"] = time.time()
+            self._save(entries)
+            return True
+
+    def expired(self, entry: Dict) -> bool:
+        """True once an entry is older than max_age and must not be reused"""
+        return time.time() - entry["recorded_at"] > self.max_age
+
+    def staleness(self, entry: Dict) -> Optional[str]:
+        """Why an entry should be refreshed, or None while it is valid
+
+        Only age (see expired) invalidates an entry; too few samples or a wide
+        CI are hints that a refresh would give a more reliable baseline.
+        """
+        if self.expired(entry):
+            return f"older than {self.max_age / 3600:.0f}h"
+
+        stats = entry["result"].get("stats", {})
+        if stats.get("n", 1) < self.min_samples:
+            return f"fewer than {self.min_samples} samples"
+        if self._relative_ci(stats) > self.max_relative_ci:
+            return f"CI wider than {self.max_relative_ci:.0%} of the median"
+        return None
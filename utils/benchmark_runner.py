@@ -3,163 +3,814 @@ Benchmark Runner Utilities
 Execute and manage benchmark tests on the HPC cluster
 """
 
-import subprocess
 import time
 import json
 import re
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 import logging
+import statistics
+import threading
+
+from .baselines import BaselineStore
+from .build_cache import BuildCache
+from .crossover import CrossoverSearch
+from .executors import DockerExecutor
+from .placement import PlacementEngine, padding_overhead, process_grid
+from .resource_sampler import ResourceSampler
+from .results_store import ResultsStore
+from .scaling import ScalingStudy
+from .stats import summarize_samples, bootstrap_ratio_ci, rank_imbalance
 
 logger = logging.getLogger(__name__)
 
+# Known failure signatures: (substrings, user-friendly message). They are all
+# fatal, so a streaming run is aborted as soon as one appears in the output.
+ERROR_PATTERNS = [
+    (("kuadrat sempurna", "perfect square"),
+     "Jumlah proses harus kuadrat sempurna (1, 4, 9, 16, ...)"),
+    (("habis dibagi",),
+     "Ukuran matrix (N) harus habis dibagi sqrt(jumlah proses)"),
+    (("host key verification failed",),
+     "SSH host key verification gagal. Rebuild Docker image dengan: docker-compose build"),
+    (("not enough memory", "out of memory"),
+     "Memori tidak cukup. Kurangi jumlah proses atau ukuran matrix"),
+    (("/dev/shm",),
+     "Shared memory penuh. Gunakan maksimal 8 processes atau perbesar shm_size di docker-compose.yml"),
+    (("connection refused",),
+     "Koneksi ke worker node gagal. Pastikan semua nodes running"),
+    (("tidak dikenal",),
+     "Kernel atau ukuran tile tidak valid"),
+]
+
+# Parallel implementations selectable in run_parallel_benchmark
+PARALLEL_ALGORITHMS = {
+    "fox": "Fox (row broadcast + column shift communicators)",
+    "fox_overlap": "Fox, overlapped (next broadcast/shift posted before compute)",
+    "cannon": "Cannon (pre-skewed blocks, circular shifts)",
+    "summa": "SUMMA (panel broadcasts on a P×Q grid)",
+    "matrix_multiplication": "Legacy Fox (matrix.c, redundant stage loop)",
+}
+
+# Local multiply kernels from kernels.h, selected at runtime with --kernel/--tile
+KERNELS = {
+    "naive": "Naive i-j-k (column-strided B)",
+    "ikj": "i-k-j (unit stride, vectorisable)",
+    "tiled": "Tiled i-k-j (cache blocked)",
+    "transposed": "Transposed B (row-by-row dot products)",
+    "blas": "BLAS cblas_sgemm (OpenBLAS)",
+}
+DEFAULT_KERNEL = "ikj"
+DEFAULT_TILE = 64
+
+# Compiler optimisation profiles added to every build
+COMPILER_PROFILES = {
+    "O0": "-O0",
+    "O2": "-O2",
+    "O3": "-O3",
+    "native": "-O3 -march=native",
+}
+DEFAULT_PROFILE = "O2"
+
+# Extra flags for binaries built with the BLAS kernel, and the environment
+# keeping OpenBLAS to one thread per rank so it does not oversubscribe cores
+BLAS_FLAGS = "-DUSE_CBLAS -lopenblas"
+BLAS_ENV = {"OPENBLAS_NUM_THREADS": "1"}
+
+# Flag enabling the OpenMP pragmas in kernels.h for threaded (hybrid MPI+OpenMP) runs
+OPENMP_FLAGS = "-fopenmp"
+
+# PMPI interposition library linked into MPI programs for per-peer communication
+# accounting; it prints one {"pmpi": ...} line from rank 0 at MPI_Finalize
+PMPI_SHIM = "pmpi_profile.c"
+
+# Newest version of the JSON metrics line (see bench_util.h) this parser reads
+METRICS_SCHEMA_VERSION = 1
+
+# Default timeout model: a fixed allowance plus a safety factor times the
+# expected O(N^3) cost at a pessimistic per-process rate of the naive kernel
+TIMEOUT_BASE_SECONDS = 60.0
+TIMEOUT_SAFETY_FACTOR = 3.0
+TIMEOUT_FLOP_RATE = 2.5e8
+
+
+def estimate_timeout(matrix_size: int, num_processes: int = 1) -> float:
+    """Default per-run timeout in seconds derived from the expected 2*N^3 flops"""
+    flops = 2.0 * matrix_size ** 3
+    # Divide by sqrt(P) rather than P: parallel runs also pay for communication
+    # and redundant block work, so never assume perfect scaling here
+    expected = flops / TIMEOUT_FLOP_RATE / max(1.0, num_processes ** 0.5)
+    return TIMEOUT_BASE_SECONDS + TIMEOUT_SAFETY_FACTOR * expected
+
 
 class BenchmarkRunner:
     """Handles execution of benchmark tests"""
     
-    def __init__(self, docker_manager):
-        """Initialize with Docker manager"""
+    def __init__(self, docker_manager=None, executor=None):
+        """Initialize with Docker manager, or any executor backend (see utils.executors)"""
         self.docker_manager = docker_manager
+        self.executor = executor or DockerExecutor(docker_manager)
         self.results_dir = Path("data/results")
-        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.results_store = ResultsStore(str(self.results_dir))
+        self.build_cache = BuildCache(self.executor)
+        self.placement = PlacementEngine(self.executor)
+        self.baselines = BaselineStore()
+        # Optional callable(params) queueing a background get_serial_baseline(**params) refresh
+        self.refresh_scheduler = None
+        # Optional callable(stdout_chunk, stderr_chunk) receiving live output
+        self.output_callback = None
+        # Optional callable() -> bool polled during runs; True kills the run
+        self.cancel_check = None
+        # Record CPU/memory/network of the run's nodes during measured runs
+        self.sample_resources = True
     
-    def compile_code(self, algorithm: str, container: str = "hpchead") -> tuple:
-        """Compile C code for the specified algorithm"""
+    def compile_code(
+        self,
+        algorithm: str,
+        container: Optional[str] = None,
+        profile: str = DEFAULT_PROFILE,
+        blas: bool = False,
+        openmp: bool = False,
+        pmpi: bool = False
+    ) -> Dict:
+        """Compile C code for the specified algorithm and compiler profile, reusing cached binaries
+        
+        blas links the program against OpenBLAS so the "blas" kernel is available;
+        openmp builds with -fopenmp so the local kernels use OMP_NUM_THREADS threads;
+        pmpi links pmpi_profile.c, which counts MPI calls, bytes and time per peer.
+        """
+        home = self.executor.home
         compile_commands = {
-            "matrix_multiplication": "mpicc -o /home/faiz/matrix /home/faiz/matrix.c -lm",
-            "serial": "gcc -o /home/faiz/serial /home/faiz/serial.c",
+            "matrix_multiplication": ("mpicc", f"{home}/matrix.c", "-lm"),
+            "fox": ("mpicc", f"{home}/fox.c", "-lm"),
+            "fox_overlap": ("mpicc", f"{home}/fox.c", "-lm -DFOX_OVERLAP"),
+            "cannon": ("mpicc", f"{home}/cannon.c", "-lm"),
+            "summa": ("mpicc", f"{home}/summa.c", "-lm"),
+            "serial": ("gcc", f"{home}/serial.c", ""),
         }
         
         if algorithm not in compile_commands:
-            return False, f"Unknown algorithm: {algorithm}"
-        
-        cmd = compile_commands[algorithm]
-        exit_code, output = self.docker_manager.execute_command(container, cmd)
+            return {"success": False, "error": f"Unknown algorithm: {algorithm}"}
+        if profile not in COMPILER_PROFILES:
+            return {"success": False, "error": f"Unknown compiler profile: {profile}"}
         
-        if exit_code == 0:
-            return True, "Compilation successful"
-        else:
-            return False, f"Compilation failed: {output}"
+        compiler, source, flags = compile_commands[algorithm]
+        if pmpi and compiler != "mpicc":
+            return {"success": False, "error": f"PMPI profiling needs an MPI program, not {algorithm}"}
+        shim = f"{home}/{PMPI_SHIM}" if pmpi else ""
+        flags = " ".join(filter(None, [
+            COMPILER_PROFILES[profile], shim, flags, BLAS_FLAGS if blas else "", OPENMP_FLAGS if openmp else ""
+        ]))
+        depends = [f"{home}/bench_util.h", f"{home}/kernels.h", f"{home}/freivalds.h", f"{home}/rank_times.h"]
+        build = self.build_cache.build(
+            algorithm, compiler, source, flags, container, depends=depends + [shim] if shim else depends
+        )
+        if build["success"]:
+            build["profile"] = profile
+        return build
+    
+    @staticmethod
+    def _kernel_args(kernel: str, tile: int) -> Optional[str]:
+        """Program arguments selecting the local multiply kernel, or None if unknown"""
+        if kernel not in KERNELS or tile < 1:
+            return None
+        return f"--kernel {kernel} --tile {tile}"
     
-    def run_serial_benchmark(self, matrix_size: int) -> Dict:
-        """Run serial benchmark"""
-        logger.info(f"Running serial benchmark with matrix size {matrix_size}")
+    def _mpi_env_args(self, env: Dict[str, str]) -> str:
+        """mpirun flags exporting env to every rank (-genv for MPICH, -x for Open MPI)"""
+        if self.executor.mpi_flavor == "openmpi":
+            return " ".join(f"-x {name}={value}" for name, value in env.items())
+        return " ".join(f"-genv {name} {value}" for name, value in env.items())
+    
+    def _hybrid_nodes(self, num_processes: int, ranks_per_node: int) -> Optional[List[str]]:
+        """First live nodes that fit num_processes at ranks_per_node each, or None if too few"""
+        nodes = list(self.placement.node_resources()) or [self.executor.head_node]
+        needed = -(-num_processes // ranks_per_node)
+        if needed > len(nodes):
+            return None
+        return nodes[:needed]
+    
+    def run_serial_benchmark(
+        self,
+        matrix_size: int,
+        repeats: int = 1,
+        warmups: int = 0,
+        timeout: Optional[float] = None,
+        kernel: str = DEFAULT_KERNEL,
+        tile: int = DEFAULT_TILE,
+        profile: str = DEFAULT_PROFILE
+    ) -> Dict:
+        """Run serial benchmark with the given local kernel and compiler profile"""
+        logger.info(f"Running serial benchmark with matrix size {matrix_size}, kernel={kernel}")
+        kernel_args = self._kernel_args(kernel, tile)
+        if kernel_args is None:
+            return {"success": False, "status": "failed", "error": f"Unknown kernel: {kernel} (tile {tile})"}
         
-        # Compile serial code
-        success, msg = self.compile_code("serial")
-        if not success:
-            return {"success": False, "error": msg}
+        # Compile serial code (cached)
+        build = self.compile_code("serial", profile=profile, blas=kernel == "blas")
+        if not build["success"]:
+            return dict(build, status="failed")
         
         # Run benchmark
-        cmd = f"/home/faiz/serial {matrix_size}"
-        start_time = time.time()
-        exit_code, output = self.docker_manager.execute_command("hpchead", cmd)
-        end_time = time.time()
-        
-        if exit_code != 0:
-            return {"success": False, "error": output}
+        cmd = f"{build['binary']} {matrix_size} {kernel_args}"
+        if kernel == "blas":
+            cmd = " ".join(f"{name}={value}" for name, value in BLAS_ENV.items()) + f" {cmd}"
+        timeout = timeout or estimate_timeout(matrix_size)
+        result = self._execute_benchmark(
+            cmd, build["binary"], [self.executor.head_node], timeout, repeats, warmups
+        )
         
-        # Parse output
-        result = self._parse_output(output)
         result.update({
-            "success": True,
             "mode": "serial",
             "algorithm": "matrix_multiplication",
             "matrix_size": matrix_size,
             "num_processes": 1,
+            "kernel": kernel,
+            "tile": tile,
+            "profile": profile,
+            "compile_time": build["compile_time"],
+            "build": build,
+            "executor": self.executor.name,
             "timestamp": time.time()
         })
         
         return result
     
+    def get_serial_baseline(
+        self,
+        matrix_size: int,
+        repeats: int = 1,
+        warmups: int = 0,
+        timeout: Optional[float] = None,
+        refresh: bool = False,
+        kernel: str = DEFAULT_KERNEL,
+        tile: int = DEFAULT_TILE,
+        profile: str = DEFAULT_PROFILE
+    ) -> Dict:
+        """Serial result for N, reused from the baseline store when possible
+        
+        A missing entry (or refresh=True) runs serial.c now and stores the
+        result; run_serial_benchmark itself never writes the store. A stale or
+        low-confidence entry is still returned, and a refresh is queued through
+        refresh_scheduler. Without a scheduler only an entry older than the
+        store's max_age is re-run inline; a low-confidence one is reused as is.
+        """
+        build = self.compile_code("serial", profile=profile, blas=kernel == "blas")
+        if not build["success"]:
+            return dict(build, status="failed")
+        
+        key = self._baseline_key(matrix_size, build, kernel, tile)
+        entry = None if refresh else self.baselines.get(key)
+        stale_reason = self.baselines.staleness(entry) if entry else None
+        
+        if entry is None or (self.refresh_scheduler is None and self.baselines.expired(entry)):
+            result = self.run_serial_benchmark(
+                matrix_size, repeats, warmups, timeout, kernel, tile, profile
+            )
+            if result["success"]:
+                self.baselines.put(key, result)
+            result["baseline"] = {"cached": False, "key": key, "replaced_because": stale_reason}
+            return result
+        
+        if stale_reason and self.refresh_scheduler and self.baselines.mark_refresh_requested(key):
+            logger.info(f"Refreshing serial baseline N={matrix_size} in background: {stale_reason}")
+            self.refresh_scheduler({
+                "matrix_size": matrix_size,
+                "repeats": max(repeats, self.baselines.min_samples),
+                "warmups": max(warmups, 1),
+                "timeout": timeout,
+                "refresh": True,
+                "kernel": kernel,
+                "tile": tile,
+                "profile": profile
+            })
+        
+        result = dict(entry["result"])
+        result["baseline"] = {
+            "cached": True,
+            "key": key,
+            "recorded_at": entry["recorded_at"],
+            "age": time.time() - entry["recorded_at"],
+            "stale": stale_reason,
+            "refresh_queued": bool(stale_reason and self.refresh_scheduler)
+        }
+        return result
+    
+    def _baseline_key(self, matrix_size: int, build: Dict, kernel: str, tile: int) -> str:
+        """Baseline key: N, serial binary (source + compiler) hash, flags, kernel and node"""
+        kernel = f"{kernel}:{tile}" if kernel == "tiled" else kernel
+        return BaselineStore.key(
+            matrix_size, build["cache_key"], build["flags"], self.executor.head_node, kernel
+        )
+    
     def run_parallel_benchmark(
         self, 
         matrix_size: int, 
         num_processes: int,
-        mode: str = "single_node"
+        mode: str = "single_node",
+        repeats: int = 1,
+        warmups: int = 0,
+        timeout: Optional[float] = None,
+        placement_policy: str = "block",
+        binding: Optional[str] = None,
+        algorithm: str = "fox",
+        verify: bool = False,
+        kernel: str = DEFAULT_KERNEL,
+        tile: int = DEFAULT_TILE,
+        profile: str = DEFAULT_PROFILE,
+        distributed: bool = False,
+        ranks_per_node: int = 1,
+        threads_per_rank: int = 1,
+        freivalds: int = 0,
+        pmpi: bool = False
     ) -> Dict:
-        """Run parallel benchmark with MPI"""
-        logger.info(f"Running parallel benchmark: size={matrix_size}, procs={num_processes}, mode={mode}")
+        """Run parallel benchmark with MPI
+
+        Fox and Cannon leave ranks beyond the largest square grid idle; the
+        result then carries a "warning" pointing to SUMMA (see idle_rank_warning).
+        Single-node runs keep every rank on the head node; multi-node runs are
+        spread over the live nodes by placement_policy (block, cyclic or
+        fill_head). Hybrid runs put at most ranks_per_node ranks on each node.
+        binding is passed to mpirun as --bind-to when set.
+        threads_per_rank > 1 (or hybrid mode) builds with OpenMP and runs
+        the local multiply on OMP_NUM_THREADS=threads_per_rank threads.
+        algorithm selects one of PARALLEL_ALGORITHMS; verify makes the
+        program check C against a serial product on the master rank.
+        kernel/tile pick the local block multiply and profile the compiler flags.
+        distributed lets every rank generate its own A/B blocks (no n² buffers
+        or scatter on the root); verify then compares checksums instead.
+        freivalds > 0 runs that many distributed Freivalds probes (A(Bx) vs Cx)
+        in place of verify, O(N²) per probe and without gathering C.
+        pmpi links the PMPI profiling shim and attaches its per-rank, per-peer
+        call/byte/time counts as "pmpi".
+        """
+        logger.info(
+            f"Running parallel benchmark: size={matrix_size}, procs={num_processes}, "
+            f"mode={mode}, algorithm={algorithm}"
+        )
+        if algorithm not in PARALLEL_ALGORITHMS:
+            return {"success": False, "status": "failed", "error": f"Unknown algorithm: {algorithm}"}
+        kernel_args = self._kernel_args(kernel, tile)
+        if kernel_args is None:
+            return {"success": False, "status": "failed", "error": f"Unknown kernel: {kernel} (tile {tile})"}
+        if ranks_per_node < 1 or threads_per_rank < 1:
+            return {"success": False, "status": "failed", "error": "ranks_per_node and threads_per_rank must be at least 1"}
+        if mode == "hybrid":
+            hybrid_nodes = self._hybrid_nodes(num_processes, ranks_per_node)
+            if hybrid_nodes is None:
+                return {
+                    "success": False, "status": "failed",
+                    "error": f"{num_processes} ranks at {ranks_per_node} per node need more live nodes",
+                    "user_error": "Jumlah node aktif tidak cukup untuk ranks per node yang dipilih"
+                }
         
-        # Compile parallel code
-        success, msg = self.compile_code("matrix_multiplication")
-        if not success:
-            return {"success": False, "error": msg}
+        idle_warning = self.idle_rank_warning(num_processes, algorithm)
+        if idle_warning:
+            logger.warning(idle_warning)
+        
+        # Compile parallel code (cached)
+        threaded = mode == "hybrid" or threads_per_rank > 1
+        build = self.compile_code(algorithm, profile=profile, blas=kernel == "blas", openmp=threaded, pmpi=pmpi)
+        if not build["success"]:
+            return dict(build, status="failed")
+        
+        # OpenMP threads per rank; threaded BLAS follows the same count
+        env = dict(BLAS_ENV) if kernel == "blas" else {}
+        if threaded:
+            env["OMP_NUM_THREADS"] = str(threads_per_rank)
+            if kernel == "blas":
+                env["OPENBLAS_NUM_THREADS"] = str(threads_per_rank)
+            if binding == "core":
+                logger.warning("Core binding would pin all OpenMP threads of a rank to one core; running unbound")
+                binding = None
         
         # Build MPI command based on mode
+        binary = build["binary"]
+        env_args = self._mpi_env_args(env)
+        mpirun = " ".join(filter(None, ["mpirun", self.executor.mpirun_args, env_args, f"-np {num_processes}"]))
         if mode == "single_node":
-            mpi_cmd = f"mpirun -np {num_processes} --host hpchead /home/faiz/matrix {matrix_size}"
+            head = self.executor.head_node
+            placement = self.placement.place(num_processes, "block", nodes=[head])
+            bind = f"--bind-to {binding}" if binding and binding != "none" else ""
+            hosts = " ".join(filter(None, [f"--host {head}:{num_processes}", bind]))
+        elif mode == "hybrid":
+            placement = self.placement.place(num_processes, "block", nodes=hybrid_nodes)
+            hosts = self.placement.mpirun_args(placement, binding)
         else:  # multi_node
-            # Distribute across nodes
-            hosts = self._generate_hostlist(num_processes)
-            mpi_cmd = f"mpirun -np {num_processes} {hosts} /home/faiz/matrix {matrix_size}"
+            placement = self.placement.place(num_processes, placement_policy)
+            hosts = self.placement.mpirun_args(placement, binding)
+        placement["binding"] = binding or "none"
+        placement["threads_per_rank"] = threads_per_rank
+        placement["oversubscribed"] = any(
+            count * threads_per_rank > placement["cores"][node] for node, count in placement["slots"].items()
+        )
+        nodes = list(placement["slots"])
+        mpi_cmd = f"{mpirun} {hosts} {binary} {matrix_size} {kernel_args}"
+        if verify:
+            mpi_cmd += " --verify"
+        if distributed:
+            if algorithm == "matrix_multiplication":
+                return {"success": False, "status": "failed",
+                        "error": "Distributed generation is not supported by the legacy algorithm"}
+            mpi_cmd += " --distributed"
+        if freivalds > 0:
+            if algorithm == "matrix_multiplication":
+                return {"success": False, "status": "failed",
+                        "error": "Freivalds verification is not supported by the legacy algorithm"}
+            mpi_cmd += f" --freivalds {freivalds}"
         
         # Run benchmark
-        start_time = time.time()
-        exit_code, output = self.docker_manager.execute_command("hpchead", mpi_cmd)
-        end_time = time.time()
+        timeout = timeout or estimate_timeout(matrix_size, num_processes)
+        result = self._execute_benchmark(mpi_cmd, binary, nodes, timeout, repeats, warmups)
         
-        if exit_code != 0:
-            return {"success": False, "error": output}
-        
-        # Parse output
-        result = self._parse_output(output)
         result.update({
-            "success": True,
             "mode": mode,
-            "algorithm": "matrix_multiplication",
+            "algorithm": algorithm,
             "matrix_size": matrix_size,
             "num_processes": num_processes,
+            "kernel": kernel,
+            "tile": tile,
+            "profile": profile,
+            "distributed": distributed,
+            "ranks_per_node": max(placement["slots"].values()),
+            "threads_per_rank": threads_per_rank,
+            "cores_used": num_processes * threads_per_rank,
+            "compile_time": build["compile_time"],
+            "build": build,
+            "placement": placement,
+            "executor": self.executor.name,
             "timestamp": time.time()
         })
+        if idle_warning:
+            result["warning"] = idle_warning
         
         return result
     
-    def run_comparison(self, matrix_size: int, num_processes: int = 4) -> Dict:
-        """Run comparison between serial, single-node, and multi-node"""
+    def run_comparison(
+        self,
+        matrix_size: int,
+        num_processes: int = 4,
+        repeats: int = 1,
+        warmups: int = 0,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        timeout: Optional[float] = None,
+        placement_policy: str = "block",
+        binding: Optional[str] = None,
+        reuse_baseline: bool = True,
+        refresh_baseline: bool = False,
+        algorithm: str = "fox",
+        verify: bool = False,
+        kernel: str = DEFAULT_KERNEL,
+        tile: int = DEFAULT_TILE,
+        profile: str = DEFAULT_PROFILE,
+        distributed: bool = False,
+        threads_per_rank: int = 1,
+        freivalds: int = 0,
+        pmpi: bool = False
+    ) -> Dict:
+        """Run comparison between serial, single-node, and multi-node
+        
+        With reuse_baseline the serial time comes from the baseline store when
+        a valid entry exists; refresh_baseline forces a new serial run. All
+        three runs use the same kernel and compiler profile.
+        """
+        report = progress_callback or (lambda progress, message: None)
         results = {
             "matrix_size": matrix_size,
             "num_processes": num_processes,
+            "algorithm": algorithm,
+            "kernel": kernel,
+            "tile": tile,
+            "profile": profile,
+            "threads_per_rank": threads_per_rank,
+            "repeat_runs": repeats,
+            "warmup_runs": warmups,
             "tests": {}
         }
         
         # Run serial
-        results["tests"]["serial"] = self.run_serial_benchmark(matrix_size)
+        report(0.0, "Running serial benchmark")
+        if reuse_baseline:
+            results["tests"]["serial"] = self.get_serial_baseline(
+                matrix_size, repeats, warmups, timeout, refresh_baseline, kernel, tile, profile
+            )
+        else:
+            results["tests"]["serial"] = self.run_serial_benchmark(
+                matrix_size, repeats, warmups, timeout, kernel, tile, profile
+            )
         
         # Run single-node parallel
+        report(1 / 3, "Running single-node benchmark")
         results["tests"]["single_node"] = self.run_parallel_benchmark(
-            matrix_size, num_processes, "single_node"
+            matrix_size, num_processes, "single_node", repeats, warmups, timeout,
+            binding=binding, algorithm=algorithm, verify=verify,
+            kernel=kernel, tile=tile, profile=profile, distributed=distributed,
+            threads_per_rank=threads_per_rank, freivalds=freivalds, pmpi=pmpi
         )
         
         # Run multi-node parallel
+        report(2 / 3, "Running multi-node benchmark")
         results["tests"]["multi_node"] = self.run_parallel_benchmark(
-            matrix_size, num_processes, "multi_node"
+            matrix_size, num_processes, "multi_node", repeats, warmups, timeout,
+            placement_policy, binding, algorithm, verify, kernel, tile, profile, distributed,
+            threads_per_rank=threads_per_rank, freivalds=freivalds, pmpi=pmpi
         )
         
-        # Calculate speedups
+        # Calculate speedups from medians, carrying the bootstrap CI through
         if results["tests"]["serial"]["success"]:
-            serial_time = results["tests"]["serial"]["execution_time"]
+            serial = results["tests"]["serial"]
             
             for mode in ["single_node", "multi_node"]:
                 if results["tests"][mode]["success"]:
-                    parallel_time = results["tests"][mode]["execution_time"]
-                    speedup = serial_time / parallel_time
-                    efficiency = speedup / num_processes
-                    results["tests"][mode]["speedup"] = speedup
-                    results["tests"][mode]["efficiency"] = efficiency
+                    parallel = results["tests"][mode]
+                    if parallel["execution_time"] <= 0:
+                        continue
+                    speedup = serial["execution_time"] / parallel["execution_time"]
+                    speedup_low, speedup_high = bootstrap_ratio_ci(
+                        serial["samples"], parallel["samples"]
+                    )
+                    # Efficiency per core: each rank runs threads_per_rank threads
+                    cores = num_processes * threads_per_rank
+                    parallel["speedup"] = speedup
+                    parallel["efficiency"] = speedup / cores
+                    parallel["speedup_ci"] = [speedup_low, speedup_high]
+                    parallel["efficiency_ci"] = [speedup_low / cores, speedup_high / cores]
         
         return results
     
-    def _generate_hostlist(self, num_processes: int) -> str:
-        """Generate MPI host list for multi-node execution"""
-        nodes = ["hpchead", "node01", "node02", "node03"]
-        procs_per_node = max(1, num_processes // len(nodes))
+    def run_crossover_search(
+        self,
+        num_processes: int = 4,
+        n_min: int = 100,
+        n_max: int = 5000,
+        tolerance: int = 100,
+        efficiency_threshold: Optional[float] = None,
+        min_repeats: int = 3,
+        max_repeats: int = 10,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        **run_options
+    ) -> Dict:
+        """Adaptive search for the N where multi-node starts beating single-node
+        
+        With efficiency_threshold, also finds the largest process count that
+        keeps multi-node efficiency above it at the crossover size. run_options
+        (algorithm, kernel, profile, placement_policy, ...) apply to every run.
+        """
+        report = progress_callback or (lambda progress, message: None)
+        # The node crossover search takes most of the progress bar, the efficiency search the rest
+        share = 0.7 if efficiency_threshold else 1.0
+        search = CrossoverSearch(
+            self, min_repeats, max_repeats,
+            progress_callback=lambda progress, message: report(progress * share, message),
+            **run_options
+        )
+        results = {"crossover": search.find_node_crossover(num_processes, n_min, n_max, tolerance)}
+        
+        if efficiency_threshold:
+            search.report = lambda progress, message: report(share + progress * (1 - share), message)
+            matrix_size = results["crossover"]["crossover_n"] or n_max
+            results["efficiency"] = search.find_efficiency_threshold(
+                matrix_size, efficiency_threshold
+            )
+        
+        results["total_runs"] = search.total_runs
+        return results
+    
+    def run_scaling_study(
+        self,
+        study: str = "strong",
+        matrix_size: int = 1000,
+        process_counts: Optional[List[int]] = None,
+        mode: str = "multi_node",
+        repeats: int = 1,
+        warmups: int = 0,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        **run_options
+    ) -> Dict:
+        """Strong-scaling (fixed N) or weak-scaling (N²/P fixed, base N) series
+        
+        Each point reports speedup, efficiency and the Karp-Flatt metric; the
+        series is fitted with Amdahl's (strong) or Gustafson's (weak) law.
+        """
+        scaling = ScalingStudy(self, mode, repeats, warmups, progress_callback, **run_options)
+        process_counts = process_counts or [1, 4, 9, 16]
+        if study == "weak":
+            return scaling.weak(matrix_size, process_counts)
+        return scaling.strong(matrix_size, process_counts)
+    
+    def _run_streaming(self, cmd: str, binary: str, nodes: List[str], timeout: float) -> Dict:
+        """Run a command with live output under a watchdog
+
+        The run is killed on every node it touched as soon as a known fatal
+        error appears, the timeout expires or cancellation is requested.
+        """
+        stdout, stderr = [], []
+        tail = ""
+        fatal_error = None
+        watchdog_state = {"reason": None}
+        finished = threading.Event()
+        
+        def watchdog():
+            deadline = time.time() + timeout
+            while not finished.wait(0.5):
+                if time.time() >= deadline:
+                    watchdog_state["reason"] = "timeout"
+                elif self.cancel_check and self.cancel_check():
+                    watchdog_state["reason"] = "cancelled"
+                else:
+                    continue
+                self._kill_benchmark(binary, nodes)
+                return
+        
+        watchdog_thread = threading.Thread(target=watchdog, daemon=True)
+        watchdog_thread.start()
+        
+        stream = self.executor.stream(self.executor.head_node, cmd)
+        try:
+            while True:
+                try:
+                    stdout_chunk, stderr_chunk = next(stream)
+                except StopIteration as stop:
+                    exit_code = stop.value
+                    break
+                
+                for buffer, chunk in ((stdout, stdout_chunk), (stderr, stderr_chunk)):
+                    if chunk:
+                        buffer.append(chunk)
+                        tail = (tail + chunk)[-2048:]
+                if self.output_callback:
+                    self.output_callback(stdout_chunk, stderr_chunk)
+                
+                fatal_error = self._match_error(tail)
+                if fatal_error:
+                    # Don't wait for a hung mpirun: stop reading and kill it
+                    stream.close()
+                    self._kill_benchmark(binary, nodes)
+                    exit_code = -1
+                    break
+        finally:
+            finished.set()
+            watchdog_thread.join()
+        
+        output = "".join(stdout)
+        if stderr:
+            output += "\n" + "".join(stderr)
+        
+        status = watchdog_state["reason"]
+        if status:
+            exit_code = -1
+        elif exit_code == 0 and not fatal_error:
+            status = "completed"
+        else:
+            status = "failed"
+        
+        return {
+            "exit_code": exit_code,
+            "status": status,
+            "output": output,
+            "stdout": "".join(stdout),
+            "stderr": "".join(stderr),
+            "fatal_error": fatal_error
+        }
+    
+    def _kill_benchmark(self, binary: str, nodes: List[str]):
+        """Kill the process tree of a run on every node it touched
+
+        On the head node this is mpirun plus its local ranks; on every node it
+        also covers the hydra proxies (and the ssh sessions launching them)
+        and any rank still running the binary. The first character of each
+        pattern is bracketed so pkill never matches its own shell.
+        """
+        directory, name = binary.rsplit("/", 1)
+        binary_pattern = f"{directory}/[{name[0]}]{name[1:]}"
+        for node in nodes:
+            logger.warning(f"Killing {binary} on {node}")
+            self.executor.run(
+                node,
+                f"pkill -KILL -f {binary_pattern}; pkill -KILL -f [h]ydra_pmi_proxy; true"
+            )
+    
+    def _execute_benchmark(
+        self,
+        cmd: str,
+        binary: str,
+        nodes: List[str],
+        timeout: float,
+        repeats: int = 1,
+        warmups: int = 0
+    ) -> Dict:
+        """Run a command with warm-ups, then measured repetitions summarized by median
+
+        With sample_resources the nodes' CPU, memory and network use during
+        the last measured run is attached as "resources".
+        """
+        samples = []
+        wall_times = []
+        resources = None
+        for run in range(warmups + max(1, repeats)):
+            if self.cancel_check and self.cancel_check():
+                return {"success": False, "status": "cancelled", "error": "Cancelled",
+                        "user_error": "Benchmark dibatalkan"}
+            
+            sampler = None
+            if self.sample_resources and run >= warmups:
+                sampler = ResourceSampler(self.executor, nodes)
+                sampler.start()
+            start_time = time.time()
+            run_output = self._run_streaming(cmd, binary, nodes, timeout)
+            end_time = time.time()
+            if sampler:
+                resources = sampler.stop()
+            
+            output = run_output["output"]
+            if run_output["status"] != "completed":
+                failure = {
+                    "success": False,
+                    "status": run_output["status"],
+                    "error": output,
+                    "raw_output": output,
+                    "timeout": timeout
+                }
+                if run_output["status"] == "timeout":
+                    user_error = f"Benchmark dihentikan: melebihi batas waktu {timeout:.0f} detik"
+                elif run_output["status"] == "cancelled":
+                    user_error = "Benchmark dibatalkan"
+                else:
+                    user_error = run_output["fatal_error"] or self._match_error(output)
+                if user_error:
+                    failure["user_error"] = user_error
+                return failure
+            
+            if run < warmups:
+                continue
+            
+            # Parse output; the last run's raw output and metrics are kept
+            result = self._parse_output(output)
+            samples.append(result["execution_time"])
+            wall_times.append(end_time - start_time)
         
-        hostlist = []
-        for node in nodes[:min(len(nodes), num_processes)]:
-            hostlist.append(f"{node}:{procs_per_node}")
+        stats = summarize_samples(samples)
+        result.update({
+            "success": True,
+            "status": "completed",
+            "execution_time": stats["median"],
+            "samples": samples,
+            "stats": stats,
+            "repeat_runs": len(samples),
+            "warmup_runs": warmups,
+            "wall_time": statistics.median(wall_times),
+            "timeout": timeout
+        })
+        if resources:
+            result["resources"] = resources
         
-        return "--host " + ",".join(hostlist)
+        return result
+    
+    def validate_configuration(
+        self, matrix_size: int, num_processes: int, algorithm: str = "fox"
+    ) -> Optional[str]:
+        """Return why (N, P) cannot run with the algorithm's decomposition, or None if valid
+
+        Fox, Cannon and SUMMA zero-pad N and idle surplus ranks, so any N, P >= 1
+        runs; only the legacy matrix.c still needs a perfect square dividing N.
+        """
+        if matrix_size < 1 or num_processes < 1:
+            return "N and P must be at least 1"
+        if algorithm != "matrix_multiplication":
+            return None
+        rows, cols = process_grid(num_processes, algorithm)
+        if rows * cols != num_processes:
+            return f"{num_processes} processes is not a perfect square"
+        if matrix_size % rows != 0:
+            return f"N={matrix_size} is not divisible by sqrt(P)={rows}"
+        return None
+    
+    @staticmethod
+    def idle_rank_warning(num_processes: int, algorithm: str = "fox") -> Optional[str]:
+        """Why some of the P ranks would sit idle with the algorithm's grid, or None if all work
+
+        Fox and Cannon need a square q x q grid and leave P - floor(sqrt(P))²
+        ranks idle; SUMMA's rectangular grid uses every rank.
+        """
+        if algorithm == "matrix_multiplication":
+            return None
+        rows, cols = process_grid(num_processes, algorithm)
+        idle = num_processes - rows * cols
+        if not idle:
+            return None
+        return (
+            f"{algorithm} uses a {rows}x{cols} grid: only {rows * cols} of {num_processes} ranks "
+            f"work and {idle} stay idle; use summa to run on all {num_processes} ranks"
+        )
+    
+    @staticmethod
+    def _match_error(output: str) -> Optional[str]:
+        """Map known error text in the output to a user-friendly message"""
+        lowered = output.lower()
+        for substrings, message in ERROR_PATTERNS:
+            if any(substring in lowered for substring in substrings):
+                return message
+        return None
     
     def _parse_output(self, output: str) -> Dict:
         """Parse benchmark output to extract metrics"""
@@ -171,20 +822,46 @@ class BenchmarkRunner:
         }
         
         # Check for common errors and provide user-friendly messages
-        if "kuadrat sempurna" in output.lower() or "perfect square" in output.lower():
-            result["user_error"] = "Jumlah proses harus kuadrat sempurna (1, 4, 9, 16, ...)"
-        elif "host key verification failed" in output.lower():
-            result["user_error"] = "SSH host key verification gagal. Rebuild Docker image dengan: docker-compose build"
-        elif "not enough memory" in output.lower() or "out of memory" in output.lower():
-            result["user_error"] = "Memori tidak cukup. Kurangi jumlah proses atau ukuran matrix"
-        elif "/dev/shm" in output.lower():
-            result["user_error"] = "Shared memory penuh. Gunakan maksimal 8 processes atau perbesar shm_size di docker-compose.yml"
-        elif "connection refused" in output.lower():
-            result["user_error"] = "Koneksi ke worker node gagal. Pastikan semua nodes running"
+        user_error = self._match_error(output)
+        if user_error:
+            result["user_error"] = user_error
         elif exit_code := re.search(r'exit code (\d+)', output.lower()):
             result["user_error"] = f"Proses gagal dengan exit code {exit_code.group(1)}"
         
-        # Extract execution time
+        # Prefer the structured JSON line printed by matrix.c / serial.c
+        metrics = self._parse_metrics_line(output)
+        if metrics:
+            peak_rss_mb = [kb / 1024.0 for kb in metrics.get("peak_rss_kb", [])]
+            result.update({
+                "execution_time": metrics["time"],
+                "gflops": metrics.get("gflops", 0.0),
+                "memory_mb": max(peak_rss_mb, default=0.0),
+                "peak_rss_mb": peak_rss_mb,
+                "phases": metrics.get("phases", {}),
+                "checksum": metrics.get("checksum"),
+                "schema_version": metrics["schema_version"]
+            })
+            for key in ("comm_bytes", "grid", "threads"):
+                if key in metrics:
+                    result[key] = metrics[key]
+            if "verification" in metrics:
+                result["verification"] = metrics["verification"]
+            if "rank_times" in metrics:
+                result["rank_times"] = metrics["rank_times"]
+                result["imbalance"] = rank_imbalance(
+                    metrics["rank_times"], metrics.get("active_processes", metrics["processes"])
+                )
+            if "padded_n" in metrics:
+                result["padding"] = padding_overhead(
+                    metrics["n"], metrics["padded_n"],
+                    metrics.get("active_processes", metrics["processes"]), metrics["processes"]
+                )
+            pmpi = self._parse_pmpi_line(output)
+            if pmpi:
+                result["pmpi"] = pmpi
+            return result
+        
+        # Fall back to scraping the text output of older binaries
         time_match = re.search(r'Total Time Elapsed is ([\d.]+) seconds', output)
         if time_match:
             result["execution_time"] = float(time_match.group(1))
@@ -201,24 +878,43 @@ class BenchmarkRunner:
         
         return result
     
-    def save_results(self, results: Dict, filename: Optional[str] = None):
-        """Save benchmark results to JSON file"""
-        if filename is None:
-            filename = f"benchmark_{int(time.time())}.json"
-        
-        filepath = self.results_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        logger.info(f"Results saved to {filepath}")
-        return filepath
+    @staticmethod
+    def _parse_metrics_line(output: str) -> Optional[Dict]:
+        """Last JSON metrics line of a supported schema version in the output, if any"""
+        for line in reversed(output.splitlines()):
+            line = line.strip()
+            if not (line.startswith("{") and '"schema_version"' in line):
+                continue
+            try:
+                metrics = json.loads(line)
+            except ValueError:
+                continue
+            if metrics.get("schema_version", 0) <= METRICS_SCHEMA_VERSION and "time" in metrics:
+                return metrics
+            logger.warning(f"Ignoring metrics line with schema {metrics.get('schema_version')}")
+        return None
+    
+    @staticmethod
+    def _parse_pmpi_line(output: str) -> Optional[Dict]:
+        """Communication counts printed by the PMPI shim (see pmpi_profile.c), if any"""
+        for line in reversed(output.splitlines()):
+            line = line.strip()
+            if not line.startswith('{"pmpi"'):
+                continue
+            try:
+                return json.loads(line)["pmpi"]
+            except (ValueError, KeyError):
+                logger.warning("Ignoring malformed PMPI line")
+        return None
+    
+    def save_results(self, results: Dict, filename: Optional[str] = None) -> str:
+        """Save benchmark results to the results store and return their name"""
+        return self.results_store.save(results, filename)
     
     def load_results(self, filename: str) -> Dict:
-        """Load benchmark results from JSON file"""
-        filepath = self.results_dir / filename
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        """Load benchmark results from the results store"""
+        return self.results_store.load(filename)
     
     def list_results(self) -> List[str]:
-        """List all saved result files"""
-        return [f.name for f in self.results_dir.glob("*.json")]
+        """List the names of all saved results, newest first"""
+        return self.results_store.names()
@@ -0,0 +1,122 @@
+"""
+Build Cache Utilities
+Content-addressed cache of compiled benchmark binaries on the shared volume
+"""
+
+import hashlib
+import time
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BuildCache:
+    """Reuses compiled binaries keyed by source hash, compiler version and flags"""
+
+    def __init__(self, executor, build_dir: Optional[str] = None):
+        """Initialize with an executor; binaries go to <home>/.build (on mpi_home for Docker)"""
+        self.executor = executor
+        self.build_dir = build_dir or f"{executor.home}/.build"
+        self._compiler_versions = {}
+
+    def compiler_version(self, compiler: str, container: Optional[str] = None) -> Optional[str]:
+        """Get the first line of `<compiler> --version` (memoized per container)"""
+        container = container or self.executor.head_node
+        memo_key = (container, compiler)
+        if memo_key not in self._compiler_versions:
+            exit_code, output = self.executor.run(
+                container, f"{compiler} --version"
+            )
+            if exit_code != 0:
+                logger.error(f"Failed to query {compiler} version: {output}")
+                return None
+            lines = output.strip().splitlines()
+            self._compiler_versions[memo_key] = lines[0] if lines else compiler
+        return self._compiler_versions[memo_key]
+
+    def source_hash(
+        self,
+        source: str,
+        container: Optional[str] = None,
+        depends: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """Get the SHA-256 of a source file (followed by any headers it includes) inside the container"""
+        container = container or self.executor.head_node
+        exit_code, output = self.executor.run(
+            container, f"set -o pipefail; cat {' '.join([source] + (depends or []))} | sha256sum"
+        )
+        if exit_code != 0 or not output.strip():
+            logger.error(f"Failed to hash {source}: {output}")
+            return None
+        return output.split()[0]
+
+    @staticmethod
+    def cache_key(source_hash: str, compiler_version: str, flags: str) -> str:
+        """Combine the build inputs into a single content address"""
+        digest = hashlib.sha256()
+        for part in (source_hash, compiler_version, flags):
+            digest.update(part.encode('utf-8'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def build(
+        self,
+        name: str,
+        compiler: str,
+        source: str,
+        flags: str = "",
+        container: Optional[str] = None,
+        depends: Optional[List[str]] = None
+    ) -> Dict:
+        """Return a cached binary for the inputs, compiling it on a miss
+
+        depends lists local headers included by the source, so editing them
+        also invalidates the cached binary.
+        """
+        container = container or self.executor.head_node
+        version = self.compiler_version(compiler, container)
+        if version is None:
+            return {"success": False, "error": f"Compiler not available: {compiler}"}
+
+        src_hash = self.source_hash(source, container, depends)
+        if src_hash is None:
+            return {"success": False, "error": f"Source file not found: {source}"}
+
+        key = self.cache_key(src_hash, version, flags)
+        binary = f"{self.build_dir}/{name}-{key[:16]}"
+        build_info = {
+            "success": True,
+            "binary": binary,
+            "cache_key": key,
+            "source_hash": src_hash,
+            "compiler": compiler,
+            "compiler_version": version,
+            "flags": flags,
+            "cache_hit": False,
+            "compile_time": 0.0
+        }
+
+        exit_code, _ = self.executor.run(container, f"test -x {binary}")
+        if exit_code == 0:
+            logger.info(f"Build cache hit for {name}: {binary}")
+            build_info["cache_hit"] = True
+            return build_info
+
+        # Compile to a temporary name and rename, so concurrent sessions never
+        # execute a half-written binary from the shared volume
+        tmp_binary = f"{binary}.tmp.$$"
+        cmd = (
+            f"mkdir -p {self.build_dir} && "
+            f"{compiler} -o {tmp_binary} {source} {flags} && "
+            f"mv -f {tmp_binary} {binary}"
+        )
+        start_time = time.time()
+        exit_code, output = self.executor.run(container, cmd)
+        build_info["compile_time"] = time.time() - start_time
+
+        if exit_code != 0:
+            return {"success": False, "error": f"Compilation failed: {output}"}
+
+        logger.info(f"Compiled {name} in {build_info['compile_time']:.2f}s: {binary}")
+        return build_info
@@ -0,0 +1,292 @@
+"""
+Crossover Search Utilities
+Adaptive bracketing and bisection to find where multi-node beats single-node
+"""
+
+import inspect
+import math
+from typing import Callable, Dict, List, Optional
+import logging
+
+from .stats import summarize_samples, bootstrap_ratio_ci
+
+logger = logging.getLogger(__name__)
+
+
+class SearchFailed(Exception):
+    """Raised when a benchmark needed by the search does not complete"""
+
+
+class CrossoverSearch:
+    """Finds crossover points with as few benchmark runs as possible
+
+    Each comparison samples both sides sequentially: it starts with
+    min_repeats runs and adds one run per side until the confidence intervals
+    stop overlapping or max_repeats is reached.
+    """
+
+    def __init__(
+        self,
+        runner,
+        min_repeats: int = 3,
+        max_repeats: int = 10,
+        warmups: int = 1,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        **run_options
+    ):
+        """Initialize with a BenchmarkRunner and the sampling budget per point
+
+        run_options are forwarded to run_parallel_benchmark (e.g. algorithm,
+        placement_policy); the ones serial runs accept (kernel, tile, profile)
+        go to the serial runs too.
+        """
+        self.runner = runner
+        self.min_repeats = max(2, min_repeats)
+        self.max_repeats = max(self.min_repeats, max_repeats)
+        self.warmups = warmups
+        self.report = progress_callback or (lambda progress, message: None)
+        self.run_options = run_options
+        accepted = inspect.signature(runner.run_serial_benchmark).parameters
+        self.serial_options = {k: v for k, v in run_options.items() if k in accepted}
+        self._samples = {}
+        self.total_runs = 0
+        # Evaluated points against the number a search is expected to need
+        self._evaluated = 0
+        self._expected = 1
+
+    def _start(self, expected: int):
+        """Reset the progress estimate for a search expecting `expected` evaluations"""
+        self._evaluated = 0
+        self._expected = max(1, expected)
+
+    def _progress(self) -> float:
+        """Share of the expected evaluations done, kept below 1 until the search returns"""
+        return min(self._evaluated / self._expected, 0.99)
+
+    def _sample(self, matrix_size: int, num_processes: int, mode: str, count: int) -> Dict:
+        """Add `count` measured runs to a point and return its summary"""
+        key = (matrix_size, num_processes, mode)
+        first = key not in self._samples
+        warmups = self.warmups if first else 0
+
+        runs = count + warmups
+        if mode == "serial" and first:
+            # Start from the stored serial baseline; a cached one costs no runs
+            result = self.runner.get_serial_baseline(matrix_size, count, warmups, **self.serial_options)
+            if (result.get("baseline") or {}).get("cached"):
+                runs = 0
+        elif mode == "serial":
+            # Top-ups are merged into this search only, never into the baseline store
+            result = self.runner.run_serial_benchmark(matrix_size, count, warmups, **self.serial_options)
+        else:
+            result = self.runner.run_parallel_benchmark(
+                matrix_size, num_processes, mode, count, warmups, **self.run_options
+            )
+        if not result.get("success"):
+            raise SearchFailed(
+                f"{mode} N={matrix_size} P={num_processes}: "
+                f"{result.get('user_error') or result.get('error')}"
+            )
+
+        self.total_runs += runs
+        self._samples.setdefault(key, []).extend(result["samples"])
+        return summarize_samples(self._samples[key])
+
+    def _ensure(self, matrix_size: int, num_processes: int, mode: str) -> Dict:
+        """Make sure a point has at least min_repeats samples"""
+        key = (matrix_size, num_processes, mode)
+        # A reused serial baseline may hold fewer samples than min_repeats
+        while len(self._samples.get(key, [])) < self.min_repeats:
+            self._sample(matrix_size, num_processes, mode, self.min_repeats - len(self._samples.get(key, [])))
+        return summarize_samples(self._samples[key])
+
+    def compare_modes(self, matrix_size: int, num_processes: int) -> Dict:
+        """Compare single-node and multi-node at one point
+
+        direction is +1 when multi-node is faster and -1 when single-node is
+        faster; decided is True once the confidence intervals are disjoint.
+        """
+        self.report(self._progress(), f"Comparing nodes at N={matrix_size}, P={num_processes}")
+        single = self._ensure(matrix_size, num_processes, "single_node")
+        multi = self._ensure(matrix_size, num_processes, "multi_node")
+
+        while True:
+            decided = single["ci_high"] < multi["ci_low"] or multi["ci_high"] < single["ci_low"]
+            if decided or min(single["n"], multi["n"]) >= self.max_repeats:
+                break
+            single = self._sample(matrix_size, num_processes, "single_node", 1)
+            multi = self._sample(matrix_size, num_processes, "multi_node", 1)
+
+        comparison = {
+            "matrix_size": matrix_size,
+            "num_processes": num_processes,
+            "direction": 1 if multi["median"] < single["median"] else -1,
+            "decided": decided,
+            "single_node": single,
+            "multi_node": multi
+        }
+        self._evaluated += 1
+        return comparison
+
+    def efficiency_at(self, matrix_size: int, num_processes: int, mode: str, threshold: float) -> Dict:
+        """Parallel efficiency at one point, sampled until its CI excludes the threshold"""
+        self.report(self._progress(), f"Measuring efficiency at N={matrix_size}, P={num_processes}")
+        self._ensure(matrix_size, 1, "serial")
+        self._ensure(matrix_size, num_processes, mode)
+
+        while True:
+            serial_samples = self._samples[(matrix_size, 1, "serial")]
+            parallel_samples = self._samples[(matrix_size, num_processes, mode)]
+            low, high = bootstrap_ratio_ci(serial_samples, parallel_samples)
+            efficiency_ci = [low / num_processes, high / num_processes]
+            decided = efficiency_ci[1] < threshold or efficiency_ci[0] >= threshold
+            if decided or len(parallel_samples) >= self.max_repeats:
+                break
+            self._sample(matrix_size, num_processes, mode, 1)
+            if len(serial_samples) < self.max_repeats:
+                self._sample(matrix_size, 1, "serial", 1)
+
+        serial = summarize_samples(serial_samples)
+        parallel = summarize_samples(parallel_samples)
+        efficiency = serial["median"] / parallel["median"] / num_processes
+        self._evaluated += 1
+        return {
+            "matrix_size": matrix_size,
+            "num_processes": num_processes,
+            "efficiency": efficiency,
+            "efficiency_ci": efficiency_ci,
+            "above_threshold": efficiency >= threshold,
+            "decided": decided
+        }
+
+    @staticmethod
+    def _snap(matrix_size: int, grid: int, step: int) -> int:
+        """Round N to a multiple of step and of grid (the sqrt(P) side matrix.c needs, else 1)"""
+        unit = grid * step // math.gcd(grid, step)
+        return max(unit, int(round(matrix_size / unit)) * unit)
+
+    def find_node_crossover(
+        self,
+        num_processes: int,
+        n_min: int = 100,
+        n_max: int = 5000,
+        tolerance: int = 100
+    ) -> Dict:
+        """Find the N where multi-node starts (or stops) beating single-node
+
+        N is bracketed by doubling from n_min, which keeps the expensive large
+        sizes for last, then the bracket is bisected down to `tolerance`.
+        """
+        # Padding lets Fox, Cannon and SUMMA run any N; only the legacy matrix.c needs sqrt(P) | N
+        legacy = self.run_options.get("algorithm") == "matrix_multiplication"
+        grid = int(round(num_processes ** 0.5)) if legacy else 1
+        step = max(1, min(tolerance, 100))
+        evaluations: List[Dict] = []
+        # Bracket probes (doubling from n_min) plus the bisection depth of a doubled bracket
+        probes = math.ceil(math.log2(max(n_max, n_min) / max(n_min, 1))) + 1
+        depth = math.ceil(math.log2(max(n_max / 2, tolerance) / max(tolerance, 1)))
+        self._start(probes + depth)
+
+        def evaluate(n: int) -> Dict:
+            comparison = self.compare_modes(n, num_processes)
+            evaluations.append(comparison)
+            return comparison
+
+        try:
+            low = self._snap(n_min, grid, step)
+            first = evaluate(low)
+            high, last = low, first
+            while last["direction"] == first["direction"] and high < n_max:
+                low = high
+                high = min(self._snap(high * 2, grid, step), self._snap(n_max, grid, step))
+                if high <= low:
+                    break
+                last = evaluate(high)
+
+            if last["direction"] == first["direction"]:
+                return self._summary(
+                    num_processes, evaluations, found=False, bracket=None,
+                    message="No crossover in range: "
+                            f"{'multi' if first['direction'] > 0 else 'single'}-node is always faster"
+                )
+
+            while high - low > tolerance:
+                mid = self._snap((low + high) // 2, grid, step)
+                if mid <= low or mid >= high:
+                    break
+                if evaluate(mid)["direction"] == first["direction"]:
+                    low = mid
+                else:
+                    high = mid
+        except SearchFailed as e:
+            return self._summary(num_processes, evaluations, found=False, bracket=None, message=str(e))
+
+        return self._summary(
+            num_processes, evaluations, found=True, bracket=[low, high],
+            message=f"{'Multi' if last['direction'] > 0 else 'Single'}-node is faster from N≈{high}"
+        )
+
+    def find_efficiency_threshold(
+        self,
+        matrix_size: int,
+        threshold: float = 0.5,
+        mode: str = "multi_node",
+        process_counts: Optional[List[int]] = None
+    ) -> Dict:
+        """Find the largest process count whose efficiency stays above threshold
+
+        Efficiency is assumed to fall with P, so the candidates are bisected.
+        """
+        candidates = [
+            p for p in (process_counts or [4, 9, 16, 25, 36])
+            if self.runner.validate_configuration(
+                matrix_size, p, self.run_options.get("algorithm", "fox")
+            ) is None
+        ]
+        evaluations = []
+        low, high = -1, len(candidates)
+        self._start(math.ceil(math.log2(len(candidates) + 1)))
+
+        try:
+            while high - low > 1:
+                mid = (low + high) // 2
+                point = self.efficiency_at(matrix_size, candidates[mid], mode, threshold)
+                evaluations.append(point)
+                if point["above_threshold"]:
+                    low = mid
+                else:
+                    high = mid
+        except SearchFailed as e:
+            return {"found": False, "message": str(e), "evaluations": evaluations,
+                    "total_runs": self.total_runs}
+
+        return {
+            "found": low >= 0,
+            "matrix_size": matrix_size,
+            "mode": mode,
+            "threshold": threshold,
+            "max_processes_above_threshold": candidates[low] if low >= 0 else None,
+            "first_processes_below_threshold": candidates[high] if high < len(candidates) else None,
+            "evaluations": sorted(evaluations, key=lambda e: e["num_processes"]),
+            "total_runs": self.total_runs
+        }
+
+    def _summary(
+        self,
+        num_processes: int,
+        evaluations: List[Dict],
+        found: bool,
+        bracket: Optional[List[int]],
+        message: str
+    ) -> Dict:
+        """Result of a node crossover search"""
+        return {
+            "found": found,
+            "num_processes": num_processes,
+            "bracket": bracket,
+            "crossover_n": bracket[1] if bracket else None,
+            "message": message,
+            "evaluations": sorted(evaluations, key=lambda e: e["matrix_size"]),
+            "total_runs": self.total_runs
+        }
+
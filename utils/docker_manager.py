@@ -4,8 +4,12 @@ Handle Docker container operations for the HPC cluster
 """
 
 import docker
+import codecs
+import io
 import logging
-from typing import List, Dict, Optional
+import os
+import tarfile
+from typing import Generator, Iterator, List, Dict, Optional, Tuple
 import time
 
 logger = logging.getLogger(__name__)
@@ -56,6 +60,21 @@ class DockerManager:
         
         return status
     
+    def get_node_resources(self) -> Dict[str, int]:
+        """Get the online core count of every running cluster node"""
+        resources = {}
+        
+        for node, state in self.get_cluster_status().items():
+            if state != "running":
+                continue
+            exit_code, output = self.execute_command(node, "nproc")
+            try:
+                resources[node] = int(output.strip()) if exit_code == 0 else 1
+            except ValueError:
+                resources[node] = 1
+        
+        return resources
+    
     def start_cluster(self, num_nodes: int = 4) -> Dict[str, bool]:
         """Start the MPI cluster with specified number of nodes"""
         results = {}
@@ -159,6 +178,38 @@ class DockerManager:
             logger.error(f"Failed to execute command in {container_name}: {e}")
             return -1, str(e)
     
+    def stream_command(
+        self, container_name: str, command: str
+    ) -> Generator[Tuple[Optional[str], Optional[str]], None, int]:
+        """Execute a command, yielding (stdout, stderr) chunks as they arrive
+
+        The generator's return value (StopIteration.value) is the exit code.
+        """
+        try:
+            container = self.client.containers.get(container_name)
+            exec_cmd = f"su - faiz -c '{command}'"
+            # Low-level equivalent of exec_run(stream=True, demux=True) that
+            # keeps the exec ID, so the exit code can be inspected afterwards
+            exec_id = self.client.api.exec_create(container.id, exec_cmd)["Id"]
+            stream = self.client.api.exec_start(exec_id, stream=True, demux=True)
+        except Exception as e:
+            logger.error(f"Failed to execute command in {container_name}: {e}")
+            yield None, str(e)
+            return -1
+        
+        decoders = (
+            codecs.getincrementaldecoder('utf-8')(errors='replace'),
+            codecs.getincrementaldecoder('utf-8')(errors='replace')
+        )
+        for stdout_chunk, stderr_chunk in stream:
+            yield (
+                decoders[0].decode(stdout_chunk) if stdout_chunk else None,
+                decoders[1].decode(stderr_chunk) if stderr_chunk else None
+            )
+        
+        exit_code = self.client.api.exec_inspect(exec_id).get("ExitCode")
+        return -1 if exit_code is None else exit_code
+    
     def get_container_stats(self, container_name: str) -> Optional[Dict]:
         """Get resource usage stats for a container"""
         try:
@@ -169,14 +220,24 @@ class DockerManager:
             logger.error(f"Failed to get stats for {container_name}: {e}")
             return None
     
+    def stream_container_stats(self, container_name: str) -> Optional[Iterator[Dict]]:
+        """Subscribe to a container's stats stream (one decoded sample per second)"""
+        try:
+            container = self.client.containers.get(container_name)
+            return container.stats(stream=True, decode=True)
+        except Exception as e:
+            logger.error(f"Failed to stream stats for {container_name}: {e}")
+            return None
+    
     def copy_file_to_container(self, container_name: str, src_path: str, dst_path: str) -> bool:
         """Copy a file from host to container"""
         try:
             container = self.client.containers.get(container_name)
-            with open(src_path, 'rb') as f:
-                data = f.read()
-            container.put_archive(dst_path, data)
-            return True
+            # put_archive expects a tar stream, not raw file contents
+            archive = io.BytesIO()
+            with tarfile.open(fileobj=archive, mode='w') as tar:
+                tar.add(src_path, arcname=os.path.basename(src_path))
+            return container.put_archive(dst_path, archive.getvalue())
         except Exception as e:
             logger.error(f"Failed to copy file to {container_name}: {e}")
             return False
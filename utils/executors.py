@@ -0,0 +1,211 @@
+"""
+Executor Backends
+Run, stream and copy operations for benchmark commands, on Docker or the local host
+"""
+
+import codecs
+import os
+import selectors
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
+import logging
+
+from .resource_sampler import local_stats_stream, parse_docker_stats
+
+logger = logging.getLogger(__name__)
+
+StreamChunks = Generator[Tuple[Optional[str], Optional[str]], None, int]
+
+
+class Executor:
+    """Interface for executing benchmark commands on cluster nodes"""
+
+    name = "base"
+    mpi_flavor = "mpich"
+
+    def __init__(self, home: str, head_node: str, nodes: List[str], mpirun_args: str = ""):
+        """Initialize with the working directory, head node and node list"""
+        self.home = home
+        self.head_node = head_node
+        self.nodes = nodes
+        self.mpirun_args = mpirun_args
+
+    def node_resources(self) -> Dict[str, int]:
+        """Live nodes mapped to their core counts, head node first"""
+        return {node: 1 for node in self.nodes}
+
+    def run(self, node: str, command: str) -> tuple:
+        """Run a command on a node and return (exit_code, output)"""
+        raise NotImplementedError
+
+    def stream(self, node: str, command: str) -> StreamChunks:
+        """Run a command, yielding (stdout, stderr) chunks; returns the exit code"""
+        raise NotImplementedError
+
+    def copy(self, node: str, src_path: str, dst_path: str) -> bool:
+        """Copy a local file into the node's filesystem"""
+        raise NotImplementedError
+
+    def stats_stream(self, node: str, interval: float) -> Optional[Iterator[Dict]]:
+        """Resource counters of a node (see utils.resource_sampler), or None if unsupported"""
+        return None
+
+
+class DockerExecutor(Executor):
+    """Executes inside the MPI cluster containers through DockerManager"""
+
+    name = "docker"
+
+    def __init__(self, docker_manager):
+        """Initialize with Docker manager"""
+        super().__init__("/home/faiz", "hpchead", ["hpchead", "node01", "node02", "node03"])
+        self.docker_manager = docker_manager
+
+    def node_resources(self) -> Dict[str, int]:
+        """Running containers and their nproc, in cluster order"""
+        resources = self.docker_manager.get_node_resources()
+        return {node: resources[node] for node in self.nodes if node in resources}
+
+    def run(self, node: str, command: str) -> tuple:
+        """Run a command in a container"""
+        return self.docker_manager.execute_command(node, command)
+
+    def stream(self, node: str, command: str) -> StreamChunks:
+        """Stream a command's output from a container"""
+        return self.docker_manager.stream_command(node, command)
+
+    def copy(self, node: str, src_path: str, dst_path: str) -> bool:
+        """Copy a file into a container directory"""
+        return self.docker_manager.copy_file_to_container(node, src_path, dst_path)
+
+    def stats_stream(self, node: str, interval: float) -> Optional[Iterator[Dict]]:
+        """Container counters from Docker's streaming stats API (fixed at one per second)"""
+        stream = self.docker_manager.stream_container_stats(node)
+        if stream is None:
+            return None
+
+        def counters():
+            try:
+                for stats in stream:
+                    yield parse_docker_stats(stats)
+            finally:
+                stream.close()
+
+        return counters()
+
+
+class LocalExecutor(Executor):
+    """Executes gcc, mpicc and mpirun directly on the host, without docker exec or su"""
+
+    name = "local"
+
+    def __init__(
+        self,
+        home: Optional[str] = None,
+        nodes: Optional[List[str]] = None,
+        mpirun_args: str = ""
+    ):
+        """Initialize with the directory holding the sources (defaults to the repo root)
+
+        Extra mpirun flags (e.g. --oversubscribe on Open MPI) can also be set
+        through the MPIRUN_ARGS environment variable.
+        """
+        home = home or str(Path(__file__).resolve().parent.parent)
+        nodes = nodes or ["localhost"]
+        mpirun_args = mpirun_args or os.environ.get("MPIRUN_ARGS", "")
+        super().__init__(home, nodes[0], nodes, mpirun_args)
+        self._mpi_flavor = None
+
+    @property
+    def mpi_flavor(self) -> str:
+        """MPI implementation behind the local mpirun ("openmpi" or "mpich")"""
+        if self._mpi_flavor is None:
+            _, output = self.run(self.head_node, "mpirun --version")
+            self._mpi_flavor = "openmpi" if "Open MPI" in output else "mpich"
+        return self._mpi_flavor
+
+    def node_resources(self) -> Dict[str, int]:
+        """Every local node name gets the host's CPU count"""
+        return {node: os.cpu_count() or 1 for node in self.nodes}
+
+    def run(self, node: str, command: str) -> tuple:
+        """Run a command in a local shell (node is ignored)"""
+        try:
+            process = subprocess.run(
+                ["bash", "-c", command],
+                cwd=self.home,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+            return process.returncode, process.stdout.decode('utf-8', errors='replace')
+        except Exception as e:
+            logger.error(f"Failed to execute local command: {e}")
+            return -1, str(e)
+
+    def stream(self, node: str, command: str) -> StreamChunks:
+        """Stream a local command's stdout and stderr as they arrive"""
+        try:
+            process = subprocess.Popen(
+                ["bash", "-c", command],
+                cwd=self.home,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except Exception as e:
+            logger.error(f"Failed to execute local command: {e}")
+            yield None, str(e)
+            return -1
+
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, 0)
+        selector.register(process.stderr, selectors.EVENT_READ, 1)
+        decoders = (
+            codecs.getincrementaldecoder('utf-8')(errors='replace'),
+            codecs.getincrementaldecoder('utf-8')(errors='replace')
+        )
+        try:
+            open_streams = 2
+            while open_streams:
+                for key, _ in selector.select():
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        open_streams -= 1
+                        continue
+                    text = decoders[key.data].decode(data)
+                    yield (text, None) if key.data == 0 else (None, text)
+        finally:
+            selector.close()
+            if process.poll() is None:
+                process.kill()
+
+        return process.wait()
+
+    def copy(self, node: str, src_path: str, dst_path: str) -> bool:
+        """Copy a file into a local directory"""
+        try:
+            shutil.copy(src_path, dst_path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to copy {src_path} to {dst_path}: {e}")
+            return False
+
+    def stats_stream(self, node: str, interval: float) -> Optional[Iterator[Dict]]:
+        """Host counters from /proc; every local node name is the same host"""
+        if not os.path.exists("/proc/stat"):
+            return None
+        return local_stats_stream(interval)
+
+
+def create_executor(name: str, docker_manager=None) -> Executor:
+    """Build an executor by name ("docker" or "local")"""
+    if name == "docker":
+        if docker_manager is None:
+            from .docker_manager import DockerManager
+            docker_manager = DockerManager()
+        return DockerExecutor(docker_manager)
+    if name == "local":
+        return LocalExecutor()
+    raise ValueError(f"Unknown executor: {name}")
@@ -0,0 +1,263 @@
+"""
+Job Management Utilities
+Run benchmark work in a background worker with persistent, pollable job state
+"""
+
+import fcntl
+import json
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+from .benchmark_runner import BenchmarkRunner
+from .executors import create_executor
+from .sweep import ParameterSweep, scaling_table
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATES = ("queued", "waiting_for_cluster", "running")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested"""
+
+
+class JobManager:
+    """Queues benchmark jobs and executes them one at a time in a worker thread"""
+
+    def __init__(self, docker_manager, jobs_dir: str = "data/jobs"):
+        """Initialize with Docker manager and the directory holding job state"""
+        self.docker_manager = docker_manager
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.jobs_dir / "cluster.lock"
+        self._state_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._mark_interrupted_jobs()
+        self._worker = threading.Thread(target=self._work, daemon=True, name="benchmark-jobs")
+        self._worker.start()
+
+    def submit(self, kind: str, params: Dict, session_id: Optional[str] = None) -> str:
+        """Queue a job and return its ID
+
+        kind is one of "serial", "baseline", "single_node", "multi_node", "comparison",
+        "crossover", "scaling" or "sweep"; params are the keyword arguments of the matching runner call,
+        plus an optional "executor" ("docker" or "local"). session_id names the
+        browser session that owns the job (None for background jobs).
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "params": params,
+            "session_id": session_id,
+            "status": "queued",
+            "progress": 0.0,
+            "message": "Queued",
+            "cancel_requested": False,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "output_tail": ""
+        }
+        self._write(job)
+        self._queue.put(job_id)
+        logger.info(f"Submitted job {job_id} ({kind})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get the current state of a job"""
+        path = self.jobs_dir / f"{job_id}.json"
+        if not path.exists():
+            return None
+        with self._state_lock, open(path, 'r') as f:
+            return json.load(f)
+
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """List the most recently submitted jobs"""
+        jobs = []
+        for path in self.jobs_dir.glob("*.json"):
+            job = self.get(path.stem)
+            if job is not None:
+                jobs.append(job)
+        jobs.sort(key=lambda j: j["submitted_at"], reverse=True)
+        return jobs[:limit]
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; queued jobs never start, a running benchmark is killed"""
+        job = self.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATES:
+            return False
+        self._update(job_id, cancel_requested=True, message="Cancellation requested")
+        return True
+
+    def _write(self, job: Dict):
+        """Atomically persist job state"""
+        path = self.jobs_dir / f"{job['job_id']}.json"
+        tmp_path = path.with_suffix(".tmp")
+        with self._state_lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(job, f, indent=2)
+            tmp_path.replace(path)
+
+    def _update(self, job_id: str, **fields) -> Dict:
+        """Update and persist selected job fields"""
+        with self._update_lock:
+            job = self.get(job_id)
+            job.update(fields)
+            self._write(job)
+        return job
+
+    def _mark_interrupted_jobs(self):
+        """Jobs left active by a previous process can never finish"""
+        for path in self.jobs_dir.glob("*.json"):
+            job = self.get(path.stem)
+            if job and job["status"] in ACTIVE_STATES:
+                job.update(status="interrupted", message="Application restarted", finished_at=time.time())
+                self._write(job)
+
+    def _check_cancelled(self, job_id: str):
+        """Raise JobCancelled if cancellation was requested for the job"""
+        if self.get(job_id)["cancel_requested"]:
+            raise JobCancelled()
+
+    @contextmanager
+    def cluster_lock(self, job_id: str, poll_interval: float = 1.0):
+        """Hold the cluster-wide lock so only one timing-sensitive job uses the nodes"""
+        with open(self.lock_path, 'w') as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    self._check_cancelled(job_id)
+                    time.sleep(poll_interval)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _work(self):
+        """Worker loop: execute queued jobs in submission order"""
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} crashed: {e}")
+                self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+    def _run_job(self, job_id: str):
+        """Execute a single job and record its outcome"""
+        job = self.get(job_id)
+        if job["cancel_requested"]:
+            self._update(job_id, status="cancelled", message="Cancelled", finished_at=time.time())
+            return
+
+        def report(progress: float, message: str):
+            self._check_cancelled(job_id)
+            self._update(job_id, progress=progress, message=message)
+
+        try:
+            self._update(job_id, status="waiting_for_cluster", message="Waiting for cluster")
+            with self.cluster_lock(job_id):
+                self._update(job_id, status="running", message="Running", started_at=time.time())
+                result = self._execute(job_id, job["kind"], job["params"], report)
+            self._check_cancelled(job_id)
+        except JobCancelled:
+            self._update(job_id, status="cancelled", message="Cancelled", finished_at=time.time())
+            return
+
+        if result.get("success") is False:
+            self._update(
+                job_id,
+                status="failed",
+                error=result.get("user_error") or result.get("error"),
+                result=result,
+                finished_at=time.time()
+            )
+            return
+
+        self._update(
+            job_id,
+            status="completed",
+            progress=1.0,
+            message="Completed",
+            result=result,
+            finished_at=time.time()
+        )
+
+    def _output_recorder(self, job_id: str, interval: float = 0.5):
+        """Build a runner output callback that persists the live output tail"""
+        state = {"tail": "", "written_at": 0.0}
+
+        def record(stdout_chunk: Optional[str], stderr_chunk: Optional[str]):
+            state["tail"] = (state["tail"] + (stdout_chunk or "") + (stderr_chunk or ""))[-4000:]
+            if time.time() - state["written_at"] >= interval:
+                state["written_at"] = time.time()
+                self._update(job_id, output_tail=state["tail"])
+
+        return record
+
+    def _execute(self, job_id: str, kind: str, params: Dict, report) -> Dict:
+        """Dispatch a job to the benchmark runner"""
+        params = dict(params)
+        executor = create_executor(params.pop("executor", "docker"), self.docker_manager)
+        runner = BenchmarkRunner(self.docker_manager, executor)
+        runner.output_callback = self._output_recorder(job_id)
+        runner.cancel_check = lambda: self.get(job_id)["cancel_requested"]
+        runner.refresh_scheduler = lambda refresh_params: self.submit(
+            "baseline", dict(refresh_params, executor=executor.name)
+        )
+
+        if kind == "serial":
+            report(0.1, "Running serial benchmark")
+            return runner.run_serial_benchmark(**params)
+        if kind == "baseline":
+            report(0.1, "Refreshing serial baseline")
+            return runner.get_serial_baseline(**params)
+        if kind in ("single_node", "multi_node", "hybrid"):
+            report(0.1, f"Running {kind.replace('_', ' ')} benchmark")
+            return runner.run_parallel_benchmark(mode=kind, **params)
+        if kind == "comparison":
+            return runner.run_comparison(progress_callback=report, **params)
+        if kind == "crossover":
+            return runner.run_crossover_search(progress_callback=report, **params)
+        if kind == "scaling":
+            return runner.run_scaling_study(progress_callback=report, **params)
+        if kind == "sweep":
+            sweep = ParameterSweep(runner, **params)
+            rows = sweep.run(
+                lambda done, total, point: report(
+                    done / total,
+                    f"[{done}/{total}] {point['mode']} N={point['matrix_size']} P={point['num_processes']}"
+                )
+            )
+            table = scaling_table(rows, sweep.option_columns())
+            return {"sweep_id": sweep.sweep_id, "rows": rows, "scaling_table": table.to_dict("records")}
+
+        raise ValueError(f"Unknown job kind: {kind}")
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager(docker_manager=None) -> JobManager:
+    """Process-wide JobManager shared by every page and browser session"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            if docker_manager is None:
+                from .docker_manager import DockerManager
+                docker_manager = DockerManager()
+            _job_manager = JobManager(docker_manager)
+        return _job_manager
@@ -0,0 +1,192 @@
+"""
+Rank Placement Utilities
+Map MPI ranks onto the live cluster nodes and render the matching hostfile
+"""
+
+import hashlib
+import math
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ["block", "cyclic", "fill_head"]
+BINDINGS = ["none", "core", "socket"]
+
+# Algorithms that run on a rectangular P_r x P_c grid instead of sqrt(P) x sqrt(P)
+RECTANGULAR_GRID_ALGORITHMS = {"summa"}
+
+
+class PlacementEngine:
+    """Generates rank placements for the block, cyclic and fill-head policies"""
+
+    def __init__(self, executor):
+        """Initialize with the executor whose nodes receive the ranks"""
+        self.executor = executor
+        self._resources = None
+
+    def node_resources(self) -> Dict[str, int]:
+        """Live nodes and their core counts, in head-first order (cached)"""
+        if self._resources is None:
+            self._resources = self.executor.node_resources()
+            logger.info(f"Node resources: {self._resources}")
+        return self._resources
+
+    def place(self, num_processes: int, policy: str = "block", nodes: Optional[List[str]] = None) -> Dict:
+        """Assign every rank to a node
+
+        block:     balanced contiguous chunks, spread over as many nodes as needed
+        cyclic:    rank i goes to node i mod k (round-robin)
+        fill_head: fill each node's cores in order, head node first
+        Ranks beyond the total core count wrap around the nodes (oversubscription).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown placement policy: {policy}")
+
+        resources = self.node_resources()
+        nodes = [n for n in (nodes or list(resources)) if n in resources] or [self.executor.head_node]
+        cores = {node: resources.get(node, 1) for node in nodes}
+
+        if policy == "cyclic":
+            used = nodes[:min(len(nodes), num_processes)]
+            rank_hosts = [used[rank % len(used)] for rank in range(num_processes)]
+        elif policy == "block":
+            used = nodes[:min(len(nodes), num_processes)]
+            base, extra = divmod(num_processes, len(used))
+            rank_hosts = []
+            for index, node in enumerate(used):
+                rank_hosts.extend([node] * (base + (1 if index < extra else 0)))
+        else:  # fill_head
+            counts = {node: 0 for node in nodes}
+            remaining = num_processes
+            for node in nodes:
+                take = min(cores[node], remaining)
+                counts[node] += take
+                remaining -= take
+            for index in range(remaining):
+                counts[nodes[index % len(nodes)]] += 1
+            rank_hosts = [node for node in nodes for _ in range(counts[node])]
+
+        slots = {}
+        for host in rank_hosts:
+            slots[host] = slots.get(host, 0) + 1
+
+        return {
+            "policy": policy,
+            "num_processes": num_processes,
+            "rank_hosts": rank_hosts,
+            "slots": slots,
+            "cores": {node: cores[node] for node in slots},
+            "oversubscribed": any(slots[node] > cores[node] for node in slots),
+            "fox_traffic": fox_grid_traffic(rank_hosts)
+        }
+
+    def render_hostfile(self, placement: Dict) -> str:
+        """Hostfile that reproduces the placement's rank order
+
+        MPICH's hydra assigns ranks to hostfile entries in order and wraps
+        around, so cyclic placements list every node with one slot.
+        """
+        flavor = self.executor.mpi_flavor
+        if placement["policy"] == "cyclic":
+            entries = [(node, 1) for node in placement["slots"]]
+        else:
+            entries = list(placement["slots"].items())
+
+        if flavor == "openmpi":
+            return "".join(f"{node} slots={count}\n" for node, count in entries)
+        return "".join(f"{node}:{count}\n" for node, count in entries)
+
+    def mpirun_args(self, placement: Dict, binding: Optional[str] = None) -> str:
+        """Write the hostfile to the shared home and return the mpirun flags using it"""
+        content = self.render_hostfile(placement)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+        path = f"{self.executor.home}/.build/hostfile-{digest}"
+        escaped = content.replace("\n", "\\n")
+        self.executor.run(
+            self.executor.head_node,
+            f"mkdir -p {self.executor.home}/.build && printf \"{escaped}\" > {path}"
+        )
+
+        if self.executor.mpi_flavor == "openmpi":
+            mapping = "node" if placement["policy"] == "cyclic" else "slot"
+            args = [f"--hostfile {path}", f"--map-by {mapping}"]
+        else:
+            args = [f"-f {path}"]
+        if binding and binding != "none":
+            args.append(f"--bind-to {binding}")
+        return " ".join(args)
+
+
+def fox_grid_traffic(rank_hosts: List[str]) -> Dict:
+    """Count Fox-grid communication pairs that cross node boundaries
+
+    Rank r sits at row r // q, column r % q of the q x q grid. The A block is
+    broadcast along rows and B is shifted up along columns each stage.
+    Only the first q*q ranks take part when P is not a perfect square.
+    """
+    q = math.isqrt(len(rank_hosts))
+    if q == 0:
+        return {}
+    rank_hosts = rank_hosts[:q * q]
+    num_processes = len(rank_hosts)
+
+    row_pairs = remote_row_pairs = 0
+    for row in range(q):
+        for i in range(q):
+            for j in range(i + 1, q):
+                row_pairs += 1
+                if rank_hosts[row * q + i] != rank_hosts[row * q + j]:
+                    remote_row_pairs += 1
+
+    remote_shifts = sum(
+        1 for rank in range(num_processes)
+        if rank_hosts[rank] != rank_hosts[(rank - q) % num_processes]
+    )
+
+    return {
+        "grid": q,
+        "row_broadcast_pairs": row_pairs,
+        "remote_row_broadcast_pairs": remote_row_pairs,
+        "shift_pairs": num_processes,
+        "remote_shift_pairs": remote_shifts
+    }
+
+
+def process_grid(num_processes: int, algorithm: str = "fox") -> Tuple[int, int]:
+    """(rows, cols) of the process grid an algorithm uses for P ranks
+
+    Rectangular grids take the largest divisor of P not above sqrt(P) as the
+    row count, matching summa.c, and use every rank. Square grids take
+    floor(sqrt(P)) like square_grid() in bench_util.h; ranks beyond the
+    q x q grid stay idle.
+    """
+    root = max(1, math.isqrt(num_processes))
+    if algorithm not in RECTANGULAR_GRID_ALGORITHMS:
+        return root, root
+    rows = root
+    while num_processes % rows:
+        rows -= 1
+    return rows, num_processes // rows
+
+
+def padding_overhead(
+    matrix_size: int, padded_size: int, active_processes: int, num_processes: int
+) -> Dict:
+    """Extra work and memory spent on zero padding and idle ranks"""
+    return {
+        "padded_n": padded_size,
+        "active_processes": active_processes,
+        "idle_processes": num_processes - active_processes,
+        "flop_overhead": (padded_size / matrix_size) ** 3 - 1 if matrix_size else 0.0,
+        "memory_overhead": (padded_size / matrix_size) ** 2 - 1 if matrix_size else 0.0
+    }
+
+
+def padding_plan(matrix_size: int, num_processes: int, algorithm: str = "fox") -> Dict:
+    """Padding the programs will apply for (N, P): N rounds up to a multiple of
+    lcm(rows, cols) of the process grid"""
+    rows, cols = process_grid(num_processes, algorithm)
+    step = rows * cols // math.gcd(rows, cols)
+    padded_size = -(-matrix_size // step) * step
+    return padding_overhead(matrix_size, padded_size, rows * cols, num_processes)
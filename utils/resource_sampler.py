@@ -0,0 +1,150 @@
+"""
+Resource Sampler
+Record CPU, memory and network time series of the cluster nodes while a benchmark runs
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between samples; Docker's stats stream emits one sample per second
+SAMPLE_INTERVAL = 1.0
+
+
+def parse_docker_stats(stats: Dict) -> Dict:
+    """Counters of one decoded Docker stats sample
+
+    CPU % follows `docker stats`: 100% per core. Memory excludes the page
+    cache (inactive_file on cgroup v2, cache on v1). Network counters are
+    cumulative bytes summed over the container's interfaces.
+    """
+    cpu, precpu = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    memory = stats.get("memory_stats", {})
+    cache = memory.get("stats", {}).get("inactive_file", memory.get("stats", {}).get("cache", 0))
+    networks = (stats.get("networks") or {}).values()
+    return {
+        "cpu_percent": 100.0 * cpu_delta / system_delta * online if system_delta > 0 and cpu_delta > 0 else 0.0,
+        "memory_mb": max(0, memory.get("usage", 0) - cache) / 2 ** 20,
+        "net_rx_bytes": sum(n.get("rx_bytes", 0) for n in networks),
+        "net_tx_bytes": sum(n.get("tx_bytes", 0) for n in networks)
+    }
+
+
+def local_stats_stream(interval: float = SAMPLE_INTERVAL) -> Iterator[Dict]:
+    """Host counters from /proc, one sample per interval, in parse_docker_stats' format"""
+    def cpu_times():
+        with open("/proc/stat") as f:
+            values = [int(v) for v in f.readline().split()[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        return sum(values), idle
+
+    def memory_mb():
+        info = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                info[key] = int(value.split()[0])
+        return (info["MemTotal"] - info.get("MemAvailable", info["MemFree"])) / 1024
+
+    def network_bytes():
+        rx = tx = 0
+        with open("/proc/net/dev") as f:
+            for line in f.readlines()[2:]:
+                name, fields = line.split(":", 1)
+                if name.strip() == "lo":
+                    continue
+                fields = fields.split()
+                rx += int(fields[0])
+                tx += int(fields[8])
+        return rx, tx
+
+    cores = os.cpu_count() or 1
+    previous = cpu_times()
+    while True:
+        time.sleep(interval)
+        current = cpu_times()
+        total, idle = current[0] - previous[0], current[1] - previous[1]
+        previous = current
+        rx, tx = network_bytes()
+        yield {
+            "cpu_percent": 100.0 * (total - idle) / total * cores if total > 0 else 0.0,
+            "memory_mb": memory_mb(),
+            "net_rx_bytes": rx,
+            "net_tx_bytes": tx
+        }
+
+
+class ResourceSampler:
+    """One background thread per node reading the executor's stats stream
+
+    Samples carry the time since start(), CPU %, memory (MB) and the network
+    receive/transmit rates (MB/s) derived from consecutive byte counters.
+    """
+
+    def __init__(self, executor, nodes: List[str], interval: float = SAMPLE_INTERVAL):
+        """Initialize for the nodes a run touches (duplicates are sampled once)"""
+        self.executor = executor
+        self.nodes = list(dict.fromkeys(nodes))
+        self.interval = interval
+        self.samples = {node: [] for node in self.nodes}
+        self._stop = threading.Event()
+        self._threads = []
+        self._start_time = None
+
+    def start(self):
+        """Start sampling every node"""
+        self._start_time = time.time()
+        for node in self.nodes:
+            stream = self.executor.stats_stream(node, self.interval)
+            if stream is None:
+                continue
+            thread = threading.Thread(target=self._sample, args=(node, stream), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _sample(self, node: str, stream: Iterator[Dict]):
+        """Thread body: append samples until stop() is called or the stream ends"""
+        previous = None
+        try:
+            for counters in stream:
+                if self._stop.is_set():
+                    break
+                now = time.time()
+                rx_rate = tx_rate = 0.0
+                if previous:
+                    elapsed = max(now - previous[0], 1e-6)
+                    rx_rate = max(0, counters["net_rx_bytes"] - previous[1]["net_rx_bytes"]) / elapsed / 1e6
+                    tx_rate = max(0, counters["net_tx_bytes"] - previous[1]["net_tx_bytes"]) / elapsed / 1e6
+                previous = (now, counters)
+                self.samples[node].append({
+                    "t": now - self._start_time,
+                    "cpu_percent": counters["cpu_percent"],
+                    "memory_mb": counters["memory_mb"],
+                    "net_rx_mb_s": rx_rate,
+                    "net_tx_mb_s": tx_rate
+                })
+        except Exception as e:
+            logger.warning(f"Resource sampling on {node} stopped: {e}")
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+    def stop(self) -> Optional[Dict]:
+        """Stop the threads and return {"interval", "nodes": {node: samples}}, or None without samples
+
+        Threads blocked on a stream read exit at their next sample; they are
+        not joined, so a run never waits up to a stats interval for them.
+        """
+        self._stop.set()
+        nodes = {node: list(samples) for node, samples in self.samples.items() if samples}
+        if not nodes:
+            return None
+        return {"interval": self.interval, "nodes": nodes}
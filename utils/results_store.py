@@ -0,0 +1,280 @@
+"""
+Results Store
+SQLite index of benchmark results, with raw logs kept in gzip side blobs
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bulky per-run fields moved out of the indexed payload into the blob
+RAW_FIELDS = ("raw_output", "stdout", "stderr")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    name TEXT PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    algorithm TEXT,
+    mode TEXT,
+    matrix_size INTEGER,
+    num_processes INTEGER,
+    source_hash TEXT,
+    executor TEXT,
+    sweep_id TEXT,
+    success INTEGER,
+    execution_time REAL,
+    verified INTEGER,
+    payload TEXT NOT NULL,
+    raw_blob TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_lookup
+    ON results (timestamp, algorithm, mode, matrix_size, num_processes, source_hash);
+CREATE INDEX IF NOT EXISTS idx_results_point
+    ON results (mode, matrix_size, num_processes);
+CREATE INDEX IF NOT EXISTS idx_results_sweep ON results (sweep_id);
+"""
+
+INDEX_COLUMNS = [
+    "name", "timestamp", "algorithm", "mode", "matrix_size", "num_processes",
+    "source_hash", "executor", "sweep_id", "success", "execution_time", "verified"
+]
+
+# Columns added after the first release, created on open in older databases
+MIGRATED_COLUMNS = {"verified": "INTEGER"}
+
+
+class ResultsStore:
+    """Saves, queries and loads benchmark results under data/results"""
+
+    def __init__(self, root: str = "data/results"):
+        """Open (or create) the index and import JSON files written by older versions"""
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "results.db"
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+        self.import_json_files()
+
+    def _connect(self) -> sqlite3.Connection:
+        """New connection; one per call keeps the store safe across Streamlit threads"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns missing from a database created by an older version and
+        fill them in from the stored payloads"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        added = [c for c in MIGRATED_COLUMNS if c not in existing]
+        if not added:
+            return
+        with conn:
+            for column in added:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {column} {MIGRATED_COLUMNS[column]}")
+            for name, payload in conn.execute("SELECT name, payload FROM results").fetchall():
+                fields = self._index_fields(json.loads(payload))
+                conn.execute(
+                    f"UPDATE results SET {', '.join(f'{c} = ?' for c in added)} WHERE name = ?",
+                    [fields[c] for c in added] + [name]
+                )
+        logger.info(f"Added column(s) {', '.join(added)} to the results index")
+
+    @staticmethod
+    def _verified(runs: Sequence[Dict]) -> Optional[int]:
+        """1 if every verified run passed, 0 if any failed, None if none was verified"""
+        checks = [t["verification"]["verified"] for t in runs if t.get("verification")]
+        return int(all(checks)) if checks else None
+
+    @staticmethod
+    def _split_raw(results: Dict):
+        """Copy of results without raw logs, plus the raw logs keyed by test name"""
+        payload = dict(results)
+        raw = {}
+        tests = payload.get("tests")
+        if tests:
+            payload["tests"] = {}
+            for mode, data in tests.items():
+                data = dict(data)
+                fields = {f: data.pop(f) for f in RAW_FIELDS if f in data}
+                if fields:
+                    raw[mode] = fields
+                payload["tests"][mode] = data
+        fields = {f: payload.pop(f) for f in RAW_FIELDS if f in payload}
+        if fields:
+            raw[""] = fields
+        return payload, raw
+
+    @staticmethod
+    def _index_fields(results: Dict) -> Dict:
+        """Values of the indexed columns for a single or comparison result"""
+        tests = results.get("tests")
+        if tests:
+            runs = list(tests.values())
+            parallel = [t for t in runs if t.get("mode") != "serial"] or runs
+            build = next((t["build"] for t in parallel if t.get("build")), {})
+            return {
+                "timestamp": (
+                    max((t.get("timestamp") or 0 for t in runs), default=0)
+                    or results.get("timestamp") or time.time()
+                ),
+                "algorithm": next((t.get("algorithm") for t in parallel if t.get("algorithm")), None),
+                "mode": "comparison",
+                "matrix_size": results.get("matrix_size"),
+                "num_processes": results.get("num_processes"),
+                "source_hash": build.get("source_hash"),
+                "executor": next((t.get("executor") for t in runs if t.get("executor")), None),
+                "sweep_id": results.get("sweep_id"),
+                "success": int(all(t.get("success") for t in runs)),
+                "execution_time": None,
+                "verified": ResultsStore._verified(runs)
+            }
+
+        return {
+            "timestamp": results.get("timestamp") or time.time(),
+            "algorithm": results.get("algorithm"),
+            "mode": results.get("mode"),
+            "matrix_size": results.get("matrix_size"),
+            "num_processes": results.get("num_processes"),
+            "source_hash": (results.get("build") or {}).get("source_hash"),
+            "executor": results.get("executor"),
+            "sweep_id": results.get("sweep_id"),
+            "success": int(bool(results.get("success"))),
+            "execution_time": results.get("execution_time"),
+            "verified": ResultsStore._verified([results])
+        }
+
+    def save(self, results: Dict, name: Optional[str] = None) -> str:
+        """Store a result and return its name"""
+        name = Path(name).stem if name else f"benchmark_{int(time.time() * 1000)}"
+        payload, raw = self._split_raw(results)
+
+        raw_blob = None
+        if raw:
+            raw_blob = f"{name}.json.gz"
+            with gzip.open(self.blob_dir / raw_blob, 'wt', encoding='utf-8') as f:
+                json.dump(raw, f)
+
+        row = dict(self._index_fields(results), name=name, raw_blob=raw_blob,
+                   payload=json.dumps(payload))
+        columns = list(row)
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [row[c] for c in columns]
+            )
+
+        logger.info(f"Results saved as {name}")
+        return name
+
+    def load(self, name: str, include_raw: bool = True) -> Dict:
+        """Load a stored result, re-attaching its raw logs unless include_raw is False"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT payload, raw_blob FROM results WHERE name = ?", (Path(name).stem,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No stored result named {name}")
+
+        results = json.loads(row[0])
+        if include_raw and row[1] and (self.blob_dir / row[1]).exists():
+            with gzip.open(self.blob_dir / row[1], 'rt', encoding='utf-8') as f:
+                raw = json.load(f)
+            for mode, fields in raw.items():
+                (results["tests"][mode] if mode else results).update(fields)
+        return results
+
+    def query(
+        self,
+        modes: Optional[Sequence[str]] = None,
+        algorithm: Optional[str] = None,
+        matrix_sizes: Optional[Sequence[int]] = None,
+        num_processes: Optional[Sequence[int]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        source_hash: Optional[str] = None,
+        sweep_id: Optional[str] = None,
+        success: Optional[bool] = None,
+        verified: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Indexed columns of matching results, newest first"""
+        clauses, params = [], []
+        for column, values in (
+            ("mode", modes), ("matrix_size", matrix_sizes), ("num_processes", num_processes)
+        ):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        for column, op, value in (
+            ("algorithm", "=", algorithm), ("timestamp", ">=", since),
+            ("timestamp", "<=", until), ("source_hash", "=", source_hash),
+            ("sweep_id", "=", sweep_id)
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        for column, flag in (("success", success), ("verified", verified)):
+            if flag is not None:
+                clauses.append(f"{column} = ?")
+                params.append(int(flag))
+
+        sql = f"SELECT {', '.join(INDEX_COLUMNS)} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [dict(zip(INDEX_COLUMNS, row)) for row in rows]
+
+    def distinct(self, column: str) -> List:
+        """Sorted distinct non-null values of an indexed column, for filter widgets"""
+        if column not in INDEX_COLUMNS:
+            raise ValueError(f"Not an indexed column: {column}")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {column} FROM results WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def names(self) -> List[str]:
+        """Names of every stored result, newest first"""
+        return [row["name"] for row in self.query()]
+
+    def import_json_files(self, directory: Optional[str] = None) -> int:
+        """Import legacy one-file-per-run JSON results not yet in the index"""
+        directory = Path(directory) if directory else self.root
+        with closing(self._connect()) as conn:
+            known = {row[0] for row in conn.execute("SELECT name FROM results")}
+
+        imported = 0
+        for path in sorted(directory.glob("*.json")):
+            if path.stem in known:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    results = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable result file {path}: {e}")
+                continue
+            results.setdefault("timestamp", path.stat().st_mtime)
+            self.save(results, path.stem)
+            imported += 1
+
+        if imported:
+            logger.info(f"Imported {imported} JSON result file(s) from {directory}")
+        return imported
@@ -0,0 +1,191 @@
+"""
+Scaling Study Utilities
+Strong- and weak-scaling runs with Amdahl/Gustafson fits and the Karp-Flatt metric
+"""
+
+import inspect
+import math
+from typing import Callable, Dict, List, Optional
+import logging
+
+from .placement import process_grid
+
+logger = logging.getLogger(__name__)
+
+
+def karp_flatt(speedup: float, num_processes: int) -> Optional[float]:
+    """Experimentally determined serial fraction e = (1/S - 1/P) / (1 - 1/P)"""
+    if num_processes <= 1 or speedup <= 0:
+        return None
+    return (1.0 / speedup - 1.0 / num_processes) / (1.0 - 1.0 / num_processes)
+
+
+def fit_amdahl(points: List[Dict]) -> Optional[float]:
+    """Least-squares serial fraction f of Amdahl's law 1/S = f + (1 - f)/P
+
+    Rewritten as 1/S - 1/P = f (1 - 1/P), which is linear in f through the origin.
+    P is the core count of each point (ranks x threads per rank).
+    """
+    pairs = [
+        (1.0 - 1.0 / p["cores"], 1.0 / p["speedup"] - 1.0 / p["cores"])
+        for p in points if p.get("speedup") and p["cores"] > 1
+    ]
+    denominator = sum(x * x for x, _ in pairs)
+    if not denominator:
+        return None
+    return min(1.0, max(0.0, sum(x * y for x, y in pairs) / denominator))
+
+
+def fit_gustafson(points: List[Dict]) -> Optional[float]:
+    """Least-squares serial fraction a of Gustafson's law S = P - a (P - 1)"""
+    pairs = [
+        (p["cores"] - 1.0, p["cores"] - p["speedup"])
+        for p in points if p.get("speedup") and p["cores"] > 1
+    ]
+    denominator = sum(x * x for x, _ in pairs)
+    if not denominator:
+        return None
+    return min(1.0, max(0.0, sum(x * y for x, y in pairs) / denominator))
+
+
+def amdahl_speedup(serial_fraction: float, num_processes: int) -> float:
+    """Speedup predicted by Amdahl's law"""
+    return 1.0 / (serial_fraction + (1.0 - serial_fraction) / num_processes)
+
+
+def gustafson_speedup(serial_fraction: float, num_processes: int) -> float:
+    """Scaled speedup predicted by Gustafson's law"""
+    return num_processes - serial_fraction * (num_processes - 1)
+
+
+class ScalingStudy:
+    """Runs strong- and weak-scaling series through a BenchmarkRunner"""
+
+    def __init__(
+        self,
+        runner,
+        mode: str = "multi_node",
+        repeats: int = 1,
+        warmups: int = 0,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        **run_options
+    ):
+        """Initialize with the runner, the parallel mode and the samples per point
+
+        run_options are forwarded to run_parallel_benchmark (e.g. placement_policy).
+        """
+        self.runner = runner
+        self.mode = mode
+        self.repeats = repeats
+        self.warmups = warmups
+        self.report = progress_callback or (lambda progress, message: None)
+        self.run_options = run_options
+        # Options the serial baseline shares with the parallel runs (kernel, profile, ...)
+        accepted = inspect.signature(runner.get_serial_baseline).parameters
+        self.serial_options = {k: v for k, v in run_options.items() if k in accepted}
+        self._serial = {}
+
+    def _measure(self, matrix_size: int, num_processes: int, step: int, total: int) -> Dict:
+        """Serial and parallel run at one (N, P), with speedup and Karp-Flatt"""
+        self.report(step / total, f"Scaling point N={matrix_size}, P={num_processes}")
+        if matrix_size not in self._serial:
+            self._serial[matrix_size] = self.runner.get_serial_baseline(
+                matrix_size, self.repeats, self.warmups, **self.serial_options
+            )
+        serial = self._serial[matrix_size]
+        parallel = self.runner.run_parallel_benchmark(
+            matrix_size, num_processes, self.mode, self.repeats, self.warmups,
+            **self.run_options
+        )
+
+        point = {
+            "matrix_size": matrix_size,
+            "num_processes": num_processes,
+            # Hybrid runs use threads_per_rank cores per rank
+            "cores": num_processes * self.run_options.get("threads_per_rank", 1),
+            "serial_time": serial.get("execution_time") if serial.get("success") else None,
+            "parallel_time": parallel.get("execution_time") if parallel.get("success") else None,
+            "speedup": None,
+            "efficiency": None,
+            "karp_flatt": None,
+            "error": None
+        }
+        failed = next((r for r in (serial, parallel) if not r.get("success")), None)
+        if failed:
+            point["error"] = failed.get("user_error") or failed.get("error")
+        elif point["parallel_time"] > 0:
+            point["speedup"] = point["serial_time"] / point["parallel_time"]
+            point["efficiency"] = point["speedup"] / point["cores"]
+            point["karp_flatt"] = karp_flatt(point["speedup"], point["cores"])
+        return point
+
+    def _valid_counts(self, process_counts: List[int], sizes: Dict[int, int]) -> List[int]:
+        """Process counts whose (N, P) the runner accepts"""
+        valid = []
+        for num_processes in sorted(set(process_counts)):
+            reason = self.runner.validate_configuration(
+                sizes[num_processes], num_processes, self.run_options.get("algorithm", "fox")
+            )
+            if reason:
+                logger.info(f"Skipping P={num_processes}: {reason}")
+            else:
+                valid.append(num_processes)
+        return valid
+
+    def strong(self, matrix_size: int, process_counts: List[int]) -> Dict:
+        """Fixed N, growing P; fits Amdahl's serial fraction"""
+        counts = self._valid_counts(process_counts, {p: matrix_size for p in process_counts})
+        points = [
+            self._measure(matrix_size, p, step, len(counts))
+            for step, p in enumerate(counts)
+        ]
+
+        serial_fraction = fit_amdahl(points)
+        for point in points:
+            point["predicted_speedup"] = (
+                amdahl_speedup(serial_fraction, point["cores"])
+                if serial_fraction is not None else None
+            )
+
+        return {
+            "study": "strong",
+            "mode": self.mode,
+            "matrix_size": matrix_size,
+            "model": "amdahl",
+            "serial_fraction": serial_fraction,
+            "max_speedup": 1.0 / serial_fraction if serial_fraction else None,
+            "points": points
+        }
+
+    @staticmethod
+    def weak_size(base_size: int, num_processes: int, algorithm: str = "fox") -> int:
+        """N for P ranks keeping N^2/P equal to base_size^2, divisible by the process grid"""
+        rows, cols = process_grid(num_processes, algorithm)
+        step = max(1, rows * cols // math.gcd(rows, cols))
+        return max(step, int(round(base_size * math.sqrt(num_processes) / step)) * step)
+
+    def weak(self, base_size: int, process_counts: List[int]) -> Dict:
+        """N grows with P so each rank holds the same number of elements; fits Gustafson"""
+        algorithm = self.run_options.get("algorithm", "fox")
+        sizes = {p: self.weak_size(base_size, p, algorithm) for p in process_counts}
+        counts = self._valid_counts(process_counts, sizes)
+        points = [
+            self._measure(sizes[p], p, step, len(counts))
+            for step, p in enumerate(counts)
+        ]
+
+        serial_fraction = fit_gustafson(points)
+        for point in points:
+            point["predicted_speedup"] = (
+                gustafson_speedup(serial_fraction, point["cores"])
+                if serial_fraction is not None else None
+            )
+
+        return {
+            "study": "weak",
+            "mode": self.mode,
+            "base_size": base_size,
+            "model": "gustafson",
+            "serial_fraction": serial_fraction,
+            "points": points
+        }
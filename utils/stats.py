@@ -0,0 +1,138 @@
+"""
+Statistics Utilities
+Robust summaries and bootstrap confidence intervals for repeated benchmark runs
+"""
+
+import math
+import random
+import statistics
+from typing import Callable, Dict, List, Tuple
+
+
+def bootstrap_ci(
+    samples: List[float],
+    stat: Callable[[List[float]], float] = statistics.median,
+    confidence: float = 0.95,
+    n_boot: int = 2000,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of a statistic"""
+    if len(samples) < 2:
+        value = stat(samples)
+        return value, value
+
+    rng = random.Random(seed)
+    n = len(samples)
+    estimates = sorted(
+        stat([samples[rng.randrange(n)] for _ in range(n)])
+        for _ in range(n_boot)
+    )
+    alpha = (1.0 - confidence) / 2.0
+    low = estimates[int(math.floor(alpha * (n_boot - 1)))]
+    high = estimates[int(math.ceil((1.0 - alpha) * (n_boot - 1)))]
+    return low, high
+
+
+def bootstrap_ratio_ci(
+    numerator: List[float],
+    denominator: List[float],
+    confidence: float = 0.95,
+    n_boot: int = 2000,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """Bootstrap interval of median(numerator) / median(denominator)"""
+    rng = random.Random(seed)
+    n_num, n_den = len(numerator), len(denominator)
+    estimates = []
+    for _ in range(n_boot):
+        num = statistics.median([numerator[rng.randrange(n_num)] for _ in range(n_num)])
+        den = statistics.median([denominator[rng.randrange(n_den)] for _ in range(n_den)])
+        if den > 0:
+            estimates.append(num / den)
+
+    if not estimates:
+        return 0.0, 0.0
+
+    estimates.sort()
+    alpha = (1.0 - confidence) / 2.0
+    last = len(estimates) - 1
+    return (
+        estimates[int(math.floor(alpha * last))],
+        estimates[int(math.ceil((1.0 - alpha) * last))]
+    )
+
+
+def find_outliers(samples: List[float], threshold: float = 3.5) -> List[int]:
+    """Indices of samples whose modified z-score (median/MAD based) exceeds threshold"""
+    if len(samples) < 3:
+        return []
+
+    median = statistics.median(samples)
+    mad = statistics.median([abs(x - median) for x in samples])
+    if mad == 0:
+        return []
+
+    return [
+        i for i, x in enumerate(samples)
+        if abs(0.6745 * (x - median) / mad) > threshold
+    ]
+
+
+def summarize_samples(samples: List[float], confidence: float = 0.95) -> Dict:
+    """Summarize repeated timings: median, mean, stddev, min, max, CI and outliers"""
+    if not samples:
+        return {}
+
+    ci_low, ci_high = bootstrap_ci(samples, confidence=confidence)
+    return {
+        "n": len(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "max": max(samples),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "confidence": confidence,
+        "outliers": find_outliers(samples)
+    }
+
+
+def rank_imbalance(rank_times: Dict, active_ranks: int) -> Dict:
+    """Load-imbalance report from the per-rank, per-stage times of the C programs
+
+    rank_times holds "compute", "comm" and "barrier" as [rank][stage] lists.
+    Ranks at or beyond active_ranks sat outside the process grid and are
+    skipped. Busy time is compute + comm; the rank with the most busy time
+    is the critical path, since every other rank waits for it in the barrier.
+    Each stage's straggler is the rank with the most busy time in that stage.
+    """
+    kinds = ("compute", "comm", "barrier")
+    ranks = []
+    for rank in range(min(active_ranks, len(rank_times["compute"]))):
+        row = {"rank": rank}
+        for kind in kinds:
+            row[kind] = sum(rank_times[kind][rank])
+        row["busy"] = row["compute"] + row["comm"]
+        ranks.append(row)
+    if not ranks:
+        return {}
+
+    def max_over_mean(kind):
+        mean = statistics.fmean(r[kind] for r in ranks)
+        return max(r[kind] for r in ranks) / mean if mean > 0 else 1.0
+
+    critical = max(ranks, key=lambda r: r["busy"])
+    stragglers = [
+        max(range(len(ranks)), key=lambda r: rank_times["compute"][r][stage] + rank_times["comm"][r][stage])
+        for stage in range(rank_times["stages"])
+    ]
+    return {
+        "ranks": ranks,
+        "compute_imbalance": max_over_mean("compute"),
+        "busy_imbalance": max_over_mean("busy"),
+        "critical_path_rank": critical["rank"],
+        "critical_path_time": critical["busy"],
+        "mean_barrier_time": statistics.fmean(r["barrier"] for r in ranks),
+        "stage_stragglers": stragglers
+    }
@@ -0,0 +1,300 @@
+"""
+Parameter Sweep Utilities
+Plan and run grids of benchmark points through BenchmarkRunner
+"""
+
+import argparse
+import inspect
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+import pandas as pd
+
+from .placement import POLICIES, BINDINGS
+
+logger = logging.getLogger(__name__)
+
+MODES = ["serial", "single_node", "multi_node"]
+# Modes that can be swept but are not run by default
+EXTRA_MODES = ["hybrid"]
+
+
+class ParameterSweep:
+    """Runs sizes x process counts x modes x kernel options through a BenchmarkRunner"""
+
+    def __init__(
+        self,
+        runner,
+        sizes: List[int],
+        process_counts: List[int],
+        modes: Optional[List[str]] = None,
+        kernel_options: Optional[Dict[str, List]] = None,
+        repeats: int = 1,
+        warmups: int = 0,
+        sink: Optional[Callable[[Dict], None]] = None,
+        reuse_baseline: bool = True,
+        refresh_baseline: bool = False
+    ):
+        """Initialize the sweep grid
+
+        kernel_options maps a runner keyword argument to the values to sweep,
+        e.g. {"kernel": ["naive", "tiled"]}; every combination is planned.
+        sink receives each finished point; by default it is saved to the
+        results store. Serial points reuse stored baselines unless
+        reuse_baseline is False; refresh_baseline re-runs them all.
+        """
+        self.runner = runner
+        self.sizes = sorted(set(sizes))
+        self.process_counts = sorted(set(process_counts))
+        self.modes = modes or list(MODES)
+        self.kernel_options = kernel_options or {}
+        self.repeats = repeats
+        self.warmups = warmups
+        self.sweep_id = f"sweep_{int(time.time())}"
+        self.sink = sink or self._save_point
+        self.reuse_baseline = reuse_baseline
+        self.refresh_baseline = refresh_baseline
+
+    def _option_combinations(self) -> List[Dict]:
+        """Expand kernel_options into a list of keyword-argument dicts"""
+        if not self.kernel_options:
+            return [{}]
+        keys = list(self.kernel_options)
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*(self.kernel_options[k] for k in keys))
+        ]
+
+    def _serial_options(self, options: Dict) -> Dict:
+        """The options run_serial_benchmark accepts (kernel, tile, profile)"""
+        accepted = inspect.signature(self.runner.run_serial_benchmark).parameters
+        return {k: v for k, v in options.items() if k in accepted}
+
+    def plan(self) -> List[Dict]:
+        """Enumerate the grid; serial runs once per (N, serial options), invalid points are marked
+
+        Parallel-only options such as algorithm or placement_policy do not
+        change the serial run, so it is not repeated for each of their values.
+        """
+        points = []
+        planned_serial = set()
+        for options in self._option_combinations():
+            for matrix_size in self.sizes:
+                for mode in self.modes:
+                    process_counts = [1] if mode == "serial" else self.process_counts
+                    point_options = options
+                    if mode == "serial":
+                        point_options = self._serial_options(options)
+                        serial_key = (matrix_size, tuple(sorted(point_options.items())))
+                        if serial_key in planned_serial:
+                            continue
+                        planned_serial.add(serial_key)
+                    for num_processes in process_counts:
+                        point = {
+                            "mode": mode,
+                            "matrix_size": matrix_size,
+                            "num_processes": num_processes,
+                            "options": point_options,
+                            "skip_reason": None
+                        }
+                        if mode != "serial":
+                            point["skip_reason"] = self.runner.validate_configuration(
+                                matrix_size, num_processes, options.get("algorithm", "fox")
+                            )
+                        points.append(point)
+        return points
+
+    def run_point(self, point: Dict) -> Dict:
+        """Run a single planned point through the runner"""
+        if point["mode"] == "serial":
+            # Parallel-only options such as placement_policy do not apply to serial
+            options = self._serial_options(point["options"])
+            if self.reuse_baseline:
+                return self.runner.get_serial_baseline(
+                    point["matrix_size"], self.repeats, self.warmups,
+                    refresh=self.refresh_baseline, **options
+                )
+            return self.runner.run_serial_benchmark(
+                point["matrix_size"], self.repeats, self.warmups, **options
+            )
+        return self.runner.run_parallel_benchmark(
+            point["matrix_size"], point["num_processes"], point["mode"],
+            self.repeats, self.warmups, **point["options"]
+        )
+
+    def run(self, progress_callback: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+        """Run every valid point in the plan, streaming each row to the sink"""
+        points = self.plan()
+        rows = []
+
+        for index, point in enumerate(points):
+            if point["skip_reason"]:
+                logger.info(f"Skipping {point}: {point['skip_reason']}")
+                rows.append(self._to_row(point, {"success": False, "error": point["skip_reason"]}))
+            else:
+                result = self.run_point(point)
+                result["sweep_id"] = self.sweep_id
+                row = self._to_row(point, result)
+                rows.append(row)
+                self.sink(result)
+
+            if progress_callback:
+                progress_callback(index + 1, len(points), point)
+
+        return rows
+
+    def _to_row(self, point: Dict, result: Dict) -> Dict:
+        """Flatten a point and its result into a table row"""
+        stats = result.get("stats", {})
+        row = {
+            "sweep_id": self.sweep_id,
+            "mode": point["mode"],
+            "matrix_size": point["matrix_size"],
+            "num_processes": point["num_processes"],
+            **point["options"],
+            "success": result.get("success", False),
+            "skipped": bool(point["skip_reason"]),
+            "status": "skipped" if point["skip_reason"] else result.get("status"),
+            "execution_time": result.get("execution_time"),
+            "time_ci_low": stats.get("ci_low"),
+            "time_ci_high": stats.get("ci_high"),
+            "compile_time": result.get("compile_time"),
+            "verified": (result.get("verification") or {}).get("verified"),
+            "imbalance": (result.get("imbalance") or {}).get("busy_imbalance"),
+            "warning": result.get("warning"),
+            "error": result.get("user_error") or result.get("error")
+        }
+        return row
+
+    def _save_point(self, result: Dict):
+        """Default sink: save the point to the results store"""
+        filename = (
+            f"{self.sweep_id}_{result.get('mode')}_n{result.get('matrix_size')}"
+            f"_p{result.get('num_processes')}_{int(time.time() * 1000)}.json"
+        )
+        self.runner.save_results(result, filename)
+
+    def option_columns(self) -> List[str]:
+        """Names of the swept kernel option columns"""
+        return list(self.kernel_options)
+
+
+def scaling_table(rows: List[Dict], option_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Long-form scaling table with speedup and efficiency against the serial run"""
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+
+    df = df[df["success"]].copy()
+    keys = ["matrix_size"] + (option_columns or [])
+    # Serial rows only carry the serial options; join them on those alone
+    serial = df[df["mode"] == "serial"]
+    serial_keys = ["matrix_size"] + [c for c in option_columns or [] if serial[c].notna().any()]
+    serial = serial[serial_keys + ["execution_time"]].rename(columns={"execution_time": "serial_time"})
+    df = df.merge(serial, on=serial_keys, how="left")
+    df["speedup"] = df["serial_time"] / df["execution_time"]
+    # Efficiency per core; serial rows carry the swept thread count but run one thread
+    threads = 1
+    if "threads_per_rank" in df:
+        threads = df["threads_per_rank"].fillna(1).where(df["mode"] != "serial", 1)
+    df["efficiency"] = df["speedup"] / (df["num_processes"] * threads)
+    return df.sort_values(keys + ["mode", "num_processes"]).reset_index(drop=True)
+
+
+def pivot_times(table: pd.DataFrame, option_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Wide table of execution times, one column per mode, process count and swept option"""
+    if table.empty:
+        return table
+    column = table["mode"] + "@" + table["num_processes"].astype(str)
+    for option in option_columns or []:
+        values = table[option]
+        if values.nunique() > 1:
+            # Serial rows leave options blank, which turns integer options into floats
+            if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+                values = values.astype("Int64")
+            column += ("/" + values.astype(str)).where(values.notna(), "")
+    table = table.assign(column=column)
+    return table.pivot_table(
+        index="matrix_size", columns="column", values="execution_time"
+    )
+
+
+def main():
+    """Command-line entry point replacing benchmark.sh (run as `python -m utils`)"""
+    from .benchmark_runner import (
+        COMPILER_PROFILES, DEFAULT_KERNEL, DEFAULT_PROFILE, DEFAULT_TILE, KERNELS,
+        PARALLEL_ALGORITHMS, BenchmarkRunner
+    )
+    from .executors import create_executor
+
+    parser = argparse.ArgumentParser(prog="python -m utils", description="Run a benchmark parameter sweep")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 1500, 2000])
+    parser.add_argument("--procs", type=int, nargs="+", default=[4])
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES + EXTRA_MODES)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--warmups", type=int, default=0)
+    parser.add_argument("--algorithms", nargs="+", default=["fox"], choices=list(PARALLEL_ALGORITHMS))
+    parser.add_argument("--kernels", nargs="+", default=[DEFAULT_KERNEL], choices=list(KERNELS))
+    parser.add_argument("--tile", type=int, default=DEFAULT_TILE, help="Tile size of the tiled kernel")
+    parser.add_argument("--profiles", nargs="+", default=[DEFAULT_PROFILE], choices=list(COMPILER_PROFILES))
+    parser.add_argument("--placements", nargs="+", default=["block"], choices=POLICIES)
+    parser.add_argument("--binding", default="none", choices=BINDINGS)
+    parser.add_argument("--ranks-per-node", type=int, nargs="+", default=[1],
+                        help="Ranks placed on each node in hybrid mode")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1],
+                        help="OpenMP threads per rank (builds with -fopenmp when > 1)")
+    parser.add_argument("--distributed", action="store_true",
+                        help="Generate A/B blocks on every rank instead of scattering from the root")
+    parser.add_argument("--freivalds", type=int, default=0, metavar="K",
+                        help="Check every parallel result with K distributed Freivalds probes")
+    parser.add_argument("--pmpi", action="store_true",
+                        help="Link the PMPI shim and record per-peer communication counts")
+    parser.add_argument("--no-baseline", action="store_true", help="Always re-run serial points")
+    parser.add_argument("--refresh-baseline", action="store_true", help="Re-run and store serial baselines")
+    parser.add_argument("--executor", default="docker", choices=["docker", "local"])
+    parser.add_argument("--output", default="hasil_benchmark.csv")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    runner = BenchmarkRunner(executor=create_executor(args.executor))
+    kernel_options = {"binding": [args.binding]} if args.binding != "none" else {}
+    if args.algorithms != ["fox"]:
+        kernel_options["algorithm"] = args.algorithms
+    if args.kernels != [DEFAULT_KERNEL]:
+        kernel_options["kernel"] = args.kernels
+    if args.tile != DEFAULT_TILE:
+        kernel_options["tile"] = [args.tile]
+    if args.profiles != [DEFAULT_PROFILE]:
+        kernel_options["profile"] = args.profiles
+    if args.placements != ["block"]:
+        kernel_options["placement_policy"] = args.placements
+    if args.distributed:
+        kernel_options["distributed"] = [True]
+    if args.freivalds:
+        kernel_options["freivalds"] = [args.freivalds]
+    if args.pmpi:
+        kernel_options["pmpi"] = [True]
+    if args.ranks_per_node != [1]:
+        kernel_options["ranks_per_node"] = args.ranks_per_node
+    if args.threads != [1]:
+        kernel_options["threads_per_rank"] = args.threads
+    sweep = ParameterSweep(
+        runner, args.sizes, args.procs, args.modes, kernel_options,
+        repeats=args.repeats, warmups=args.warmups,
+        reuse_baseline=not args.no_baseline, refresh_baseline=args.refresh_baseline
+    )
+
+    def report(done, total, point):
+        print(f"[{done}/{total}] {point['mode']} N={point['matrix_size']} P={point['num_processes']}")
+
+    rows = sweep.run(report)
+    table = scaling_table(rows, sweep.option_columns())
+    table.to_csv(args.output, index=False)
+    print(pivot_times(table, sweep.option_columns()).to_string())
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
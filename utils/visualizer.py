@@ -9,6 +9,56 @@ from typing import Dict, List
 import json
 
 
+def _result_row(mode: str, matrix_size, data: Dict) -> Dict:
+    """Flatten one test result, including its confidence intervals, into a row"""
+    execution_time = data.get("execution_time")
+    speedup = data.get("speedup", 1.0)
+    efficiency = data.get("efficiency", 1.0)
+    stats = data.get("stats", {})
+    time_ci = [stats.get("ci_low", execution_time), stats.get("ci_high", execution_time)]
+    speedup_ci = data.get("speedup_ci", [speedup, speedup])
+    efficiency_ci = data.get("efficiency_ci", [efficiency, efficiency])
+    
+    return {
+        "mode": mode,
+        "matrix_size": matrix_size,
+        "num_processes": data.get("num_processes", 1),
+        "placement": (data.get("placement") or {}).get("policy"),
+        "kernel": data.get("kernel"),
+        "profile": data.get("profile"),
+        "threads_per_rank": data.get("threads_per_rank", 1),
+        "execution_time": execution_time,
+        "time_ci_low": time_ci[0],
+        "time_ci_high": time_ci[1],
+        "time_stddev": stats.get("stddev", 0.0),
+        "repeat_runs": stats.get("n", 1),
+        "outliers": len(stats.get("outliers", [])),
+        "speedup": speedup,
+        "speedup_ci_low": speedup_ci[0],
+        "speedup_ci_high": speedup_ci[1],
+        "efficiency": efficiency,
+        "efficiency_ci_low": efficiency_ci[0],
+        "efficiency_ci_high": efficiency_ci[1],
+        "gflops": data.get("gflops", 0.0),
+        "memory_mb": data.get("memory_mb", 0.0),
+        "comm_bytes": data.get("comm_bytes"),
+        "padded_n": (data.get("padding") or {}).get("padded_n"),
+        "idle_processes": (data.get("padding") or {}).get("idle_processes"),
+        **{f"phase_{name}": seconds for name, seconds in data.get("phases", {}).items()}
+    }
+
+
+def _error_bars(df: pd.DataFrame, column: str) -> Dict:
+    """Asymmetric plotly error bars from `<column>_ci_low`/`<column>_ci_high`"""
+    prefix = "time" if column == "execution_time" else column
+    return dict(
+        type='data',
+        symmetric=False,
+        array=(df[f'{prefix}_ci_high'] - df[column]).clip(lower=0),
+        arrayminus=(df[column] - df[f'{prefix}_ci_low']).clip(lower=0)
+    )
+
+
 def parse_benchmark_results(results: Dict) -> pd.DataFrame:
     """Convert benchmark results dictionary to DataFrame"""
     rows = []
@@ -17,30 +67,10 @@ def parse_benchmark_results(results: Dict) -> pd.DataFrame:
         # Comparison results
         for mode, data in results["tests"].items():
             if data.get("success"):
-                row = {
-                    "mode": mode,
-                    "matrix_size": results.get("matrix_size"),
-                    "num_processes": data.get("num_processes", 1),
-                    "execution_time": data.get("execution_time"),
-                    "speedup": data.get("speedup", 1.0),
-                    "efficiency": data.get("efficiency", 1.0),
-                    "gflops": data.get("gflops", 0.0),
-                    "memory_mb": data.get("memory_mb", 0.0)
-                }
-                rows.append(row)
+                rows.append(_result_row(mode, results.get("matrix_size"), data))
     else:
         # Single result
-        row = {
-            "mode": results.get("mode"),
-            "matrix_size": results.get("matrix_size"),
-            "num_processes": results.get("num_processes", 1),
-            "execution_time": results.get("execution_time"),
-            "speedup": results.get("speedup", 1.0),
-            "efficiency": results.get("efficiency", 1.0),
-            "gflops": results.get("gflops", 0.0),
-            "memory_mb": results.get("memory_mb", 0.0)
-        }
-        rows.append(row)
+        rows.append(_result_row(results.get("mode"), results.get("matrix_size"), results))
     
     return pd.DataFrame(rows)
 
@@ -50,7 +80,7 @@ def create_speedup_chart(df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
     
     modes = df['mode'].unique()
-    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96'}
+    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96', 'hybrid': '#AB63FA'}
     
     for mode in modes:
         mode_data = df[df['mode'] == mode]
@@ -58,6 +88,7 @@ def create_speedup_chart(df: pd.DataFrame) -> go.Figure:
             name=mode.replace('_', ' ').title(),
             x=mode_data['matrix_size'],
             y=mode_data['speedup'],
+            error_y=_error_bars(mode_data, 'speedup'),
             marker_color=colors.get(mode, '#AB63FA')
         ))
     
@@ -78,7 +109,7 @@ def create_execution_time_chart(df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
     
     modes = df['mode'].unique()
-    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96'}
+    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96', 'hybrid': '#AB63FA'}
     
     for mode in modes:
         mode_data = df[df['mode'] == mode]
@@ -86,6 +117,7 @@ def create_execution_time_chart(df: pd.DataFrame) -> go.Figure:
             name=mode.replace('_', ' ').title(),
             x=mode_data['matrix_size'],
             y=mode_data['execution_time'],
+            error_y=_error_bars(mode_data, 'execution_time'),
             mode='lines+markers',
             line=dict(color=colors.get(mode, '#AB63FA'), width=3),
             marker=dict(size=10)
@@ -105,7 +137,10 @@ def create_execution_time_chart(df: pd.DataFrame) -> go.Figure:
 
 def create_efficiency_chart(df: pd.DataFrame) -> go.Figure:
     """Create parallel efficiency chart"""
-    parallel_data = df[df['mode'] != 'serial']
+    parallel_data = df[df['mode'] != 'serial'].assign(
+        efficiency_err_plus=lambda d: (d['efficiency_ci_high'] - d['efficiency']).clip(lower=0),
+        efficiency_err_minus=lambda d: (d['efficiency'] - d['efficiency_ci_low']).clip(lower=0)
+    )
     
     fig = px.bar(
         parallel_data,
@@ -113,9 +148,11 @@ def create_efficiency_chart(df: pd.DataFrame) -> go.Figure:
         y='efficiency',
         color='mode',
         barmode='group',
+        error_y='efficiency_err_plus',
+        error_y_minus='efficiency_err_minus',
         title='Parallel Efficiency',
         labels={'efficiency': 'Efficiency', 'matrix_size': 'Matrix Size'},
-        color_discrete_map={'single_node': '#EF553B', 'multi_node': '#00CC96'}
+        color_discrete_map={'single_node': '#EF553B', 'multi_node': '#00CC96', 'hybrid': '#AB63FA'}
     )
     
     fig.update_layout(
@@ -136,7 +173,7 @@ def create_memory_chart(df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
     
     modes = df['mode'].unique()
-    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96'}
+    colors = {'serial': '#636EFA', 'single_node': '#EF553B', 'multi_node': '#00CC96', 'hybrid': '#AB63FA'}
     
     for mode in modes:
         mode_data = df[df['mode'] == mode]
@@ -159,6 +196,166 @@ def create_memory_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+def create_phase_chart(df: pd.DataFrame) -> go.Figure:
+    """Create stacked per-phase time chart (slowest rank per phase)"""
+    fig = go.Figure()
+    
+    phase_columns = [c for c in df.columns if c.startswith('phase_')]
+    labels = df['mode'].str.replace('_', ' ').str.title()
+    
+    for column in phase_columns:
+        fig.add_trace(go.Bar(
+            name=column[len('phase_'):].title(),
+            x=labels,
+            y=df[column].fillna(0.0)
+        ))
+    
+    fig.update_layout(
+        title="Time per Phase",
+        xaxis_title="Execution Mode",
+        yaxis_title="Time (seconds)",
+        barmode='stack',
+        template='plotly_white',
+        height=400
+    )
+    
+    return fig
+
+
+def create_rank_chart(imbalance: Dict) -> go.Figure:
+    """Stacked compute/comm/barrier time of every active rank, critical path marked"""
+    ranks = pd.DataFrame(imbalance["ranks"])
+    fig = go.Figure()
+    
+    colors = {'compute': '#00CC96', 'comm': '#EF553B', 'barrier': '#B6B6B6'}
+    for kind, color in colors.items():
+        fig.add_trace(go.Bar(
+            name=kind.title(),
+            x=ranks['rank'],
+            y=ranks[kind],
+            marker_color=color
+        ))
+    
+    fig.add_annotation(
+        x=imbalance["critical_path_rank"], y=ranks[['compute', 'comm', 'barrier']].sum(axis=1).max(),
+        text="critical path", showarrow=True, arrowhead=2, yshift=5
+    )
+    fig.update_layout(
+        title="Time per Rank",
+        xaxis_title="Rank",
+        yaxis_title="Time (seconds)",
+        xaxis=dict(tickmode='linear', dtick=1),
+        barmode='stack',
+        template='plotly_white',
+        height=400
+    )
+    
+    return fig
+
+
+RESOURCE_METRICS = {
+    "cpu_percent": "CPU (%)",
+    "memory_mb": "Memory (MB)",
+    "net_rx_mb_s": "Net RX (MB/s)",
+    "net_tx_mb_s": "Net TX (MB/s)"
+}
+
+
+def resource_frame(resources: Dict) -> pd.DataFrame:
+    """Long table (node, t, metric, value) of the samples attached by ResourceSampler"""
+    rows = [
+        {"node": node, "t": sample["t"], "metric": label, "value": sample[key]}
+        for node, samples in resources.get("nodes", {}).items()
+        for sample in samples
+        for key, label in RESOURCE_METRICS.items()
+    ]
+    return pd.DataFrame(rows, columns=["node", "t", "metric", "value"])
+
+
+def create_resource_chart(resources: Dict) -> go.Figure:
+    """Per-node CPU, memory and network time series, one panel per metric"""
+    df = resource_frame(resources)
+    fig = px.line(
+        df, x='t', y='value', color='node', facet_row='metric',
+        category_orders={'metric': list(RESOURCE_METRICS.values())},
+        labels={'t': 'Time since start (s)', 'value': '', 'node': 'Node'},
+        markers=True
+    )
+    fig.update_yaxes(matches=None)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split('=')[-1]))
+    fig.update_layout(
+        title="Resource Usage per Node",
+        template='plotly_white',
+        height=200 * len(RESOURCE_METRICS)
+    )
+    
+    return fig
+
+
+def summarize_resources(resources: Dict) -> pd.DataFrame:
+    """Mean and peak of every metric per node"""
+    rows = []
+    for node, samples in resources.get("nodes", {}).items():
+        df = pd.DataFrame(samples)
+        rows.append({
+            "Node": node,
+            "Samples": len(df),
+            "Mean CPU (%)": df['cpu_percent'].mean(),
+            "Peak CPU (%)": df['cpu_percent'].max(),
+            "Peak Memory (MB)": df['memory_mb'].max(),
+            "Mean RX (MB/s)": df['net_rx_mb_s'].mean(),
+            "Peak RX (MB/s)": df['net_rx_mb_s'].max(),
+            "Mean TX (MB/s)": df['net_tx_mb_s'].mean(),
+            "Peak TX (MB/s)": df['net_tx_mb_s'].max()
+        })
+    return pd.DataFrame(rows).round(2)
+
+
+PMPI_METRICS = {
+    "bytes": "Bytes sent",
+    "messages": "Messages sent",
+    "time": "Time (seconds)"
+}
+
+
+def create_comm_matrix_chart(pmpi: Dict, metric: str = "bytes") -> go.Figure:
+    """Rank×rank heatmap of the PMPI shim's per-peer counts (row = rank, column = peer)"""
+    ranks = list(range(pmpi["ranks"]))
+    fig = px.imshow(
+        pmpi[metric], x=ranks, y=ranks,
+        labels={'x': 'Peer rank', 'y': 'Rank', 'color': PMPI_METRICS[metric]},
+        color_continuous_scale='Blues', text_auto=True, aspect='equal'
+    )
+    fig.update_layout(
+        title=f"Communication Matrix: {PMPI_METRICS[metric]}",
+        xaxis=dict(tickmode='linear', dtick=1, side='top'),
+        yaxis=dict(tickmode='linear', dtick=1),
+        template='plotly_white',
+        height=max(400, 40 * len(ranks) + 150)
+    )
+    
+    return fig
+
+
+def summarize_pmpi(pmpi: Dict) -> pd.DataFrame:
+    """Calls, bytes and time of every wrapped MPI function, summed over ranks, with the slowest rank"""
+    rows = []
+    for name, stats in pmpi.get("functions", {}).items():
+        if not sum(stats["calls"]):
+            continue
+        rows.append({
+            "Function": name,
+            "Calls": sum(stats["calls"]),
+            "Bytes": sum(stats["bytes"]),
+            "Total Time (s)": sum(stats["time"]),
+            "Max Rank Time (s)": max(stats["time"]),
+            "Slowest Rank": stats["time"].index(max(stats["time"]))
+        })
+    return pd.DataFrame(rows, columns=[
+        "Function", "Calls", "Bytes", "Total Time (s)", "Max Rank Time (s)", "Slowest Rank"
+    ]).round(6)
+
+
 def calculate_metrics_summary(df: pd.DataFrame) -> Dict:
     """Calculate summary metrics"""
     summary = {